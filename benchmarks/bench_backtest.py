@@ -0,0 +1,372 @@
+#!/usr/bin/env/python
+
+"""
+Benchmark suite of the backtest pipeline (seconds per stage)
+
+Runs backtests on deterministic synthetic random walks
+(see benchmarks.synthetic) at several scales and times
+each stage:
+
+- parse: reading CSV files into DataFrames
+- merge: merging DataFrames of all tickers (ColumnarStore)
+- iterate: data iterator (next event)
+- strategy: strategy handlers
+- portfolio: portfolio handler and execution handler
+- statistics: statistics handlers
+- dispatch: event loop overhead (backtest duration minus
+  time of components)
+- end_to_end: parse + backtest without profiler
+
+Stages of the backtest are measured with a SessionProfiler.
+Each scenario is run `repeat` times and the fastest time of
+each stage is kept.
+
+Results are written as JSON (--output) and compared against
+a JSON baseline (--baseline); a stage slower than baseline
+by more than threshold is a regression (exit status 1).
+
+Timings depend on the machine so no baseline is committed:
+record one on the machine running the comparison (e.g.
+before a change) and pass that file as baseline (with the
+same suite) afterwards
+
+$ python -m benchmarks.bench_backtest --suite quick --output out/bench.json
+$ python -m benchmarks.bench_backtest --suite quick --baseline out/bench.json --threshold 0.2
+"""
+
+from __future__ import print_function
+
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple, OrderedDict
+from decimal import Decimal
+
+import click
+import numpy as np
+import pandas as pd
+
+from femtotrading.data_iterator import HistoricCSVTickIterator, YahooDailyCSVBarIterator
+from femtotrading.data_iterator.columnar import ColumnarStore
+from femtotrading.data_iterator.yahoo_daily_csv_bar import load_yahoo_daily_csv
+from femtotrading.event import EventsQueue, SignalEvent
+from femtotrading.execution_handler import IBSimulatedExecutionHandler
+from femtotrading.indicators import Indicators, SMA
+from femtotrading.portfolio_handler import PortfolioHandler
+from femtotrading.position_sizer import FixedQuantityPositionSizer
+from femtotrading.profiling import SessionProfiler
+from femtotrading.risk_manager import ExampleRiskManager
+from femtotrading.statistics import SimpleStatistics
+from femtotrading.strategy import MovingAverageCrossUniverseStrategy
+from femtotrading.strategy.base import AbstractStrategy, StrategyParameters
+from femtotrading.trading_session import Backtest
+
+from benchmarks.synthetic import (
+    ticker_names, random_walk_ticks, random_walk_bars,
+    write_tick_csv, write_yahoo_csv
+)
+
+
+Scenario = namedtuple("Scenario", ["name", "kind", "n_tickers", "n"])
+
+SUITES = {
+    "nightly": [
+        Scenario("ticks_1x1M", "tick", 1, 1000000),
+        Scenario("ticks_50x100k", "tick", 50, 100000),
+        Scenario("bars_3000x5000", "bar", 3000, 5000),
+    ],
+    "quick": [
+        Scenario("ticks_1x10k", "tick", 1, 10000),
+        Scenario("ticks_50x1k", "tick", 50, 1000),
+        Scenario("bars_30x500", "bar", 30, 500),
+    ],
+}
+
+STAGES = [
+    "parse", "merge", "iterate", "strategy", "portfolio",
+    "statistics", "dispatch", "end_to_end"
+]
+
+MIN_DURATION = 0.01  # stages faster than that (s) are not compared (noise)
+
+SHORT_WINDOW = 20
+LONG_WINDOW = 100
+
+
+class TickMovingAverageCrossStrategy(AbstractStrategy):
+    """
+    Moving average cross of mid prices for every ticker
+    of TickEvents
+    """
+    default_params = StrategyParameters({
+        'short_window': SHORT_WINDOW,
+        'long_window': LONG_WINDOW
+    })
+
+    def on_init(self):
+        super(TickMovingAverageCrossStrategy, self).on_init()
+        self.invested = dict((ticker, False) for ticker in self.tickers)
+        self.indicators = Indicators(self.tickers)
+        self.indicators.register(
+            "short_sma", lambda: SMA(self.params.short_window), mid_price)
+        self.indicators.register(
+            "long_sma", lambda: SMA(self.params.long_window), mid_price)
+
+    def on_tick(self, event):
+        self.indicators.update(event)
+        for ticker in event.tickers:
+            indicators = self.indicators[ticker]
+            if not indicators.long_sma.ready:
+                continue
+            short_sma = indicators.short_sma.value
+            long_sma = indicators.long_sma.value
+            if short_sma > long_sma and not self.invested[ticker]:
+                self.events_queue.enqueue(SignalEvent(ticker, "BOT"))
+                self.invested[ticker] = True
+            elif short_sma < long_sma and self.invested[ticker]:
+                self.events_queue.enqueue(SignalEvent(ticker, "SLD"))
+                self.invested[ticker] = False
+
+
+def mid_price(data):
+    return (data.bid + data.ask) / 2
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Silences stdout (data iterators and sessions print
+    every file and results)
+    """
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def write_data(scenario, csv_dir, seed):
+    """
+    Writes CSV files of a scenario and returns tickers
+    """
+    tickers = ticker_names(scenario.n_tickers)
+    if scenario.kind == "tick":
+        write_tick_csv(random_walk_ticks(tickers, scenario.n, seed), csv_dir)
+    else:
+        write_yahoo_csv(random_walk_bars(tickers, scenario.n, seed), csv_dir)
+    return tickers
+
+
+def parse(kind, csv_dir, tickers):
+    """
+    Returns an OrderedDict ticker=>DataFrame read from CSV files
+    """
+    if kind == "bar":
+        return load_yahoo_daily_csv(csv_dir, tickers)
+    price_handler = HistoricCSVTickIterator(csv_dir, tickers)
+    for ticker in tickers:
+        price_handler.subscribe_ticker(ticker)
+    return price_handler.tickers_data
+
+
+def make_session(kind, tickers, tickers_data):
+    """
+    Builds a Backtest of a scenario using already loaded data
+    """
+    events_queue = EventsQueue()
+    if kind == "bar":
+        price_handler = YahooDailyCSVBarIterator(
+            None, tickers, tickers_data=tickers_data, group_by_time=True)
+        strategy = MovingAverageCrossUniverseStrategy(
+            events_queue, tickers, short_window=SHORT_WINDOW, long_window=LONG_WINDOW)
+    else:
+        price_handler = HistoricCSVTickIterator(None, tickers, tickers_data=tickers_data)
+        strategy = TickMovingAverageCrossStrategy(events_queue, tickers)
+    position_sizer = FixedQuantityPositionSizer(100)
+    risk_manager = ExampleRiskManager()
+    portfolio_handler = PortfolioHandler(
+        events_queue, Decimal("500000.00"), price_handler,
+        position_sizer, risk_manager
+    )
+    execution_handler = IBSimulatedExecutionHandler(events_queue, price_handler, None)
+    statistics = SimpleStatistics(portfolio_handler)
+    return Backtest(
+        events_queue, tickers, price_handler, strategy,
+        portfolio_handler,
+        execution_handler,
+        position_sizer, risk_manager,
+        statistics,
+    )
+
+
+def session_stages(session, profiler):
+    """
+    Returns seconds of iterate, strategy, portfolio,
+    statistics and dispatch stages of a profiled session
+    """
+    owners = [
+        ("strategy", [session.strategies]),
+        ("portfolio", [session.portfolio_handler, session.execution_handler]),
+        ("statistics", [session.statistics]),
+    ]
+    stages = OrderedDict((stage, 0.0) for stage, _ in owners)
+    stages["iterate"] = profiler.components[profiler.DATA_ITERATOR].total
+    prefixes = [
+        (stage, "%s." % type(component).__name__)
+        for stage, components in owners for component in components
+    ]
+    for name, stats in profiler.components.items():
+        for stage, prefix in prefixes:
+            if name.startswith(prefix):
+                stages[stage] += stats.total
+                break
+    # event loop, queue and bookkeeping handlers (e.g. bar counter)
+    stages["dispatch"] = profiler.duration - sum(stages.values())
+    return stages
+
+
+def run_scenario(scenario, csv_dir, tickers, repeat=1):
+    """
+    Returns dict stage=>seconds (fastest of repeat runs)
+    and number of events
+    """
+    timings = dict((stage, []) for stage in STAGES)
+    events = 0
+    for _ in range(repeat):
+        with quiet():
+            t0 = time.time()
+            tickers_data = parse(scenario.kind, csv_dir, tickers)
+            timings["parse"].append(time.time() - t0)
+
+            fields = YahooDailyCSVBarIterator.FIELDS if scenario.kind == "bar" \
+                else HistoricCSVTickIterator.FIELDS
+            t0 = time.time()
+            ColumnarStore.from_frames(tickers_data, fields)
+            timings["merge"].append(time.time() - t0)
+
+            session = make_session(scenario.kind, tickers, tickers_data)
+            profiler = SessionProfiler(display=False)
+            session.run(testing=True, profile=profiler)
+            for stage, duration in session_stages(session, profiler).items():
+                timings[stage].append(duration)
+            events = session.ticks + session.bars
+
+            t0 = time.time()
+            tickers_data = parse(scenario.kind, csv_dir, tickers)
+            make_session(scenario.kind, tickers, tickers_data).run(testing=True)
+            timings["end_to_end"].append(time.time() - t0)
+    results = OrderedDict((stage, min(timings[stage])) for stage in STAGES)
+    results["events"] = events
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def run(suite="quick", repeat=1, seed=42, data_dir=None):
+    """
+    Runs scenarios of a suite and returns results dict
+    (JSON serializable)
+    """
+    results = OrderedDict([
+        ("suite", suite), ("seed", seed), ("repeat", repeat),
+        ("environment", environment()), ("scenarios", OrderedDict())
+    ])
+    for scenario in SUITES[suite]:
+        if data_dir is None:
+            csv_dir = tempfile.mkdtemp()
+        else:
+            csv_dir = os.path.join(data_dir, "%s_%d" % (scenario.name, seed))
+            if not os.path.isdir(csv_dir):
+                os.makedirs(csv_dir)
+        try:
+            tickers = write_data(scenario, csv_dir, seed)
+            print("%s (%d tickers x %d %ss)" % (scenario.name, scenario.n_tickers, scenario.n, scenario.kind))
+            results["scenarios"][scenario.name] = run_scenario(scenario, csv_dir, tickers, repeat)
+        finally:
+            if data_dir is None:
+                shutil.rmtree(csv_dir)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Returns list of regressions (scenario, stage, baseline
+    seconds, seconds, ratio) of stages slower than baseline
+    by more than threshold (0.2 = 20%)
+    """
+    regressions = []
+    for name, stages in results["scenarios"].items():
+        expected = baseline["scenarios"].get(name)
+        if expected is None:
+            continue
+        for stage in STAGES:
+            if stage not in stages or stage not in expected:
+                continue
+            if expected[stage] < MIN_DURATION:
+                continue
+            ratio = stages[stage] / expected[stage]
+            if ratio > 1.0 + threshold:
+                regressions.append((name, stage, expected[stage], stages[stage], ratio))
+    return regressions
+
+
+def table(results, baseline=None):
+    """
+    Returns table (str) of stage timings (and ratio to
+    baseline)
+    """
+    lines = []
+    for name, stages in results["scenarios"].items():
+        expected = {} if baseline is None else baseline["scenarios"].get(name, {})
+        lines.append("%s (%d events)" % (name, stages["events"]))
+        for stage in STAGES:
+            line = "  %-12s %12.6f s" % (stage, stages[stage])
+            if expected.get(stage):
+                line += "  %6.2fx baseline" % (stages[stage] / expected[stage])
+            lines.append(line)
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option('--suite', default='quick', type=click.Choice(sorted(SUITES)), help='Suite of scenarios')
+@click.option('--repeat', default=3, help='Number of runs (fastest is kept)')
+@click.option('--seed', default=42, help='Seed of synthetic data')
+@click.option('--data-dir', default=None, help='Directory keeping generated CSV files')
+@click.option('--output', default=None, help='JSON results filename')
+@click.option('--baseline', default=None, help='JSON baseline filename to compare with')
+@click.option('--threshold', default=0.2, help='Regression threshold (0.2 = 20% slower)')
+def main(suite, repeat, seed, data_dir, output, baseline, threshold):
+    results = run(suite, repeat, seed, data_dir)
+    expected = None
+    if baseline is not None:
+        with open(baseline) as fd:
+            expected = json.load(fd)
+    print("")
+    print(table(results, expected))
+    if output is not None:
+        with open(output, "w") as fd:
+            json.dump(results, fd, indent=2)
+    if expected is not None:
+        regressions = compare(results, expected, threshold)
+        for name, stage, expected_duration, duration, ratio in regressions:
+            print("REGRESSION %s %s: %.6fs => %.6fs (%.2fx)" % (
+                name, stage, expected_duration, duration, ratio))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env/python
+
+"""
+Benchmark data iterators (events/second)
+
+Compares the columnar store based iterators against the
+previous pd.concat(...).sort_index().iterrows() implementation
+using files from data/default_equities
+
+$ python -m benchmarks.bench_data_iterators --repeat 20
+"""
+
+from __future__ import print_function
+
+import decimal
+import time
+
+import click
+import pandas as pd
+
+from femtotrading import settings
+from femtotrading.data import PLACES, TickerData
+from femtotrading.data_iterator import HistoricCSVTickIterator, YahooDailyCSVBarIterator
+from femtotrading.event import TickEvent, BarEvent
+
+
+def iterrows_tick_events(data_iterator):
+    """
+    Reference implementation: TickEvents from DataFrame.iterrows()
+    """
+    stream = pd.concat(data_iterator.tickers_data.values()).sort_index().iterrows()
+    for dt, row in stream:
+        decimal.getcontext().rounding = decimal.ROUND_HALF_DOWN
+        ticker = row["Ticker"]
+        bid = decimal.Decimal(str(row["Bid"])).quantize(PLACES[5])
+        ask = decimal.Decimal(str(row["Ask"])).quantize(PLACES[5])
+        data_iterator.tickers[ticker]["bid"] = bid
+        data_iterator.tickers[ticker]["ask"] = ask
+        data_iterator.tickers[ticker]["timestamp"] = dt
+        yield TickEvent.from_ticker(dt, ticker, bid, ask)
+
+
+def iterrows_bar_events(data_iterator):
+    """
+    Reference implementation: BarEvents from DataFrame.iterrows()
+    """
+    for ticker, df in data_iterator.tickers_data.items():
+        df["Ticker"] = ticker
+    stream = pd.concat(data_iterator.tickers_data.values()).sort_index().iterrows()
+    for dt, row in stream:
+        decimal.getcontext().rounding = decimal.ROUND_HALF_DOWN
+        ticker = row["Ticker"]
+        open_price = decimal.Decimal(str(row["Open"])).quantize(PLACES[5])
+        high_price = decimal.Decimal(str(row["High"])).quantize(PLACES[5])
+        low_price = decimal.Decimal(str(row["Low"])).quantize(PLACES[5])
+        close_price = decimal.Decimal(str(row["Close"])).quantize(PLACES[5])
+        adj_close_price = decimal.Decimal(str(row["Adj Close"])).quantize(PLACES[5])
+        volume = int(row["Volume"])
+        data_iterator.tickers[ticker]["close"] = close_price
+        data_iterator.tickers[ticker]["adj_close"] = adj_close_price
+        data_iterator.tickers[ticker]["timestamp"] = dt
+        tickerdata = TickerData([("open", open_price),
+                                 ("high", high_price),
+                                 ("low", low_price),
+                                 ("close", close_price),
+                                 ("volume", volume),
+                                 ("adj_close", adj_close_price)])
+        yield BarEvent.from_ticker(dt, 86400, ticker, tickerdata)
+
+
+def timeit_events(f_init, f_events, repeat):
+    """
+    Returns (number of events, events/second)
+
+    CSV files are read by f_init (not timed), merge and
+    iteration are done by f_events (timed)
+    """
+    n = 0
+    duration = 0.0
+    for _ in range(repeat):
+        data_iterator = f_init()
+        t0 = time.time()
+        for _ in f_events(data_iterator):
+            n += 1
+        duration += time.time() - t0
+    return n // repeat, n / duration
+
+
+def run(config, repeat):
+    csv_dir = config.CSV_DATA_DIR
+    cases = [
+        ("tick", HistoricCSVTickIterator, ["GOOG", "AMZN", "MSFT"], iterrows_tick_events),
+        ("bar", YahooDailyCSVBarIterator, ["SP500TR"], iterrows_bar_events),
+    ]
+    results = []
+    for name, cls, tickers, f_reference in cases:
+        def f_init():
+            data_iterator = cls(csv_dir, tickers)
+            for ticker in tickers:
+                data_iterator.subscribe_ticker(ticker)
+            return data_iterator
+
+        def f_columnar(data_iterator):
+            data_iterator._stream = data_iterator._merge_sort_ticker_data()
+            return data_iterator
+
+        n, speed_reference = timeit_events(f_init, f_reference, repeat)
+        n, speed_columnar = timeit_events(f_init, f_columnar, repeat)
+        results.append((name, n, speed_reference, speed_columnar))
+
+    print("")
+    print("%-6s %10s %18s %18s %8s" % ("kind", "events", "iterrows (evt/s)", "columnar (evt/s)", "speedup"))
+    for name, n, speed_reference, speed_columnar in results:
+        print("%-6s %10d %18.0f %18.0f %7.1fx" % (
+            name, n, speed_reference, speed_columnar, speed_columnar / speed_reference))
+    return results
+
+
+@click.command()
+@click.option('--repeat', default=10, help='Number of runs')
+def main(repeat):
+    config = settings.TEST
+    run(config, repeat)
+
+
+if __name__ == "__main__":
+    main()
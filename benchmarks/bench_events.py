@@ -0,0 +1,162 @@
+#!/usr/bin/env/python
+
+"""
+Benchmark event allocation (events/second and bytes/event)
+
+Compares slotted events (TickEvent.from_ticker with TickData,
+BarEvent with BarData) and events reused from an EventPool
+(reuse_events=True of data iterators) against the previous
+events (instance __dict__, OrderedDict of Munch per ticker)
+
+$ python -m benchmarks.bench_events --n 100000 --repeat 5
+"""
+
+from __future__ import print_function
+
+import datetime
+import decimal
+import time
+import tracemalloc
+
+import click
+
+from femtotrading.data import Data, TickerData, BarData
+from femtotrading.event import TickEvent, BarEvent, EventPool, PooledTickEvent, PooledBarEvent
+
+
+class LegacyTimedEvent(object):
+    """
+    Reference implementation: previous timed event
+    (no __slots__, Data of TickerData)
+    """
+    def __init__(self, time, data_event):
+        self.time = time
+        self.data_event = data_event
+
+    def have(self, ticker):
+        return ticker in self.data_event.keys()
+
+    def __getitem__(self, ticker):
+        return self.data_event[ticker]
+
+
+class LegacyBarEvent(LegacyTimedEvent):
+    def __init__(self, time, period, data_event):
+        self.time = time
+        self.period = period
+        self.data_event = data_event
+
+
+def legacy_tick(dt, ticker, bid, ask):
+    return LegacyTimedEvent(dt, Data({ticker: TickerData({"bid": bid, "ask": ask})}))
+
+
+def slotted_tick(dt, ticker, bid, ask):
+    return TickEvent.from_ticker(dt, ticker, bid, ask)
+
+
+def legacy_bar(dt, ticker, price, volume):
+    return LegacyBarEvent(dt, 86400, Data({ticker: TickerData([
+        ("open", price), ("high", price), ("low", price),
+        ("close", price), ("volume", volume), ("adj_close", price)])}))
+
+
+def slotted_bar(dt, ticker, price, volume):
+    return BarEvent.from_ticker(dt, 86400, ticker, BarData(price, price, price, price, volume, price))
+
+
+def pooled_tick(pool):
+    def pooled_event(dt, ticker, bid, ask):
+        return pool.acquire().set(dt, ticker, bid, ask)
+    return pooled_event
+
+
+def pooled_bar(pool):
+    def pooled_event(dt, ticker, price, volume):
+        return pool.acquire().set(dt, 86400, ticker, price, price, price, price, volume, price)
+    return pooled_event
+
+
+def access_tick(event, ticker):
+    if event.have(ticker):
+        return event[ticker].bid
+
+
+def access_bar(event, ticker):
+    if event.have(ticker):
+        return event[ticker].adj_close
+
+
+def timeit(f_event, f_access, args, repeat):
+    """
+    Returns (allocations/second, allocations + access/second)
+    """
+    duration_alloc = 0.0
+    duration_access = 0.0
+    for _ in range(repeat):
+        t0 = time.time()
+        for dt, ticker, x, y in args:
+            f_event(dt, ticker, x, y)
+        duration_alloc += time.time() - t0
+        t0 = time.time()
+        for dt, ticker, x, y in args:
+            f_access(f_event(dt, ticker, x, y), ticker)
+        duration_access += time.time() - t0
+    n = len(args) * repeat
+    return n / duration_alloc, n / duration_access
+
+
+def bytes_per_event(f_event, args):
+    tracemalloc.start()
+    events = [f_event(dt, ticker, x, y) for dt, ticker, x, y in args]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (size - len(events) * 8) / len(events)  # without list
+
+
+def run(n, repeat):
+    t0 = datetime.datetime(2016, 1, 1)
+    price = decimal.Decimal("1.23456")
+    args_tick = [
+        (t0 + datetime.timedelta(milliseconds=i), "EURUSD", price, price)
+        for i in range(n)
+    ]
+    args_bar = [
+        (t0 + datetime.timedelta(days=i), "SP500TR", price, 1000)
+        for i in range(n)
+    ]
+    cases = [
+        ("tick", legacy_tick, access_tick, args_tick),
+        ("tick", slotted_tick, access_tick, args_tick),
+        ("tick", pooled_tick(EventPool(PooledTickEvent)), access_tick, args_tick),
+        ("bar", legacy_bar, access_bar, args_bar),
+        ("bar", slotted_bar, access_bar, args_bar),
+        ("bar", pooled_bar(EventPool(PooledBarEvent)), access_bar, args_bar),
+    ]
+    results = []
+    for name, f_event, f_access, args in cases:
+        speed, speed_access = timeit(f_event, f_access, args, repeat)
+        results.append((
+            name, f_event.__name__.split("_")[0], speed, speed_access,
+            bytes_per_event(f_event, args)
+        ))
+
+    print("")
+    print("%-6s %-8s %14s %16s %8s %12s" % (
+        "kind", "events", "alloc (evt/s)", "+access (evt/s)", "speedup", "bytes/event"))
+    for name, kind, speed, speed_access, size in results:
+        reference = [r for r in results if r[0] == name][0]
+        print("%-6s %-8s %14.0f %16.0f %7.1fx %12.0f" % (
+            name, kind, speed, speed_access, speed_access / reference[3], size))
+    return results
+
+
+@click.command()
+@click.option('--n', default=100000, help='Number of events')
+@click.option('--repeat', default=5, help='Number of runs')
+def main(n, repeat):
+    run(n, repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env/python
+
+"""
+Benchmark streaming indicators (bars/second)
+
+Compares MovingAverageCrossStrategy.on_bar (streaming SMA
+indicators, O(1) per bar) against the previous
+deque + np.mean implementation (O(window) per bar) using
+SP500TR bars of data/default_equities
+
+$ python -m benchmarks.bench_indicators --repeat 20
+"""
+
+from __future__ import print_function
+
+import time
+from collections import deque
+
+import click
+import numpy as np
+
+from femtotrading import settings
+from femtotrading.data_iterator import YahooDailyCSVBarIterator
+from femtotrading.event import EventsQueue, SignalEvent
+from femtotrading.indicators import SMA
+from femtotrading.strategy import MovingAverageCrossStrategy
+
+
+class DequeMovingAverageCrossStrategy(MovingAverageCrossStrategy):
+    """
+    Reference implementation: moving averages with
+    deque + np.mean
+    """
+    def on_init(self):
+        super(DequeMovingAverageCrossStrategy, self).on_init()
+        self.sw_bars = deque(maxlen=self.short_window)
+        self.lw_bars = deque(maxlen=self.long_window)
+
+    def on_bar(self, event):
+        ticker = self.tickers[0]
+        if event.have(ticker):
+            self.lw_bars.append(event[ticker].adj_close)
+            if self.bars > self.long_window - self.short_window:
+                self.sw_bars.append(event[ticker].adj_close)
+            if self.bars > self.long_window:
+                short_sma = np.mean(self.sw_bars)
+                long_sma = np.mean(self.lw_bars)
+                if short_sma > long_sma and not self.invested:
+                    self.events_queue.enqueue(SignalEvent(ticker, "BOT"))
+                    self.invested = True
+                elif short_sma < long_sma and self.invested:
+                    self.events_queue.enqueue(SignalEvent(ticker, "SLD"))
+                    self.invested = False
+            self.bars += 1
+
+
+class DequeSMA(object):
+    """
+    Reference implementation: SMA with deque + np.mean
+    """
+    def __init__(self, window):
+        self.values = deque(maxlen=window)
+
+    def update(self, value):
+        self.values.append(value)
+        return np.mean(self.values)
+
+
+def bar_events(config, tickers):
+    price_handler = YahooDailyCSVBarIterator(config.CSV_DATA_DIR, tickers)
+    price_handler.on_init()
+    return list(price_handler)
+
+
+def timeit_on_bar(strategy_class, events, repeat, **params):
+    """
+    Returns (signals, bars/second)
+    """
+    duration = 0.0
+    signals = None
+    for _ in range(repeat):
+        events_queue = EventsQueue(threadsafe=False)
+        strategy = strategy_class(events_queue, ["SP500TR"], **params)
+        strategy.on_init()
+        t0 = time.time()
+        for event in events:
+            strategy.on_bar(event)
+        duration += time.time() - t0
+        signals = [signal.action for signal in events_queue.drain()]
+    return signals, len(events) * repeat / duration
+
+
+def timeit_update(f_indicator, values, repeat):
+    """
+    Returns updates/second of one indicator
+    """
+    duration = 0.0
+    for _ in range(repeat):
+        indicator = f_indicator()
+        t0 = time.time()
+        for value in values:
+            indicator.update(value)
+        duration += time.time() - t0
+    return len(values) * repeat / duration
+
+
+def run(config, repeat, short_window=100, long_window=400):
+    events = bar_events(config, ["SP500TR"])
+    params = {"short_window": short_window, "long_window": long_window}
+    signals_reference, speed_reference = timeit_on_bar(
+        DequeMovingAverageCrossStrategy, events, repeat, **params)
+    signals_streaming, speed_streaming = timeit_on_bar(
+        MovingAverageCrossStrategy, events, repeat, **params)
+    assert signals_reference == signals_streaming, "strategies don't give same signals"
+
+    values = [event["SP500TR"].adj_close for event in events]
+    results = [
+        ("MAC.on_bar", len(events), speed_reference, speed_streaming),
+    ]
+    for window in [short_window, long_window]:
+        speed_reference = timeit_update(lambda: DequeSMA(window), values, repeat)
+        speed_streaming = timeit_update(lambda: SMA(window), values, repeat)
+        results.append(("SMA(%d)" % window, len(values), speed_reference, speed_streaming))
+
+    print("")
+    print("%-12s %8s %18s %18s %8s" % ("case", "bars", "np.mean (bar/s)", "streaming (bar/s)", "speedup"))
+    for name, n, speed_reference, speed_streaming in results:
+        print("%-12s %8d %18.0f %18.0f %7.1fx" % (
+            name, n, speed_reference, speed_streaming, speed_streaming / speed_reference))
+    return results
+
+
+@click.command()
+@click.option('--repeat', default=10, help='Number of runs')
+@click.option('--short_window', default=100, help='Short window')
+@click.option('--long_window', default=400, help='Long window')
+def main(repeat, short_window, long_window):
+    config = settings.TEST
+    run(config, repeat, short_window, long_window)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env/python
+
+"""
+Micro-benchmark of priority queues (cost of an operation)
+
+Compares UPriorityQueue (membership test is a linear scan
+of the heap) and HeapPriorityQueue on a k-way merge of
+ticker streams as MonthlyCSVTickIterator does
+
+$ python -m benchmarks.bench_priority_queue --tickers 10,100,1000 --rounds 20
+"""
+
+from __future__ import print_function
+
+import time
+
+import click
+
+from femtotrading.priority_queue import UPriorityQueue, HeapPriorityQueue
+
+
+def per_operation_cost(cls, n_tickers, n_rounds=20):
+    """
+    Simulates a k-way merge of n_tickers streams (as
+    MonthlyCSVTickIterator does): for each round every ticker
+    missing from the queue is enqueued, then the lowest
+    priority keys are dequeued.
+
+    Returns mean cost (in seconds) of an operation
+    (membership test, enqueue or dequeue).
+    """
+    tickers = ["T%04d" % i for i in range(n_tickers)]
+    pq = cls(n_tickers)
+    priority = 0
+    n_ops = 0
+    t0 = time.time()
+    for _ in range(n_rounds):
+        for ticker in tickers:
+            n_ops += 1
+            if ticker not in pq:
+                priority += 1
+                pq.enqueue(ticker, priority % 97)
+                n_ops += 1
+        n_ops += len(pq.dequeues())
+    return (time.time() - t0) / n_ops
+
+
+def run(tickers, rounds):
+    """
+    Returns [(n_tickers, UPriorityQueue cost, HeapPriorityQueue
+    cost), ...] (seconds per operation)
+    """
+    results = []
+    print("")
+    print("%8s %22s %22s" % ("tickers", "UPriorityQueue (us/op)", "HeapPriorityQueue (us/op)"))
+    for n_tickers in tickers:
+        cost_locked = per_operation_cost(UPriorityQueue, n_tickers, rounds)
+        cost_heap = per_operation_cost(HeapPriorityQueue, n_tickers, rounds)
+        print("%8d %22.3f %22.3f" % (n_tickers, cost_locked * 1e6, cost_heap * 1e6))
+        results.append((n_tickers, cost_locked, cost_heap))
+    return results
+
+
+@click.command()
+@click.option('--tickers', default='10,100,1000', help='Numbers of tickers (use comma)')
+@click.option('--rounds', default=20, help='Number of rounds of the merge')
+def main(tickers, rounds):
+    run([int(n) for n in tickers.split(",")], rounds)
+
+
+if __name__ == "__main__":
+    main()
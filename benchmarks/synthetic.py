@@ -0,0 +1,105 @@
+#!/usr/bin/env/python
+
+"""
+Deterministic synthetic market data for benchmarks
+
+Ticks are generated by simulate_day of
+scripts/generate_simulated_prices.py (tick intervals
+~ |N(mu_dt, sigma_dt)| milliseconds, bid / ask moving by a
+normal increment with a fixed spread, one random stream per
+day). Same seed gives same data.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from femtotrading.scripts.generate_simulated_prices import simulate_day, correlation_cholesky
+
+
+def ticker_names(n):
+    return ["T%04d" % i for i in range(n)]
+
+
+def random_walk_ticks(tickers, n, seed=42, start="2016-01-04",
+                      init_price=700.0, spread=0.02, mu_dt=1400, sigma_dt=100):
+    """
+    Returns an OrderedDict ticker=>DataFrame (Ticker, Bid, Ask
+    columns indexed by time) of n ticks per ticker
+
+    Tickers share tick times (as generate_simulated_prices)
+    and ticks of successive weekdays are used until there are
+    n ticks
+    """
+    cholesky = correlation_cholesky(len(tickers), 0.0)
+    mid = np.full(len(tickers), float(init_price))
+    start = pd.Timestamp(start)
+    days = []
+    count = 0
+    while count < n:
+        i = len(days)
+        random_state = np.random.RandomState([seed, i])
+        day = (start + pd.offsets.BDay(i)).date()
+        times, bids, asks, mid = simulate_day(random_state, day, mid, spread, mu_dt, sigma_dt, cholesky)
+        days.append((times, bids, asks))
+        count += len(times)
+    times = np.concatenate([day[0] for day in days])[:n]
+    bids = np.concatenate([day[1] for day in days])[:n]
+    asks = np.concatenate([day[2] for day in days])[:n]
+    frames = OrderedDict()
+    for j, ticker in enumerate(tickers):
+        frames[ticker] = pd.DataFrame({
+            "Ticker": ticker,
+            "Bid": np.round(bids[:, j], 5),
+            "Ask": np.round(asks[:, j], 5),
+        }, index=pd.DatetimeIndex(times, name="Time"), columns=["Ticker", "Bid", "Ask"])
+    return frames
+
+
+def random_walk_bars(tickers, n, seed=42, start="2000-01-03", init_price=100.0, sigma=0.01):
+    """
+    Returns an OrderedDict ticker=>DataFrame of n daily bars
+    per ticker (Yahoo columns, business days)
+    """
+    random_state = np.random.RandomState(seed)
+    dates = pd.bdate_range(start, periods=n, name="Date")
+    frames = OrderedDict()
+    for ticker in tickers:
+        close = init_price * np.exp(np.cumsum(random_state.normal(0.0, sigma, size=n)))
+        open_ = np.concatenate([[init_price], close[:-1]])
+        amplitude = np.abs(random_state.normal(0.0, sigma, size=n)) * close
+        frames[ticker] = pd.DataFrame(OrderedDict([
+            ("Open", np.round(open_, 6)),
+            ("High", np.round(np.maximum(open_, close) + amplitude, 6)),
+            ("Low", np.round(np.minimum(open_, close) - amplitude, 6)),
+            ("Close", np.round(close, 6)),
+            ("Volume", random_state.randint(1000000, 5000000, size=n)),
+            ("Adj Close", np.round(close, 6)),
+        ]), index=dates)
+    return frames
+
+
+def write_tick_csv(frames, csv_dir):
+    """
+    Writes TICKER.csv files read by HistoricCSVTickIterator
+    (Ticker, Time, Bid, Ask columns)
+    """
+    for ticker, df in frames.items():
+        df = df.reset_index()
+        df["Time"] = df["Time"].dt.strftime("%d.%m.%Y %H:%M:%S.%f").str[:-3]
+        df[["Ticker", "Time", "Bid", "Ask"]].to_csv(
+            os.path.join(csv_dir, "%s.csv" % ticker),
+            index=False, float_format="%.5f"
+        )
+
+
+def write_yahoo_csv(frames, csv_dir):
+    """
+    Writes TICKER.csv files read by YahooDailyCSVBarIterator
+    """
+    for ticker, df in frames.items():
+        df[["Open", "High", "Low", "Close", "Volume", "Adj Close"]].to_csv(
+            os.path.join(csv_dir, "%s.csv" % ticker), date_format="%Y-%m-%d"
+        )
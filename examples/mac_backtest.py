@@ -18,7 +18,7 @@ from femtotrading.statistics import SimpleStatistics
 from femtotrading.trading_session import Backtest
 
 
-def run(config, testing, tickers):
+def run(config, testing, tickers, profile=None):
     # Set up variables needed for backtest
     events_queue = EventsQueue()
 
@@ -66,7 +66,7 @@ def run(config, testing, tickers):
         position_sizer, risk_manager,
         statistics,
     )
-    results = backtest.run(testing=testing)
+    results = backtest.run(testing=testing, profile=profile)
     return results
 
 
@@ -74,10 +74,11 @@ def run(config, testing, tickers):
 @click.option('--config', default=settings.DEFAULT_CONFIG_FILENAME, help='Config filename')
 @click.option('--testing/--no-testing', default=False, help='Enable testing mode')
 @click.option('--tickers', default='SP500TR', help='Tickers (use comma)')
-def main(config, testing, tickers):
+@click.option('--profile/--no-profile', default=False, help='Print timings of components')
+def main(config, testing, tickers, profile):
     tickers = tickers.split(",")
     config = settings.from_file(config, testing)
-    run(config, testing, tickers)
+    run(config, testing, tickers, profile)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env/python
+
+import click
+
+from decimal import Decimal
+from functools import partial
+
+from femtotrading import settings
+from femtotrading.event import EventsQueue
+from femtotrading.data_iterator.yahoo_daily_csv_bar import (
+    YahooDailyCSVBarIterator, load_yahoo_daily_csv
+)
+from femtotrading.strategy import MovingAverageCrossStrategy
+from femtotrading.position_sizer import FixedQuantityPositionSizer
+from femtotrading.risk_manager import ExampleRiskManager
+from femtotrading.portfolio_handler import PortfolioHandler
+from femtotrading.execution_handler import IBSimulatedExecutionHandler
+from femtotrading.statistics import SimpleStatistics
+from femtotrading.trading_session import Backtest, parameter_grid, run_sweep
+
+
+def make_session(tickers, strategy_class, params, tickers_data):
+    """
+    Builds a Backtest (as mac_backtest) for a set of
+    strategy parameters using already loaded data
+    """
+    events_queue = EventsQueue()
+    initial_equity = Decimal("500000.00")
+    price_handler = YahooDailyCSVBarIterator(None, tickers, tickers_data=tickers_data)
+    strategy = strategy_class(events_queue, tickers, **params)
+    position_sizer = FixedQuantityPositionSizer(100)
+    risk_manager = ExampleRiskManager()
+    portfolio_handler = PortfolioHandler(
+        events_queue, initial_equity, price_handler,
+        position_sizer, risk_manager
+    )
+    # no compliance (trade log file would be shared by workers)
+    execution_handler = IBSimulatedExecutionHandler(
+        events_queue, price_handler, None
+    )
+    statistics = SimpleStatistics(portfolio_handler)
+    return Backtest(
+        events_queue, tickers, price_handler, strategy,
+        portfolio_handler,
+        execution_handler,
+        position_sizer, risk_manager,
+        statistics,
+    )
+
+
+def run(config, tickers, short_windows, long_windows, max_workers=None):
+    grid = parameter_grid(
+        {"short_window": short_windows, "long_window": long_windows},
+        constraint=lambda params: params.short_window < params.long_window
+    )
+    df_results = run_sweep(
+        MovingAverageCrossStrategy, grid,
+        partial(make_session, tickers),
+        partial(load_yahoo_daily_csv, config.CSV_DATA_DIR, tickers),
+        max_workers=max_workers
+    )
+    return df_results
+
+
+@click.command()
+@click.option('--config', default=settings.DEFAULT_CONFIG_FILENAME, help='Config filename')
+@click.option('--testing/--no-testing', default=False, help='Enable testing mode')
+@click.option('--tickers', default='SP500TR', help='Tickers (use comma)')
+@click.option('--short-windows', default='50,100', help='Short windows (use comma)')
+@click.option('--long-windows', default='200,300,400', help='Long windows (use comma)')
+@click.option('--max-workers', default=None, type=int, help='Number of worker processes')
+def main(config, testing, tickers, short_windows, long_windows, max_workers):
+    tickers = tickers.split(",")
+    short_windows = [int(window) for window in short_windows.split(",")]
+    long_windows = [int(window) for window in long_windows.split(",")]
+    config = settings.from_file(config, testing)
+    df_results = run(config, tickers, short_windows, long_windows, max_workers)
+    print(df_results.sort_values("sharpe", ascending=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,13 @@ $ nosetests -s -v examples/test_examples.py:TestExamples.test_buy_and_hold_backt
 import unittest
 
 from femtotrading import settings
+from femtotrading.data_iterator.yahoo_daily_csv_bar import load_yahoo_daily_csv
+from femtotrading.strategy import BuyAndHoldStrategy, MovingAverageCrossStrategy
+from femtotrading.trading_session import VectorizedBacktest
 import examples.main
 import examples.buy_and_hold_backtest
 import examples.mac_backtest
+import examples.mac_sweep
 import examples.strategy_backtest
 
 
@@ -71,6 +75,42 @@ class TestExamples(unittest.TestCase):
         results = examples.mac_backtest.run(self.config, self.testing, tickers)
         self.assertAlmostEqual(float(results['sharpe']), 0.6018)
 
+    def test_mac_sweep(self):
+        """
+        Test mac_sweep (same results as mac_backtest
+        for default parameters, serial or parallel)
+        """
+        tickers = ["SP500TR"]
+        df_parallel = examples.mac_sweep.run(self.config, tickers, [50, 100], [100, 400], max_workers=2)
+        df_serial = examples.mac_sweep.run(self.config, tickers, [50, 100], [100, 400], max_workers=1)
+        self.assertEqual(len(df_parallel), 3)  # short_window < long_window
+        self.assertTrue(df_parallel.equals(df_serial))
+        row = df_parallel.set_index(["short_window", "long_window"]).loc[(100, 400)]
+        self.assertAlmostEqual(row["sharpe"], 0.6018)
+
+    def test_vectorized_backtest(self):
+        """
+        Test VectorizedBacktest gives same equity curve and
+        results as event-driven Backtest
+        """
+        tickers = ["SP500TR"]
+        tickers_data = load_yahoo_daily_csv(self.config.CSV_DATA_DIR, tickers)
+        for strategy_class, params, sharpe in [
+            (BuyAndHoldStrategy, {}, 0.5969),
+            (MovingAverageCrossStrategy, {}, 0.6018),
+            (MovingAverageCrossStrategy, {"short_window": 10, "long_window": 30}, None),
+        ]:
+            backtest = VectorizedBacktest(tickers, tickers_data, strategy_class, params)
+            results = backtest.run()
+            if sharpe is not None:
+                self.assertAlmostEqual(float(results['sharpe']), sharpe)
+            session = examples.mac_sweep.make_session(tickers, strategy_class, params, tickers_data)
+            df = backtest.cross_check(session)
+            self.assertEqual(len(df), 1629)
+            expected = session.statistics.get_results()
+            for key in ['sharpe', 'max_drawdown', 'max_drawdown_pct']:
+                self.assertAlmostEqual(float(results[key]), float(expected[key]))
+
     def test_strategy_backtest(self):
         """
         Test strategy_backtest
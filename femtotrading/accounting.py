@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+Accounting backends for Portfolio
+
+"decimal": Position with Decimal arithmetic (exact, default)
+"float": FloatPosition with float64 arithmetic (much faster)
+"""
+
+from decimal import Decimal
+
+import six
+
+from .position import Position, FloatPosition
+
+
+class DecimalAccounting(object):
+    """
+    Decimal arithmetic (quantized to 2 or 5 places)
+    """
+    name = "decimal"
+    position_class = Position
+    tolerance = Decimal("0.00")
+
+    def amount(self, value):
+        return value
+
+    @property
+    def zero(self):
+        return Decimal("0.00")
+
+
+class FloatAccounting(object):
+    """
+    float64 arithmetic, rounded at the same steps as
+    DecimalAccounting when shares are transacted (market
+    values are not rounded). Cash, equity and P&L match
+    the Decimal path within tolerance (one cent) as long
+    as amounts stay well below 2**53 cents.
+    """
+    name = "float"
+    position_class = FloatPosition
+    tolerance = 0.01
+
+    def amount(self, value):
+        return float(value)
+
+    @property
+    def zero(self):
+        return 0.0
+
+
+ACCOUNTINGS = {
+    DecimalAccounting.name: DecimalAccounting,
+    FloatAccounting.name: FloatAccounting,
+}
+
+
+def get_accounting(accounting=None):
+    """
+    Returns an accounting backend from its name
+    (or the default "decimal" backend)
+    """
+    if accounting is None:
+        accounting = DecimalAccounting.name
+    if not isinstance(accounting, six.string_types):
+        return accounting  # backend instance
+    try:
+        return ACCOUNTINGS[accounting]()
+    except KeyError:
+        raise NotImplementedError("Unsupported accounting '%s' (%s)" % (accounting, ", ".join(sorted(ACCOUNTINGS))))
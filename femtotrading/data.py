@@ -18,3 +18,148 @@ try:
 except ImportError:
     print("can't import Munch using dict")
     TickerData = dict
+
+
+class SlottedData(object):
+    """
+    Compact ticker data with fixed fields (__slots__)
+
+    Fields are read as attributes or as keys
+    (data.bid or data["bid"]) as with TickerData
+
+    _fields are all fields of a class (__slots__ of its
+    base classes first)
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return [getattr(self, key) for key in self._fields]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self._fields]
+
+    def __eq__(self, other):
+        if isinstance(other, SlottedData):
+            return type(self) is type(other) and self.values() == other.values()
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            self.__class__.__name__,
+            ", ".join("%s=%r" % (key, value) for key, value in self.items())
+        )
+
+
+class TickData(SlottedData):
+    """
+    Best bid / ask of a ticker
+    """
+    __slots__ = ("bid", "ask")
+    _fields = __slots__
+
+    def __init__(self, bid, ask):
+        self.bid = bid
+        self.ask = ask
+
+
+class BarData(SlottedData):
+    """
+    Open-High-Low-Close-Volume bar of a ticker
+    """
+    __slots__ = ("open", "high", "low", "close", "volume", "adj_close")
+    _fields = __slots__
+
+    def __init__(self, open, high, low, close, volume, adj_close):
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.adj_close = adj_close
+
+
+class TickBarData(BarData):
+    """
+    Bar of a ticker aggregated from ticks (OHLC of mid,
+    volume is number of ticks) with bid / ask of its last
+    tick
+    """
+    __slots__ = ("bid", "ask", "ticks")
+    _fields = BarData._fields + __slots__
+
+    def __init__(self, open, high, low, close, bid, ask, ticks):
+        super(TickBarData, self).__init__(open, high, low, close, ticks, close)
+        self.bid = bid
+        self.ask = ask
+        self.ticks = ticks
+
+
+class SingleTickerData(object):
+    """
+    Data of ONE ticker (read-only mapping ticker=>ticker data)
+
+    Cheaper to build than Data for events of a single ticker
+    """
+    __slots__ = ("ticker", "ticker_data")
+
+    def __init__(self, ticker, ticker_data):
+        self.ticker = ticker
+        self.ticker_data = ticker_data
+
+    def __getitem__(self, ticker):
+        if ticker == self.ticker:
+            return self.ticker_data
+        raise KeyError(ticker)
+
+    def get(self, ticker, default=None):
+        if ticker == self.ticker:
+            return self.ticker_data
+        return default
+
+    def __contains__(self, ticker):
+        return ticker == self.ticker
+
+    def __iter__(self):
+        yield self.ticker
+
+    def __len__(self):
+        return 1
+
+    def keys(self):
+        return (self.ticker, )
+
+    def values(self):
+        return (self.ticker_data, )
+
+    def items(self):
+        return ((self.ticker, self.ticker_data), )
+
+    def __repr__(self):
+        return "%s([(%r, %r)])" % (self.__class__.__name__, self.ticker, self.ticker_data)
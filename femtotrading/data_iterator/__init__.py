@@ -3,6 +3,11 @@
 
 from .historic_csv_tick import HistoricCSVTickIterator
 from .monthly_csv_tick import MonthlyCSVTickIterator
+from .block_merge import BlockMergeTickIterator
 # from .pandas_iters import (DataFrameBarIterator, PanelBarIterator,
 #                           DataFrameTickIterator, PanelTickIterator)
 from .yahoo_daily_csv_bar import YahooDailyCSVBarIterator
+from .binary_tick_cache import MonthlyBinaryTickerTickIterator
+from .shared_store import share_frames, share_monthly_ticks, SharedMonthlyTickerTickIterator
+from .bar_aggregator import TickToBarIterator
+from .parquet import ParquetTickIterator, ParquetBarIterator
@@ -0,0 +1,187 @@
+#!/usr/bin/env/python
+
+"""
+Event-time aggregation of ticks into bars
+
+TickToBarIterator wraps any tick data iterator and yields
+BarEvents (OHLC of mid, bid / ask close and tick count of
+each ticker) every period seconds of event time. Running
+accumulators are kept per ticker so each tick is O(1).
+Bars are TickBarData (volume is tick count and adj_close
+is close) so bar strategies can run on them.
+
+> price_handler = TickToBarIterator(
+      MonthlyCSVTickIterator(tickers, data_dir, 2014, 1), period=60)
+
+A BarEvent holds every ticker having ticks in the period
+and is timestamped with the END of the period (it is only
+known when the first tick of a later period arrives), so
+there is no look-ahead and times are increasing when raw
+ticks are forwarded too (forward_ticks=True).
+Periods without tick yield no BarEvent.
+"""
+
+import datetime
+from collections import OrderedDict
+
+from .base import AbstractBarDataIterator
+from ..data import Data, TickBarData
+from ..event import BarEvent
+from ..event_log import DISABLED
+from ..utils import EPOCH
+
+
+class BarAccumulator(object):
+    """
+    Running OHLC of mid price of one ticker
+    """
+    def __init__(self, bid, ask):
+        mid = (bid + ask) / 2
+        self.open = mid
+        self.high = mid
+        self.low = mid
+        self.close = mid
+        self.bid = bid
+        self.ask = ask
+        self.ticks = 1
+
+    def update(self, bid, ask):
+        mid = (bid + ask) / 2
+        if mid > self.high:
+            self.high = mid
+        elif mid < self.low:
+            self.low = mid
+        self.close = mid
+        self.bid = bid
+        self.ask = ask
+        self.ticks += 1
+
+    def ticker_data(self):
+        return TickBarData(self.open, self.high, self.low, self.close,
+                           self.bid, self.ask, self.ticks)
+
+
+class TickToBarIterator(AbstractBarDataIterator):
+    """
+    Yields BarEvents of period seconds from ticks of a tick
+    data iterator (and also TickEvents if forward_ticks)
+    """
+    def __init__(self, tick_iterator, period=60, forward_ticks=False):
+        self.tick_iterator = tick_iterator
+        if isinstance(period, datetime.timedelta):
+            self._period = period
+            period = int(period.total_seconds())
+        else:
+            self._period = datetime.timedelta(seconds=period)
+        self.period = period
+        self.forward_ticks = forward_ticks
+        self.tickers = OrderedDict()  # ticker=>last prices
+        self.tickers_data = OrderedDict()
+        self._bars = OrderedDict()  # ticker=>BarAccumulator of current period
+        self._end = None  # end of current period
+        self._pending = None  # tick of next period
+        self._done = False
+
+    def on_init(self):
+        if self.tick_iterator.event_log is DISABLED:
+            self.tick_iterator.event_log = self.event_log
+        self.tick_iterator.on_init()
+
+    def is_tick(self):
+        """
+        bid / ask of last tick are available
+        (fills use them) when ticks are forwarded
+        """
+        return self.forward_ticks
+
+    def _period_end(self, dt):
+        return EPOCH + ((dt - EPOCH) // self._period + 1) * self._period
+
+    def _add_ticks(self, tick_event):
+        if self._end is None:
+            self._end = self._period_end(tick_event.time)
+        for ticker, ticker_data in tick_event.data_event.items():
+            bid, ask = ticker_data["bid"], ticker_data["ask"]
+            try:
+                self._bars[ticker].update(bid, ask)
+            except KeyError:
+                self._bars[ticker] = BarAccumulator(bid, ask)
+            try:
+                prices = self.tickers[ticker]
+            except KeyError:
+                prices = self.tickers[ticker] = {"close": None}
+            prices["bid"] = bid
+            prices["ask"] = ask
+            prices["timestamp"] = tick_event.time
+
+    def _close_bars(self):
+        """
+        Returns BarEvent of current period (None if there
+        was no tick) and starts a new period
+        """
+        if not self._bars:
+            self._end = None
+            return None
+        data = Data()
+        for ticker, bar in self._bars.items():
+            data[ticker] = bar.ticker_data()
+            self.tickers[ticker]["close"] = bar.close
+        event = BarEvent(self._end, self.period, data)
+        self._bars = OrderedDict()
+        self._end = None
+        return event
+
+    def __next__(self):
+        """
+        Returns next BarEvent (or TickEvent if forward_ticks)
+        """
+        while True:
+            if self._pending is not None:
+                tick_event, self._pending = self._pending, None
+            elif self._done:
+                raise StopIteration
+            else:
+                try:
+                    tick_event = next(self.tick_iterator)
+                except StopIteration:
+                    self._done = True
+                    bar_event = self._close_bars()
+                    if bar_event is None:
+                        raise StopIteration
+                    return bar_event
+            if self._end is not None and tick_event.time >= self._end:
+                # tick is processed after bars of current period
+                self._pending = tick_event
+                bar_event = self._close_bars()
+                if bar_event is not None:
+                    return bar_event
+                continue
+            self._add_ticks(tick_event)
+            if self.forward_ticks:
+                return tick_event
+
+    def get_last_close(self, ticker):
+        """
+        Returns close (mid) of last bar of a ticker
+        """
+        if ticker in self.tickers:
+            return self.tickers[ticker]["close"]
+        else:
+            print(
+                "Close price for ticker %s is not "
+                "available from the %s." % (ticker, self.__class__.__name__)
+            )
+            return None
+
+    def get_best_bid_ask(self, ticker):
+        """
+        Returns bid / ask of last tick of a ticker
+        """
+        if ticker in self.tickers:
+            return self.tickers[ticker]["bid"], self.tickers[ticker]["ask"]
+        else:
+            print(
+                "Bid/ask values for ticker %s are not "
+                "available from the %s." % (ticker, self.__class__.__name__)
+            )
+            return None, None
@@ -3,6 +3,7 @@
 import datetime
 import decimal
 
+from ..event_log import DISABLED
 from ..utils import EPOCH
 
 
@@ -46,6 +47,8 @@ class AbstractDataIterator(object):
     AbstractDataIterator is base class providing an interface for all subsequent
     (inherited) data (price) events
     """
+    event_log = DISABLED
+
     @property
     def type(self):
         raise NotImplementedError("Must be implemented")
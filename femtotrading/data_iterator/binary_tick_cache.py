@@ -0,0 +1,262 @@
+#!/usr/bin/env/python
+
+"""
+Memory-mapped binary tick cache
+
+Each TICKER-YYYY-MM.csv file is converted once to a fixed-width
+binary file (header followed by records of int64 epoch-ns
+timestamp, float64 bid, float64 ask) which is then read through
+numpy.memmap without any per-line parsing.
+
+The header stores size and mtime of the source CSV file so
+the cache is rebuilt automatically when the CSV file changes.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .base import DefaultDataParser
+from ..data import TickData
+from ..event_log import DISABLED, DEBUG
+
+
+MAGIC = b"FEMTOTCK"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<i8"),
+    ("src_size", "<i8"),
+    ("src_mtime_ns", "<i8"),
+])
+
+TICK_DTYPE = np.dtype([
+    ("time", "<i8"),  # epoch-ns
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+])
+
+
+def _source_stat(csv_fname):
+    st = os.stat(csv_fname)
+    mtime_ns = getattr(st, "st_mtime_ns", int(st.st_mtime * 1e9))
+    return st.st_size, mtime_ns
+
+
+def binary_filename(csv_fname, cache_dir=None):
+    """
+    Returns binary cache filename for a CSV file
+    (same directory by default)
+    """
+    base, _ = os.path.splitext(os.path.basename(csv_fname))
+    if cache_dir is None:
+        cache_dir = os.path.dirname(csv_fname)
+    return os.path.join(os.path.expanduser(cache_dir), base + ".bin")
+
+
+def read_header(bin_fname):
+    header = np.fromfile(bin_fname, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0:
+        return None
+    return header[0]
+
+
+def is_cache_valid(csv_fname, bin_fname):
+    """
+    Returns True if binary file exists and was built
+    from the current version of the CSV file
+    """
+    if not os.path.exists(bin_fname):
+        return False
+    header = read_header(bin_fname)
+    if header is None or header["magic"] != MAGIC or header["version"] != VERSION:
+        return False
+    src_size, src_mtime_ns = _source_stat(csv_fname)
+    return header["src_size"] == src_size and header["src_mtime_ns"] == src_mtime_ns
+
+
+def convert_csv_to_binary(csv_fname, bin_fname=None):
+    """
+    Converts a tick CSV file (ticker,YYYYMMDD HH:MM:SS.sss,bid,ask
+    without header) to a binary file
+    """
+    if bin_fname is None:
+        bin_fname = binary_filename(csv_fname)
+    src_size, src_mtime_ns = _source_stat(csv_fname)
+    df = pd.read_csv(
+        csv_fname, header=None,
+        names=("Ticker", "Time", "Bid", "Ask"),
+        dtype={"Ticker": str, "Time": str, "Bid": np.float64, "Ask": np.float64}
+    )
+    ticks = np.empty(len(df), dtype=TICK_DTYPE)
+    ticks["time"] = pd.to_datetime(
+        df["Time"], format="%Y%m%d %H:%M:%S.%f"
+    ).values.astype("datetime64[ns]").astype(np.int64)
+    ticks["bid"] = df["Bid"].values
+    ticks["ask"] = df["Ask"].values
+
+    return write_ticks(bin_fname, ticks, src_size, src_mtime_ns)
+
+
+def write_ticks(bin_fname, ticks, src_size=0, src_mtime_ns=0):
+    """
+    Writes an array of ticks (TICK_DTYPE) to a binary file
+    (src_size and src_mtime_ns are stat of the source CSV
+    file, 0 for ticks which have no CSV file)
+    """
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["src_size"] = src_size
+    header["src_mtime_ns"] = src_mtime_ns
+
+    tmp_fname = bin_fname + ".tmp"
+    with open(tmp_fname, "wb") as fd:
+        header.tofile(fd)
+        ticks.tofile(fd)
+    if os.path.exists(bin_fname):
+        os.remove(bin_fname)
+    os.rename(tmp_fname, bin_fname)
+    return bin_fname
+
+
+def read_ticks(bin_fname):
+    """
+    Returns a read-only memory-mapped array of ticks
+    (TICK_DTYPE) of a binary file
+    """
+    n = (os.path.getsize(bin_fname) - HEADER_DTYPE.itemsize) // TICK_DTYPE.itemsize
+    if n == 0:
+        return np.empty(0, dtype=TICK_DTYPE)
+    return np.memmap(
+        bin_fname, dtype=TICK_DTYPE, mode="r",
+        offset=HEADER_DTYPE.itemsize, shape=(n,)
+    )
+
+
+def load_ticks(csv_fname, cache_dir=None):
+    """
+    Returns a read-only memory-mapped array of ticks
+    (TICK_DTYPE) for a CSV file. Binary cache is (re)built
+    if needed.
+    """
+    bin_fname = binary_filename(csv_fname, cache_dir)
+    if not is_cache_valid(csv_fname, bin_fname):
+        convert_csv_to_binary(csv_fname, bin_fname)
+    return read_ticks(bin_fname)
+
+
+class MonthlyBinaryTickerTickIterator(object):
+    """
+    Yields ticks for ONE ticker for a given month
+    from a memory-mapped binary cache of the CSV file.
+
+    It can be used in place of MonthlyTickerTickIterator
+
+    > MonthlyCSVTickIterator(tickers, data_dir, 2014, 1,
+          tick_ticker_iterator=MonthlyBinaryTickerTickIterator)
+    """
+    BLOCK_SIZE = 4096
+
+    event_log = DISABLED
+
+    def __init__(self, ticker, data_dir, year, month, data_parser=None, cache_dir=None, ticks=None,
+                 event_log=None):
+        """
+        ticks (optional) is an array of already loaded ticks
+        (TICK_DTYPE) used instead of the binary cache file
+        event_log (optional) is an EventLog (see event_log)
+        """
+        if event_log is not None:
+            self.event_log = event_log
+        self.data_dir = data_dir
+        self.ticker = ticker
+        self.year = year
+        self.month = month
+        if ticks is None:
+            fname = self.filename
+            self.event_log.log(DEBUG, "open", filename=fname)
+            ticks = load_ticks(fname, cache_dir)
+        self._ticks = ticks
+        self._eof = False
+        self._parser = data_parser
+        self._i = 0
+        self._start = 0
+        self._stop = 0
+        self._block = None
+
+    @property
+    def filename(self):
+        return os.path.join(
+            os.path.expanduser(self.data_dir),
+            "%s-%4d-%02d.csv" % (self.ticker, self.year, self.month)
+        )
+
+    def _prices(self, ticks):
+        bids = ticks["bid"].tolist()
+        asks = ticks["ask"].tolist()
+        if self._parser is not None and type(self._parser) is not DefaultDataParser:
+            bids = [self._parser.price(repr(bid)) for bid in bids]
+            asks = [self._parser.price(repr(ask)) for ask in asks]
+        return bids, asks
+
+    def _read_block(self, start, stop):
+        ticks = self._ticks[start:stop]
+        dts = ticks["time"].view("datetime64[ns]").astype("datetime64[us]").tolist()
+        bids, asks = self._prices(ticks)
+        return dts, bids, asks
+
+    def __next__(self):
+        if not self._eof:
+            i = self._i
+            if i >= self._stop:
+                if i >= len(self._ticks):
+                    self.__close__()
+                    raise StopIteration
+                self._start = i
+                self._stop = min(i + self.BLOCK_SIZE, len(self._ticks))
+                self._block = self._read_block(self._start, self._stop)
+            j = i - self._start
+            dts, bids, asks = self._block
+            self._i = i + 1
+            ticker_data = TickData(bids[j], asks[j])
+            return dts[j], ticker_data
+
+    def next(self):
+        return self.__next__()
+
+    def next_block(self, size):
+        """
+        Returns at most size ticks as (times, bids, asks)
+        with times as int64 epoch-ns array
+        or None when there is no more tick
+        """
+        if self._eof:
+            return None
+        i = self._i
+        if i >= len(self._ticks):
+            self.__close__()
+            return None
+        stop = min(i + size, len(self._ticks))
+        ticks = self._ticks[i:stop]
+        bids, asks = self._prices(ticks)
+        times = np.array(ticks["time"])
+        self._i = stop
+        self._start = self._stop = stop
+        return times, bids, asks
+
+    @property
+    def done(self):
+        return self._eof
+
+    def __close__(self):
+        self.event_log.log(DEBUG, "close", iterator=self)
+        self._eof = True
+        self._block = None
+        self._ticks = None
+
+    def __repr__(self):
+        s = "<MonthBinaryTickIterator %s %04d %02d>" % (self.ticker, self.year, self.month)
+        return s
@@ -0,0 +1,194 @@
+#!/usr/bin/env/python
+
+"""
+Vectorized k-way merge of per-ticker tick streams
+
+Instead of a priority queue holding one tick per ticker,
+timestamps of all tickers are read in blocks and merged
+with NumPy (lexsort on concatenated chunks).
+
+Output order is the same as MonthlyCSVTickIterator:
+events are ordered by time, a TickEvent groups the ticks
+of several tickers sharing the same timestamp (tickers
+sorted by name) and if a ticker has several ticks with
+the same timestamp, they are dispatched in successive
+events.
+"""
+
+import six
+
+import numpy as np
+
+from .base import AbstractTickDataIterator
+from .monthly_csv_tick import MonthlyTickerTickIterator
+
+from ..data import Data, TickData
+from ..event import TickEvent
+from ..event_log import DISABLED, DEBUG
+
+
+class _TickerBuffer(object):
+    """
+    Ticks of one ticker read ahead from its iterator
+    """
+    def __init__(self, ticker_itr):
+        self.ticker_itr = ticker_itr
+        self.times = np.empty(0, dtype=np.int64)
+        self.bids = []
+        self.asks = []
+        self.exhausted = False
+
+    def __len__(self):
+        return len(self.times)
+
+    def read(self, size):
+        """
+        Appends a block of ticks. Returns False if
+        ticker iterator is exhausted.
+        """
+        block = self.ticker_itr.next_block(size)
+        if block is None:
+            self.exhausted = True
+            return False
+        times, bids, asks = block
+        self.times = np.concatenate([self.times, times])
+        self.bids.extend(bids)
+        self.asks.extend(asks)
+        return True
+
+    def pop(self, n):
+        """
+        Removes and returns the n first ticks
+        """
+        times, self.times = self.times[:n], self.times[n:]
+        bids, self.bids = self.bids[:n], self.bids[n:]
+        asks, self.asks = self.asks[:n], self.asks[n:]
+        return times, bids, asks
+
+
+class BlockMergeTickIterator(AbstractTickDataIterator):
+    """
+    Yields ticks for SEVERAL tickers for a given month
+    (same events as MonthlyCSVTickIterator)
+
+    Ticker iterators must provide next_block(size)
+    (MonthlyTickerTickIterator, MonthlyBinaryTickerTickIterator)
+    """
+    def __init__(self, tickers, data_dir, year, month,
+                 tick_ticker_iterator=MonthlyTickerTickIterator, block_size=4096, event_log=None):
+        """
+        event_log (optional) is an EventLog (see event_log)
+        also used by ticker iterators once they are created
+        """
+        self.data_dir = data_dir
+        if isinstance(tickers, six.string_types):
+            self.tickers = [tickers]
+        else:
+            self.tickers = tickers
+        self.block_size = block_size
+        self.d_iterators = {}
+        self.event_log = DISABLED if event_log is None else event_log
+        for ticker in self.tickers:
+            self.event_log.log(DEBUG, "create_iterator", ticker=ticker)
+            ticker_itr = tick_ticker_iterator(ticker, data_dir, year, month)
+            ticker_itr.event_log = self.event_log
+            self.d_iterators[ticker] = ticker_itr
+        # same timestamp ticks are ordered by ticker name (as the priority queue does)
+        self._sorted_tickers = sorted(self.tickers)
+        self._buffers = [_TickerBuffer(self.d_iterators[ticker]) for ticker in self._sorted_tickers]
+        self._pending = []  # [(dt, [(ticker, bid, ask), ...]), ...]
+        self._i_pending = 0
+        self.last_data = Data()  # ticker=>ticker_data
+
+    @property
+    def event_log(self):
+        return self._event_log
+
+    @event_log.setter
+    def event_log(self, event_log):
+        # ticker iterators log with the same EventLog
+        self._event_log = event_log
+        for ticker_itr in self.d_iterators.values():
+            ticker_itr.event_log = event_log
+
+    def _merge_block(self):
+        """
+        Merges all buffered ticks which are older than the
+        most recent tick that every (non-exhausted) ticker
+        has already read, into a list of pending groups.
+
+        Returns False when all tickers are exhausted.
+        """
+        while True:
+            for buf in self._buffers:
+                if len(buf) == 0 and not buf.exhausted:
+                    buf.read(self.block_size)
+
+            limits = [buf.times[-1] for buf in self._buffers if not buf.exhausted and len(buf) > 0]
+            if len(limits) == 0:
+                horizon = None
+                counts = [len(buf) for buf in self._buffers]
+            else:
+                horizon = min(limits)
+                counts = [np.searchsorted(buf.times, horizon, side="left") for buf in self._buffers]
+
+            if sum(counts) > 0:
+                break
+            if horizon is None:
+                return False
+            # every tick left is at horizon: read further
+            # to be sure no tick at horizon is missing
+            for buf in self._buffers:
+                if not buf.exhausted and len(buf) > 0 and buf.times[-1] == horizon:
+                    buf.read(self.block_size)
+
+        times, ranks, occurrences, bids, asks = [], [], [], [], []
+        for rank, (buf, n) in enumerate(zip(self._buffers, counts)):
+            if n == 0:
+                continue
+            t, b, a = buf.pop(n)
+            times.append(t)
+            ranks.append(np.full(n, rank, dtype=np.int64))
+            # n-th tick of a ticker with the same timestamp
+            occurrences.append(np.arange(n) - np.searchsorted(t, t, side="left"))
+            bids.extend(b)
+            asks.extend(a)
+        times = np.concatenate(times)
+        ranks = np.concatenate(ranks)
+        occurrences = np.concatenate(occurrences)
+
+        order = np.lexsort((ranks, occurrences, times))
+        times = times[order]
+        occurrences = occurrences[order]
+        new_group = np.ones(len(order), dtype=bool)
+        new_group[1:] = (times[1:] != times[:-1]) | (occurrences[1:] != occurrences[:-1])
+        starts = np.flatnonzero(new_group).tolist() + [len(order)]
+
+        dts = times.view("datetime64[ns]").astype("datetime64[us]").tolist()
+        tickers = [self._sorted_tickers[rank] for rank in ranks[order].tolist()]
+        order = order.tolist()
+        rows = [(tickers[j], bids[i], asks[i]) for j, i in enumerate(order)]
+
+        self._pending = [
+            (dts[start], rows[start:stop]) for start, stop in zip(starts[:-1], starts[1:])
+        ]
+        self._i_pending = 0
+        return True
+
+    def __next__(self):
+        if self._i_pending >= len(self._pending):
+            if not self._merge_block():
+                raise StopIteration
+        dt, rows = self._pending[self._i_pending]
+        self._i_pending += 1
+
+        data = Data()  # Ticker=>ticker_data
+        for ticker, bid, ask in rows:
+            ticker_data = TickData(bid, ask)
+            data[ticker] = ticker_data
+            self.last_data[ticker] = ticker_data
+        return TickEvent(dt, data)
+
+    def __close__(self):
+        for ticker in self.tickers:
+            self.d_iterators[ticker].__close__()
@@ -0,0 +1,133 @@
+#!/usr/bin/env/python
+
+"""
+Columnar in-memory store for bar / tick data
+
+Rows of every ticker are merged into contiguous NumPy arrays
+(one array per field, plus a timestamp array and a ticker-code
+array) sorted by time. Data iterators walk the store by integer
+index instead of boxing each row into a pandas Series.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarStore(object):
+    """
+    Time ordered columnar store
+
+    > store = ColumnarStore.from_frames(frames, ["Bid", "Ask"])
+    > store.tickers
+    ['GOOG', 'AMZN', 'MSFT']
+    > store.timestamps[0], store.codes[0], store.columns["Bid"][0]
+
+    Rows sharing the same timestamp keep the order in which
+    tickers were given (stable sort).
+    """
+
+    DEFAULT_BLOCK_SIZE = 4096
+
+    def __init__(self, tickers, timestamps, codes, columns):
+        self.tickers = list(tickers)
+        self.timestamps = timestamps
+        self.codes = codes
+        self.columns = columns
+
+    @classmethod
+    def from_frames(cls, frames, fields):
+        """
+        Builds a store from an (ordered) dict of DataFrames
+        indexed by timestamp (one DataFrame per ticker).
+        """
+        tickers = list(frames.keys())
+        dfs = [frames[ticker] for ticker in tickers]
+        if len(dfs) == 0:
+            return cls(tickers, np.array([], dtype="datetime64[ns]"),
+                       np.array([], dtype=np.int32),
+                       dict((field, np.array([])) for field in fields))
+        timestamps = np.concatenate([df.index.values for df in dfs])
+        codes = np.concatenate([
+            np.full(len(df), code, dtype=np.int32) for code, df in enumerate(dfs)
+        ])
+        order = np.argsort(timestamps, kind="mergesort")
+        columns = {}
+        for field in fields:
+            columns[field] = np.ascontiguousarray(
+                np.concatenate([df[field].values for df in dfs])[order]
+            )
+        return cls(tickers, timestamps[order], codes[order], columns)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def code(self, ticker):
+        return self.tickers.index(ticker)
+
+    def first_index(self, ticker):
+        """
+        Returns the position of the first row of a ticker
+        (or None if the ticker has no row)
+        """
+        idx = np.flatnonzero(self.codes == self.code(ticker))
+        if len(idx) == 0:
+            return None
+        return idx[0]
+
+    def block(self, start, stop, fields):
+        """
+        Returns rows [start, stop) as plain Python objects:
+        a list of pd.Timestamp, a list of tickers and one list
+        per requested field.
+        """
+        timestamps = pd.DatetimeIndex(self.timestamps[start:stop]).tolist()
+        tickers = [self.tickers[code] for code in self.codes[start:stop].tolist()]
+        values = [self.columns[field][start:stop].tolist() for field in fields]
+        return timestamps, tickers, values
+
+
+class ColumnarCursor(object):
+    """
+    Walks a ColumnarStore row by row by integer index.
+
+    Rows are materialized block by block so that per-row access
+    is a plain list lookup.
+    """
+    def __init__(self, store, fields, block_size=None):
+        self.store = store
+        self.fields = fields
+        if block_size is None:
+            block_size = store.DEFAULT_BLOCK_SIZE
+        self.block_size = block_size
+        self.index = 0
+        self._start = 0
+        self._stop = 0
+        self._block = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        i = self.index
+        if i >= self._stop:
+            if i >= len(self.store):
+                raise StopIteration
+            self._start = i
+            self._stop = min(i + self.block_size, len(self.store))
+            self._block = self.store.block(self._start, self._stop, self.fields)
+        j = i - self._start
+        timestamps, tickers, values = self._block
+        self.index = i + 1
+        return timestamps[j], tickers[j], [column[j] for column in values]
+
+    def next(self):
+        return self.__next__()
+
+    def next_has_same_time(self):
+        """
+        Returns True if next row has the same timestamp as
+        the row which was just returned
+        """
+        i = self.index
+        timestamps = self.store.timestamps
+        return 0 < i < len(timestamps) and timestamps[i] == timestamps[i - 1]
@@ -7,32 +7,90 @@ import pandas as pd
 from collections import OrderedDict
 
 from .base import AbstractTickDataIterator
+from .columnar import ColumnarStore, ColumnarCursor
+from .streaming import ChunkCursor, HeapMergeCursor, frame_chunks
 
-from ..event import TickEvent
+from ..event import TickEvent, EventPool, PooledTickEvent
 from ..data import PLACES
 
 
+def read_historic_tick_csv(csv_dir, ticker, chunksize=None):
+    """
+    Reads CSV file of ticks of a ticker into a pandas
+    DataFrame (or an iterator of DataFrames of chunksize
+    rows if chunksize is given)
+    """
+    ticker_path = os.path.join(csv_dir, "%s.csv" % ticker)
+    return pd.io.parsers.read_csv(
+        ticker_path, header=0, parse_dates=True,
+        dayfirst=True, index_col=1,
+        names=("Ticker", "Time", "Bid", "Ask"),
+        chunksize=chunksize
+    )
+
+
 class HistoricCSVTickIterator(AbstractTickDataIterator):
     """
     HistoricCSVTickIterator is designed to read CSV files of
     tick data for each requested financial instrument and
     and to iterate TickEvents.
     """
-    def __init__(self, csv_dir, init_tickers=None):
+    FIELDS = ["Bid", "Ask"]
+
+    def __init__(
+        self, csv_dir, init_tickers=None, tickers_data=None, store=None, reuse_events=False,
+        chunksize=None
+    ):
         """
         Takes the CSV directory and a possible
         list of initial ticker symbols
+
+        tickers_data (optional) is a dict ticker=>DataFrame of
+        already loaded data used instead of reading CSV files
+
+        store (optional) is a ColumnarStore or a descriptor of a
+        store in shared memory (see shared_store.share_frames)
+        holding data of all tickers (csv_dir and init_tickers
+        are then not used)
+
+        reuse_events=True yields events of a small EventPool
+        updated in place (an event must be frozen to be kept
+        after dispatch, see EventPool)
+
+        chunksize (optional) streams ticks: CSV files (which
+        must be ordered by time) are read by chunks of
+        chunksize rows and merged lazily (see streaming)
+        instead of being loaded and merged at once, so memory
+        is bounded by chunksize x number of tickers
+        (tickers_data stays empty)
         """
+        if chunksize is not None and store is not None:
+            raise ValueError("chunksize can't be used with store")
         self.csv_dir = csv_dir
         self.tickers = OrderedDict()
         self.tickers_data = OrderedDict()
         self.init_tickers = init_tickers
+        if tickers_data is None:
+            tickers_data = {}
+        self._preloaded_data = tickers_data
+        self._shared_store = store
+        self._pool = EventPool(PooledTickEvent) if reuse_events else None
+        self.chunksize = chunksize
+        self._chunks = OrderedDict()  # ticker=>ChunkCursor (streaming)
 
     def on_init(self):
         """
         creates an (optional) list of ticker subscriptions and
         associated prices.
         """
+        if self._shared_store is not None:
+            # shared_memory requires Python 3.8+
+            from .shared_store import attach_store
+            self._store = attach_store(self._shared_store)
+            for ticker in self._store.tickers:
+                self._subscribe_ticker_from_store(ticker)
+            self._stream = ColumnarCursor(self._store, self.FIELDS)
+            return
         if self.init_tickers is not None:
             for ticker in self.init_tickers:
                 self.subscribe_ticker(ticker)
@@ -44,12 +102,22 @@ class HistoricCSVTickIterator(AbstractTickDataIterator):
         the specified CSV data directory, converting them into
         them into a pandas DataFrame, stored in a dictionary.
         """
-        ticker_path = os.path.join(self.csv_dir, "%s.csv" % ticker)
-        self.tickers_data[ticker] = pd.io.parsers.read_csv(
-            ticker_path, header=0, parse_dates=True,
-            dayfirst=True, index_col=1,
-            names=("Ticker", "Time", "Bid", "Ask")
-        )
+        if ticker in self._preloaded_data:
+            self.tickers_data[ticker] = self._preloaded_data[ticker]
+        else:
+            self.tickers_data[ticker] = read_historic_tick_csv(self.csv_dir, ticker)
+
+    def _open_ticker_price_chunks(self, ticker):
+        """
+        Opens a chunked reader of the CSV file of a ticker
+        (streaming) and returns its first row
+        """
+        if ticker in self._preloaded_data:
+            chunks = frame_chunks(self._preloaded_data[ticker], self.chunksize)
+        else:
+            chunks = read_historic_tick_csv(self.csv_dir, ticker, self.chunksize)
+        self._chunks[ticker] = cursor = ChunkCursor(chunks, self.FIELDS)
+        return cursor.row()
 
     def _merge_sort_ticker_data(self):
         """
@@ -59,10 +127,15 @@ class HistoricCSVTickIterator(AbstractTickDataIterator):
 
         Note that this is an idealised situation, utilised solely for
         backtesting. In live trading ticks may arrive "out of order".
+
+        Data are merged into a ColumnarStore which is walked by
+        integer index (no DataFrame row boxing), or merged
+        lazily chunk by chunk when streaming.
         """
-        return pd.concat(
-            self.tickers_data.values()
-        ).sort_index().iterrows()
+        if self.chunksize is not None:
+            return HeapMergeCursor(self._chunks, self.FIELDS)
+        self._store = ColumnarStore.from_frames(self.tickers_data, self.FIELDS)
+        return ColumnarCursor(self._store, self.FIELDS)
 
     def subscribe_ticker(self, ticker):
         """
@@ -70,13 +143,17 @@ class HistoricCSVTickIterator(AbstractTickDataIterator):
         """
         if ticker not in self.tickers:
             try:
-                self._open_ticker_price_csv(ticker)
-                dft = self.tickers_data[ticker]
-                row0 = dft.iloc[0]
+                if self.chunksize is not None:
+                    timestamp, (bid, ask) = self._open_ticker_price_chunks(ticker)
+                else:
+                    self._open_ticker_price_csv(ticker)
+                    dft = self.tickers_data[ticker]
+                    row0 = dft.iloc[0]
+                    timestamp, bid, ask = dft.index[0], row0["Bid"], row0["Ask"]
                 ticker_prices = {
-                    "bid": decimal.Decimal(str(row0["Bid"])),
-                    "ask": decimal.Decimal(str(row0["Ask"])),
-                    "timestamp": dft.index[0]
+                    "bid": decimal.Decimal(str(bid)),
+                    "ask": decimal.Decimal(str(ask)),
+                    "timestamp": timestamp
                 }
                 self.tickers[ticker] = ticker_prices
             except OSError:
@@ -90,6 +167,14 @@ class HistoricCSVTickIterator(AbstractTickDataIterator):
                 "as is already subscribed." % ticker
             )
 
+    def _subscribe_ticker_from_store(self, ticker):
+        i = self._store.first_index(ticker)
+        self.tickers[ticker] = {
+            "bid": decimal.Decimal(str(self._store.columns["Bid"][i])),
+            "ask": decimal.Decimal(str(self._store.columns["Ask"][i])),
+            "timestamp": pd.Timestamp(self._store.timestamps[i])
+        }
+
     def get_best_bid_ask(self, ticker):
         """
         Returns the most recent bid/ask price for a ticker.
@@ -109,12 +194,11 @@ class HistoricCSVTickIterator(AbstractTickDataIterator):
         """
         Return the next TickEvent.
         """
-        dt, row = next(self._stream)
+        dt, ticker, (bid, ask) = next(self._stream)
 
         decimal.getcontext().rounding = decimal.ROUND_HALF_DOWN
-        ticker = row["Ticker"]
-        bid = decimal.Decimal(str(row["Bid"])).quantize(PLACES[5])
-        ask = decimal.Decimal(str(row["Ask"])).quantize(PLACES[5])
+        bid = decimal.Decimal(str(bid)).quantize(PLACES[5])
+        ask = decimal.Decimal(str(ask)).quantize(PLACES[5])
 
         # Create decimalised prices for traded pair
         self.tickers[ticker]["bid"] = bid
@@ -122,4 +206,6 @@ class HistoricCSVTickIterator(AbstractTickDataIterator):
         self.tickers[ticker]["timestamp"] = dt
 
         # Create the tick event for the queue
+        if self._pool is not None:
+            return self._pool.acquire().set(dt, ticker, bid, ask)
         return TickEvent.from_ticker(dt, ticker, bid, ask)
@@ -3,25 +3,33 @@
 import six
 import os
 
+import numpy as np
+import pandas as pd
+
 from .base import AbstractTickDataIterator, DefaultDataParser
 
-from ..priority_queue import UPriorityQueue
+from ..priority_queue import HeapPriorityQueue
 from ..compat import queue
-from ..data import Data, TickerData
+from ..data import Data, TickData
 from ..event import TickEvent
+from ..event_log import DISABLED, DEBUG
 
 
 class MonthlyTickerTickIterator(object):
     """
     Yields ticks for ONE ticker for a given month
     """
-    def __init__(self, ticker, data_dir, year, month, data_parser=None):
+    event_log = DISABLED
+
+    def __init__(self, ticker, data_dir, year, month, data_parser=None, event_log=None):
+        if event_log is not None:
+            self.event_log = event_log
         self.data_dir = data_dir
         self.ticker = ticker
         self.year = year
         self.month = month
         fname = self.filename
-        print("open '%s'" % fname)
+        self.event_log.log(DEBUG, "open", filename=fname)
         self._fd = open(fname)
         self._eof = False
         if data_parser is None:
@@ -45,22 +53,47 @@ class MonthlyTickerTickIterator(object):
             data = line[0:-1]  # remove \n
             data = data.split(",")
             dt = self._parser.datetime(data[1])
-            ticker_data = TickerData([
-                # ("ticker", data[0]),
-                # ("dt", dt),
-                ("bid", self._parser.price(data[2])),
-                ("ask", self._parser.price(data[3])),
-                # ("volume", self._parser.default.volume),
-            ])
+            ticker_data = TickData(
+                self._parser.price(data[2]),  # bid
+                self._parser.price(data[3]),  # ask
+            )
             # ticker_data["spread"] = (ticker_data["ask"] - ticker_data["bid"]) * 10000
             return dt, ticker_data
 
+    def next_block(self, size):
+        """
+        Returns at most size ticks as (times, bids, asks)
+        with times as int64 epoch-ns array
+        or None when there is no more tick
+        """
+        if self._eof:
+            return None
+        lines = []
+        for _ in range(size):
+            line = self._fd.readline()
+            if not line:
+                break
+            lines.append(line[0:-1].split(","))
+        if len(lines) < size:
+            self.__close__()
+        if len(lines) == 0:
+            return None
+        s_times = [data[1] for data in lines]
+        if type(self._parser).datetime == DefaultDataParser.datetime:
+            times = pd.to_datetime(s_times, format="%Y%m%d %H:%M:%S.%f")
+        else:
+            times = pd.DatetimeIndex([self._parser.datetime(s) for s in s_times])
+        times = times.values.astype("datetime64[ns]").astype(np.int64)
+        bids = [self._parser.price(data[2]) for data in lines]
+        asks = [self._parser.price(data[3]) for data in lines]
+        return times, bids, asks
+
     @property
     def done(self):
         return self._eof
 
     def __close__(self):
-        print("close %s" % self)
+        self.event_log.log(DEBUG, "close", iterator=self)
         self._eof = True
         self._fd.close()
 
@@ -73,24 +106,43 @@ class MonthlyCSVTickIterator(AbstractTickDataIterator):
     """
     Yields ticks for SEVERAL tickers for a given month
     """
-    def __init__(self, tickers, data_dir, year, month, tick_ticker_iterator=MonthlyTickerTickIterator):
+    def __init__(self, tickers, data_dir, year, month, tick_ticker_iterator=MonthlyTickerTickIterator,
+                 event_log=None):
+        """
+        event_log (optional) is an EventLog (see event_log)
+        also used by ticker iterators once they are created
+        """
         self.data_dir = data_dir
         if isinstance(tickers, six.string_types):
             self.tickers = [tickers]
         else:
             self.tickers = tickers
-        self._pq = UPriorityQueue(len(tickers))  # priority queue / heap queue
+        self._pq = HeapPriorityQueue(len(tickers))  # priority queue / heap queue
         self.d_iterators = {}
+        self.event_log = DISABLED if event_log is None else event_log
         self.i_ticker = 0
         for ticker in tickers:
-            print("Create iterator for '%s'" % ticker)
-            self.d_iterators[ticker] = tick_ticker_iterator(ticker, data_dir, year, month)
+            self.event_log.log(DEBUG, "create_iterator", ticker=ticker)
+            ticker_itr = tick_ticker_iterator(ticker, data_dir, year, month)
+            ticker_itr.event_log = self.event_log
+            self.d_iterators[ticker] = ticker_itr
         self.last_data = Data()  # ticker=>ticker_data
 
+    @property
+    def event_log(self):
+        return self._event_log
+
+    @event_log.setter
+    def event_log(self, event_log):
+        # ticker iterators log with the same EventLog
+        self._event_log = event_log
+        for ticker_itr in self.d_iterators.values():
+            ticker_itr.event_log = event_log
+
     def __next__(self):
         try:
             for ticker in self.tickers:
-                if ticker not in self._pq.keys():
+                if ticker not in self._pq:
                     ticker_itr = self.d_iterators[ticker]
                     if not ticker_itr.done:
                         dt, ticker_data = ticker_itr.__next__()
@@ -114,8 +166,8 @@ class MonthlyCSVTickIterator(AbstractTickDataIterator):
             return TickEvent(dt, data)
 
         except StopIteration:
-            dt, data = self.__next__()
-            return TickEvent(dt, data)
+            # a ticker iterator is exhausted: try again with others
+            return self.__next__()
 
         except queue.Empty:
             raise StopIteration
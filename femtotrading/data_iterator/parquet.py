@@ -0,0 +1,434 @@
+#!/usr/bin/env/python
+
+"""
+Data iterators reading partitioned Parquet datasets
+
+Datasets are partitioned by ticker and month (hive
+partitioning) with one row per tick / bar:
+
+    root/ticker=GOOG/month=201601/part-0.parquet
+
+- ticks: time, bid, ask columns
+- bars: time, open, high, low, close, volume, adj_close columns
+
+(see write_parquet_dataset to convert DataFrames)
+
+Months are months of times in their time zone (times of a
+tz-aware index are written with their time zone; naive
+start, end are localized to it).
+
+Ticker and date range filters are pushed down to the
+dataset scanner (partitions of other tickers and months
+are not read), only needed columns are read and record
+batches of each ticker are merged by time (see streaming)
+as they are read, so memory is bounded by batch size x
+number of tickers.
+
+Requires pyarrow (optional dependency)
+
+> price_handler = ParquetTickIterator("data/ticks", ["GOOG", "AMZN"],
+                                      start="2016-01-15", end="2016-02-01")
+> price_handler = ParquetBarIterator("data/bars", ["SP500TR"], fields=["close", "adj_close"])
+"""
+
+import decimal
+import os
+from collections import OrderedDict
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from .base import AbstractTickDataIterator, AbstractBarDataIterator
+from .streaming import ChunkCursor, HeapMergeCursor
+from ..data import PLACES, BarData
+from ..event import TickEvent, BarEvent
+from ..event_log import DEBUG
+
+
+TIME_COLUMN = "time"
+TICKER_PARTITION = "ticker"
+MONTH_PARTITION = "month"  # YYYYMM (int)
+COMMON_METADATA = "_common_metadata"  # schema of dataset
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required to read Parquet datasets (pip install pyarrow)")
+
+
+def _month(dt):
+    return dt.year * 100 + dt.month
+
+
+def write_parquet_dataset(frames, root):
+    """
+    Writes an (ordered) dict ticker=>DataFrame indexed by
+    time as a Parquet dataset partitioned by ticker and month
+
+    Column names are lowercased with spaces replaced by "_"
+    (e.g. Yahoo "Adj Close" => adj_close)
+
+    Schema (of the first file) is written to _common_metadata
+    """
+    _require_pyarrow()
+    schema = None
+    for ticker, df in frames.items():
+        df = df.rename(columns=lambda column: str(column).lower().replace(" ", "_"))
+        df = df.drop(columns=[TICKER_PARTITION], errors="ignore")
+        df.index = pd.DatetimeIndex(df.index, name=TIME_COLUMN)
+        for month, df_month in df.groupby(df.index.year * 100 + df.index.month, sort=True):
+            path = os.path.join(
+                root, "%s=%s" % (TICKER_PARTITION, ticker), "%s=%d" % (MONTH_PARTITION, month))
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            table = pa.Table.from_pandas(df_month.reset_index(), preserve_index=False)
+            pq.write_table(table, os.path.join(path, "part-0.parquet"))
+            if schema is None:
+                schema = table.schema
+    if schema is not None:
+        pq.write_metadata(schema, os.path.join(root, COMMON_METADATA))
+
+
+class ParquetSource(object):
+    """
+    Partitioned Parquet dataset read ticker by ticker
+
+    Only files of a ticker (ticker=... directory) and of
+    months of the start, end range are listed and scanned
+    when reading this ticker
+    """
+    def __init__(self, root, start=None, end=None, batch_size=65536):
+        _require_pyarrow()
+        self.root = os.path.expanduser(root)
+        self.start = None if start is None else pd.Timestamp(start)
+        self.end = None if end is None else pd.Timestamp(end)
+        self.batch_size = batch_size
+        self._time_types = {}  # ticker=>Arrow type of time column
+        self.partitioning = ds.partitioning(
+            pa.schema([(TICKER_PARTITION, pa.string()), (MONTH_PARTITION, pa.int32())]),
+            flavor="hive"
+        )
+
+    def tickers(self):
+        """
+        Returns tickers of dataset (from partition
+        directories, without reading data)
+        """
+        prefix = "%s=" % TICKER_PARTITION
+        return sorted(
+            name[len(prefix):] for name in os.listdir(self.root)
+            if name.startswith(prefix)
+        )
+
+    def _bounds(self, tz):
+        """
+        Returns start, end in time zone tz of time column
+        (naive start, end are localized to tz; tz-aware ones
+        are converted to UTC for a naive time column)
+        """
+        bounds = []
+        for dt in [self.start, self.end]:
+            if dt is not None:
+                if tz is not None:
+                    dt = dt.tz_localize(tz) if dt.tzinfo is None else dt.tz_convert(tz)
+                elif dt.tzinfo is not None:
+                    dt = dt.tz_convert("UTC").tz_localize(None)
+            bounds.append(dt)
+        return bounds
+
+    def _month_in_range(self, name, months):
+        """
+        Returns False if directory is a month partition
+        out of months (first, last) range
+        """
+        prefix = "%s=" % MONTH_PARTITION
+        if not name.startswith(prefix):
+            return True
+        month = int(name[len(prefix):])
+        first, last = months
+        if first is not None and month < first:
+            return False
+        if last is not None and month > last:
+            return False
+        return True
+
+    def _walk(self, ticker, months):
+        ticker_dir = os.path.join(self.root, "%s=%s" % (TICKER_PARTITION, ticker))
+        fnames = []
+        for dirpath, dirnames, names in os.walk(ticker_dir):
+            dirnames[:] = [name for name in dirnames if self._month_in_range(name, months)]
+            fnames.extend(os.path.join(dirpath, name) for name in names if name.endswith(".parquet"))
+        return sorted(fnames)
+
+    def time_type(self, ticker):
+        """
+        Returns Arrow type of time column of a ticker (None
+        if there is no file) read from _common_metadata or
+        else from the schema of a file of the ticker
+        """
+        try:
+            return self._time_types[ticker]
+        except KeyError:
+            pass
+        fname = os.path.join(self.root, COMMON_METADATA)
+        if os.path.exists(fname):
+            fnames = [fname]
+        else:
+            # months of start, end in any time zone are within
+            # one day of months of naive start, end
+            day = pd.Timedelta(days=1)
+            fnames = self._walk(ticker, (
+                None if self.start is None else _month(self.start - day),
+                None if self.end is None else _month(self.end + day)
+            ))
+        if len(fnames) == 0:
+            time_type = None
+        else:
+            time_type = pq.read_schema(fnames[0]).field(TIME_COLUMN).type
+        self._time_types[ticker] = time_type
+        return time_type
+
+    def files(self, ticker):
+        """
+        Returns Parquet files of a ticker (of months of
+        start, end range in time zone of time column)
+        """
+        time_type = self.time_type(ticker)
+        if time_type is None:
+            return []
+        start, end = self._bounds(time_type.tz)
+        return self._walk(ticker, (
+            None if start is None else _month(start),
+            None if end is None else _month(end)
+        ))
+
+    def _filter(self, time_type):
+        start, end = self._bounds(time_type.tz)
+        expression = None
+        if start is not None:
+            expression = ds.field(TIME_COLUMN) >= pa.scalar(start, type=time_type)
+        if end is not None:
+            end_expression = ds.field(TIME_COLUMN) <= pa.scalar(end, type=time_type)
+            expression = end_expression if expression is None else expression & end_expression
+        return expression
+
+    def chunks(self, ticker, columns):
+        """
+        Yields record batches of a ticker (in time order) as
+        DataFrames indexed by time
+        """
+        fnames = self.files(ticker)
+        if len(fnames) == 0:
+            return
+        dataset = ds.dataset(
+            fnames, format="parquet",
+            partitioning=self.partitioning, partition_base_dir=self.root
+        )
+        batches = dataset.to_batches(
+            columns=[TIME_COLUMN] + list(columns), filter=self._filter(self.time_type(ticker)),
+            batch_size=self.batch_size, use_threads=False
+        )
+        for batch in batches:
+            yield batch.to_pandas().set_index(TIME_COLUMN)
+
+
+class ParquetTickIterator(AbstractTickDataIterator):
+    """
+    ParquetTickIterator reads ticks (time, bid, ask) of a
+    partitioned Parquet dataset and iterates TickEvents
+    (same events as HistoricCSVTickIterator)
+    """
+    FIELDS = ["bid", "ask"]
+
+    def __init__(self, root, init_tickers=None, start=None, end=None, batch_size=65536):
+        """
+        root is the directory of the dataset
+        init_tickers (optional) defaults to every ticker
+        of the dataset
+        start, end (optional) select ticks of a time range
+        (inclusive)
+        batch_size is the number of rows of record batches
+        """
+        self.root = root
+        self.tickers = OrderedDict()
+        self.tickers_data = OrderedDict()  # not used (data are streamed)
+        self.init_tickers = init_tickers
+        self._source = ParquetSource(root, start, end, batch_size)
+        self._cursors = OrderedDict()  # ticker=>ChunkCursor
+
+    def on_init(self):
+        if self.init_tickers is None:
+            self.init_tickers = self._source.tickers()
+        for ticker in self.init_tickers:
+            self.subscribe_ticker(ticker)
+        self._stream = HeapMergeCursor(self._cursors, self.FIELDS)
+
+    def subscribe_ticker(self, ticker):
+        """
+        Subscribes the price handler to a new ticker symbol.
+        """
+        if ticker in self.tickers:
+            print(
+                "Could not subscribe ticker %s "
+                "as is already subscribed." % ticker
+            )
+            return
+        self.event_log.log(DEBUG, "open", ticker=ticker, root=self.root)
+        cursor = ChunkCursor(self._source.chunks(ticker, self.FIELDS), self.FIELDS)
+        if cursor.exhausted:
+            print(
+                "Could not subscribe ticker %s "
+                "as no data found for pricing." % ticker
+            )
+            return
+        self._cursors[ticker] = cursor
+        timestamp, (bid, ask) = cursor.row()
+        self.tickers[ticker] = {
+            "bid": decimal.Decimal(str(bid)),
+            "ask": decimal.Decimal(str(ask)),
+            "timestamp": timestamp
+        }
+
+    def get_best_bid_ask(self, ticker):
+        """
+        Returns the most recent bid/ask price for a ticker.
+        """
+        if ticker in self.tickers:
+            return self.tickers[ticker]["bid"], self.tickers[ticker]["ask"]
+        else:
+            print(
+                "Bid/ask values for ticker %s are not "
+                "available from the %s." % (ticker, self.__class__.__name__)
+            )
+            return None, None
+
+    def __next__(self):
+        """
+        Return the next TickEvent.
+        """
+        dt, ticker, (bid, ask) = next(self._stream)
+
+        decimal.getcontext().rounding = decimal.ROUND_HALF_DOWN
+        bid = decimal.Decimal(str(bid)).quantize(PLACES[5])
+        ask = decimal.Decimal(str(ask)).quantize(PLACES[5])
+
+        self.tickers[ticker]["bid"] = bid
+        self.tickers[ticker]["ask"] = ask
+        self.tickers[ticker]["timestamp"] = dt
+
+        return TickEvent.from_ticker(dt, ticker, bid, ask)
+
+
+class ParquetBarIterator(AbstractBarDataIterator):
+    """
+    ParquetBarIterator reads bars of a partitioned Parquet
+    dataset and iterates BarEvents (same events as
+    YahooDailyCSVBarIterator)
+
+    Only columns of fields are read (other fields of
+    BarData are None); close and adj_close are always read
+    (get_last_close, portfolio valuation).
+    """
+    FIELDS = ["open", "high", "low", "close", "volume", "adj_close"]
+
+    def __init__(self, root, init_tickers=None, start=None, end=None, fields=None,
+                 period=86400, batch_size=65536):
+        """
+        root is the directory of the dataset
+        init_tickers (optional) defaults to every ticker
+        of the dataset
+        start, end (optional) select bars of a time range
+        (inclusive)
+        fields (optional) are the bar fields needed by
+        strategies (default: every field)
+        period is the bar period in seconds
+        """
+        self.root = root
+        self.tickers = OrderedDict()
+        self.tickers_data = OrderedDict()  # not used (data are streamed)
+        self.init_tickers = init_tickers
+        self.period = period
+        if fields is None:
+            fields = self.FIELDS
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError("Unknown bar fields %s" % sorted(unknown))
+        self.fields = [field for field in self.FIELDS if field in fields or field in ("close", "adj_close")]
+        self._source = ParquetSource(root, start, end, batch_size)
+        self._cursors = OrderedDict()  # ticker=>ChunkCursor
+
+    def on_init(self):
+        if self.init_tickers is None:
+            self.init_tickers = self._source.tickers()
+        for ticker in self.init_tickers:
+            self.subscribe_ticker(ticker)
+        self._stream = HeapMergeCursor(self._cursors, self.fields)
+
+    def subscribe_ticker(self, ticker):
+        """
+        Subscribes the price handler to a new ticker symbol.
+        """
+        if ticker in self.tickers:
+            print(
+                "Could not subscribe ticker %s "
+                "as is already subscribed." % ticker
+            )
+            return
+        self.event_log.log(DEBUG, "open", ticker=ticker, root=self.root)
+        cursor = ChunkCursor(self._source.chunks(ticker, self.fields), self.fields)
+        if cursor.exhausted:
+            print(
+                "Could not subscribe ticker %s "
+                "as no data found for pricing." % ticker
+            )
+            return
+        self._cursors[ticker] = cursor
+        timestamp, values = cursor.row()
+        row = dict(zip(self.fields, values))
+        self.tickers[ticker] = {
+            "close": decimal.Decimal(str(row["close"])).quantize(PLACES[5]),
+            "adj_close": decimal.Decimal(str(row["adj_close"])).quantize(PLACES[5]),
+            "timestamp": timestamp
+        }
+
+    def get_last_close(self, ticker):
+        """
+        Returns the most recent actual (unadjusted) closing price.
+        """
+        if ticker in self.tickers:
+            return self.tickers[ticker]["close"]
+        else:
+            print(
+                "Close price for ticker %s is not "
+                "available from the %s." % (ticker, self.__class__.__name__)
+            )
+            return None
+
+    def __next__(self):
+        """
+        Returns next BarEvent.
+        """
+        dt, ticker, values = next(self._stream)
+
+        decimal.getcontext().rounding = decimal.ROUND_HALF_DOWN
+        bar = dict((field, None) for field in self.FIELDS)
+        for field, value in zip(self.fields, values):
+            if field == "volume":
+                bar[field] = int(value)
+            else:
+                bar[field] = decimal.Decimal(str(value)).quantize(PLACES[5])
+
+        self.tickers[ticker]["close"] = bar["close"]
+        self.tickers[ticker]["adj_close"] = bar["adj_close"]
+        self.tickers[ticker]["timestamp"] = dt
+
+        return BarEvent.from_ticker(dt, self.period, ticker, BarData(
+            bar["open"], bar["high"], bar["low"],
+            bar["close"], bar["volume"], bar["adj_close"]
+        ))
@@ -0,0 +1,284 @@
+#!/usr/bin/env/python
+
+"""
+Shared-memory market data
+
+Data are parsed once (by a parent process) and copied into
+a multiprocessing.shared_memory block. Worker processes
+attach to this block by name (through a small picklable
+descriptor) and get read-only NumPy views, so memory use
+doesn't grow with the number of workers and workers don't
+parse CSV files again.
+
+> shared = share_frames(load_yahoo_daily_csv(csv_dir, tickers),
+                        YahooDailyCSVBarIterator.FIELDS)
+> # in workers
+> price_handler = YahooDailyCSVBarIterator(None, tickers, store=shared.descriptor)
+> # in parent, when done
+> shared.unlink()
+
+Arrays are views holding the shared memory buffer: closing a
+block while some of its arrays are still referenced raises
+BufferError (instead of unmapping memory under them).
+Attachments are counted per process (attach / release) and
+are kept mapped until they are released (closing the owner
+block doesn't close attachments of the same process).
+
+Requires multiprocessing.shared_memory (Python 3.8+)
+
+For monthly tick files
+
+> shared = share_monthly_ticks(tickers, data_dir, 2014, 1)
+> tick_ticker_iterator = functools.partial(
+      SharedMonthlyTickerTickIterator, store=shared.descriptor)
+> BlockMergeTickIterator(tickers, data_dir, 2014, 1,
+                         tick_ticker_iterator=tick_ticker_iterator)
+"""
+
+import atexit
+import os
+from collections import OrderedDict
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from .binary_tick_cache import MonthlyBinaryTickerTickIterator, load_ticks
+from .columnar import ColumnarStore
+
+
+ALIGNMENT = 64
+
+_attached = {}  # shared memory name=>SharedArrays (attached in this process)
+
+
+def _require_shared_memory():
+    if shared_memory is None:
+        raise ImportError("multiprocessing.shared_memory (Python 3.8+) is required")
+
+
+class SharedArraysDescriptor(object):
+    """
+    Picklable description of a SharedArrays block
+    (name of shared memory, offset, shape and dtype of each
+    array and optional metadata)
+    """
+    def __init__(self, name, specs, meta=None):
+        self.name = name
+        self.specs = specs  # [(key, offset, shape, dtype), ...]
+        self.meta = meta
+
+    def __repr__(self):
+        return "<SharedArraysDescriptor %s %s>" % (self.name, [spec[0] for spec in self.specs])
+
+
+class SharedArrays(object):
+    """
+    Named NumPy arrays stored in one shared memory block
+    """
+    def __init__(self, shm, descriptor, owner):
+        self._shm = shm
+        self.descriptor = descriptor
+        self.owner = owner
+        self.refs = 0  # number of attach() not released (attachment)
+        self.closed = False
+        self.arrays = OrderedDict()
+        for key, offset, shape, dtype in descriptor.specs:
+            # frombuffer holds an export of the buffer as long as
+            # the array lives (memory can't be unmapped under it)
+            count = int(np.prod(shape))
+            array = np.frombuffer(shm.buf, dtype=dtype, count=count, offset=offset).reshape(shape)
+            if not owner:
+                array.setflags(write=False)
+            self.arrays[key] = array
+
+    @classmethod
+    def create(cls, arrays, meta=None):
+        """
+        Copies arrays (dict key=>ndarray) into a new
+        shared memory block
+        """
+        _require_shared_memory()
+        specs = []
+        size = 0
+        for key, array in arrays.items():
+            array = np.asarray(array)
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            specs.append((key, size, array.shape, array.dtype))
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(shm, SharedArraysDescriptor(shm.name, specs, meta), owner=True)
+        for key, array in arrays.items():
+            shared.arrays[key][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Attaches (read-only) to an existing block.
+        Attachments are cached and counted per process
+        (see release).
+        """
+        _require_shared_memory()
+        try:
+            shared = _attached[descriptor.name]
+        except KeyError:
+            shm = shared_memory.SharedMemory(name=descriptor.name)
+            shared = cls(shm, descriptor, owner=False)
+            _attached[descriptor.name] = shared
+        shared.refs += 1
+        return shared
+
+    def release(self):
+        """
+        Releases an attachment (closed when every attach()
+        of this process is released)
+        """
+        if self.owner:
+            raise ValueError("release() is for attachments (use close() or unlink())")
+        self.refs -= 1
+        if self.refs <= 0:
+            self.close()
+
+    def __getitem__(self, key):
+        if self.closed:
+            raise ValueError("Shared memory block %s is closed" % self.descriptor.name)
+        return self.arrays[key]
+
+    def keys(self):
+        return self.arrays.keys()
+
+    @property
+    def meta(self):
+        return self.descriptor.meta
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    def close(self):
+        """
+        Closes access to shared memory from this process
+
+        Raises BufferError if arrays of this block are still
+        referenced (memory is then kept mapped until they are
+        deleted)
+        """
+        if self.closed:
+            return
+        self.arrays = OrderedDict()
+        self.closed = True
+        if not self.owner and _attached.get(self.descriptor.name) is self:
+            del _attached[self.descriptor.name]
+        try:
+            self._shm.close()
+        except BufferError:
+            raise BufferError(
+                "Arrays of shared memory block %s are still referenced" % self.descriptor.name)
+
+    def unlink(self):
+        """
+        Closes and frees shared memory block (owner only)
+
+        Attachments (even of this process) keep their
+        mapping until they are released.
+        """
+        try:
+            self.close()
+        finally:
+            if self.owner:
+                self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.unlink()
+
+
+@atexit.register
+def _close_attached():
+    """
+    Closes attachments before interpreter shutdown (arrays
+    still referenced keep their memory mapped)
+    """
+    for shared in list(_attached.values()):
+        try:
+            shared.close()
+        except BufferError:
+            pass
+
+
+def share_store(store):
+    """
+    Copies a ColumnarStore into shared memory
+    """
+    arrays = OrderedDict()
+    arrays["timestamps"] = np.asarray(store.timestamps, dtype="datetime64[ns]").view(np.int64)
+    arrays["codes"] = store.codes
+    fields = list(store.columns.keys())
+    for field in fields:
+        arrays["column:%s" % field] = store.columns[field]
+    return SharedArrays.create(arrays, meta={"tickers": list(store.tickers), "fields": fields})
+
+
+def share_frames(frames, fields):
+    """
+    Builds a ColumnarStore from an (ordered) dict of DataFrames
+    (see load_yahoo_daily_csv) and copies it into shared memory
+    """
+    return share_store(ColumnarStore.from_frames(frames, fields))
+
+
+def attach_store(store):
+    """
+    Returns a ColumnarStore with read-only views on shared
+    memory for a SharedArraysDescriptor (a ColumnarStore or
+    a SharedArrays is returned as a ColumnarStore)
+    """
+    if isinstance(store, ColumnarStore):
+        return store
+    if isinstance(store, SharedArrays):
+        shared = store
+    else:
+        shared = SharedArrays.attach(store)
+    columns = dict(
+        (field, shared["column:%s" % field]) for field in shared.meta["fields"]
+    )
+    return ColumnarStore(
+        shared.meta["tickers"], shared["timestamps"].view("datetime64[ns]"),
+        shared["codes"], columns
+    )
+
+
+def share_monthly_ticks(tickers, data_dir, year, month, cache_dir=None):
+    """
+    Copies ticks (see binary_tick_cache.TICK_DTYPE) of
+    TICKER-YYYY-MM.csv files into shared memory
+    """
+    arrays = OrderedDict()
+    for ticker in tickers:
+        fname = os.path.join(
+            os.path.expanduser(data_dir),
+            "%s-%4d-%02d.csv" % (ticker, year, month)
+        )
+        arrays[ticker] = load_ticks(fname, cache_dir)
+    return SharedArrays.create(arrays, meta={"year": year, "month": month})
+
+
+class SharedMonthlyTickerTickIterator(MonthlyBinaryTickerTickIterator):
+    """
+    Yields ticks for ONE ticker for a given month
+    from shared memory (see share_monthly_ticks)
+    """
+    def __init__(self, ticker, data_dir, year, month, data_parser=None, store=None, event_log=None):
+        if store is None:
+            raise ValueError("store (SharedArraysDescriptor) is required")
+        if isinstance(store, SharedArrays):
+            shared = store
+        else:
+            shared = SharedArrays.attach(store)
+        super(SharedMonthlyTickerTickIterator, self).__init__(
+            ticker, data_dir, year, month, data_parser, ticks=shared[ticker], event_log=event_log)
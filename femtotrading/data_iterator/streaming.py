@@ -0,0 +1,152 @@
+#!/usr/bin/env/python
+
+"""
+Lazy k-way merge of per-ticker chunked data
+
+Data of each ticker is read as a sequence of time ordered
+DataFrame chunks (e.g. pd.read_csv(..., chunksize=n)) and
+rows of all tickers are merged with a heap holding the
+next timestamp of each ticker. Only the current chunk of
+each ticker is kept in memory (peak memory is bounded by
+chunk size x number of tickers).
+
+Rows are yielded as ColumnarCursor does: (timestamp,
+ticker, [values of fields]). Rows sharing the same timestamp
+keep the order in which tickers were given (as
+ColumnarStore).
+
+> chunks = OrderedDict((ticker, pd.read_csv(..., chunksize=100000)) for ticker in tickers)
+> cursor = HeapMergeCursor(chunks, ["Bid", "Ask"])
+> dt, ticker, (bid, ask) = next(cursor)
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+def frame_chunks(df, chunksize):
+    """
+    Yields chunks of chunksize rows of an already loaded
+    DataFrame
+    """
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+class ChunkCursor(object):
+    """
+    Walks rows of a sequence of DataFrame chunks (indexed
+    by timestamp) of ONE ticker
+    """
+    def __init__(self, chunks, fields):
+        self.chunks = iter(chunks)
+        self._source = chunks
+        self.fields = fields
+        self.exhausted = False
+        self._keys = []
+        self._j = 0
+        self._last_key = None
+        self._read_chunk()
+
+    def _read_chunk(self):
+        """
+        Reads next non-empty chunk. Returns False when
+        there is no more chunk.
+        """
+        while True:
+            try:
+                df = next(self.chunks)
+            except StopIteration:
+                self.close()
+                return False
+            if len(df) > 0:
+                break
+        keys = df.index.values.astype("datetime64[ns]").astype(np.int64)
+        if np.any(keys[1:] < keys[:-1]) or (self._last_key is not None and keys[0] < self._last_key):
+            raise ValueError("Rows must be ordered by time to be streamed")
+        self._last_key = keys[-1]
+        self._keys = keys.tolist()
+        self._timestamps = pd.DatetimeIndex(df.index).tolist()
+        self._values = [df[field].values.tolist() for field in self.fields]
+        self._j = 0
+        return True
+
+    @property
+    def key(self):
+        """
+        Timestamp (int64 epoch-ns) of current row
+        """
+        return self._keys[self._j]
+
+    def row(self):
+        """
+        Returns (timestamp, [values of fields]) of current row
+        """
+        j = self._j
+        return self._timestamps[j], [values[j] for values in self._values]
+
+    def advance(self):
+        """
+        Moves to next row. Returns False when there is no
+        more row.
+        """
+        self._j += 1
+        if self._j < len(self._keys):
+            return True
+        return self._read_chunk()
+
+    def close(self):
+        if not self.exhausted:
+            self.exhausted = True
+            self._keys = []
+            close = getattr(self._source, "close", None)
+            if close is not None:
+                close()
+
+
+class HeapMergeCursor(object):
+    """
+    Merges ChunkCursors of several tickers by time
+
+    chunks is an (ordered) dict ticker=>iterable of
+    DataFrame chunks or ticker=>ChunkCursor
+    """
+    def __init__(self, chunks, fields):
+        self.tickers = list(chunks.keys())
+        self.fields = fields
+        self.cursors = []
+        self._heap = []
+        for rank, ticker in enumerate(self.tickers):
+            cursor = chunks[ticker]
+            if not isinstance(cursor, ChunkCursor):
+                cursor = ChunkCursor(cursor, fields)
+            self.cursors.append(cursor)
+            if not cursor.exhausted:
+                self._heap.append((cursor.key, rank))
+        heapq.heapify(self._heap)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        heap = self._heap
+        if not heap:
+            raise StopIteration
+        _, rank = heap[0]
+        cursor = self.cursors[rank]
+        dt, values = cursor.row()
+        if cursor.advance():
+            heapq.heapreplace(heap, (cursor.key, rank))
+        else:
+            heapq.heappop(heap)
+        return dt, self.tickers[rank], values
+
+    def next(self):
+        return self.__next__()
+
+    def close(self):
+        for cursor in self.cursors:
+            cursor.close()
+        self._heap = []
@@ -7,8 +7,36 @@ from collections import OrderedDict
 import pandas as pd
 
 from .base import AbstractBarDataIterator
-from ..event import BarEvent
-from ..data import PLACES, TickerData
+from .columnar import ColumnarStore, ColumnarCursor
+from ..event import BarEvent, EventPool, PooledBarEvent
+from ..data import PLACES, Data, BarData
+
+
+def read_yahoo_daily_csv(csv_dir, ticker):
+    """
+    Reads CSV file of Yahoo Finance daily data of a ticker
+    into a pandas DataFrame
+    """
+    ticker_path = os.path.join(csv_dir, "%s.csv" % ticker)
+    print(ticker_path)
+    return pd.io.parsers.read_csv(
+        ticker_path, header=0, parse_dates=True,
+        index_col=0, names=(
+            "Date", "Open", "High", "Low",
+            "Close", "Volume", "Adj Close"
+        )
+    )
+
+
+def load_yahoo_daily_csv(csv_dir, tickers):
+    """
+    Reads CSV files of several tickers
+    Returns an OrderedDict ticker=>DataFrame which can be
+    passed as tickers_data to YahooDailyCSVBarIterator
+    """
+    return OrderedDict(
+        (ticker, read_yahoo_daily_csv(csv_dir, ticker)) for ticker in tickers
+    )
 
 
 class YahooDailyCSVBarIterator(AbstractBarDataIterator):
@@ -18,21 +46,60 @@ class YahooDailyCSVBarIterator(AbstractBarDataIterator):
     for each requested financial instrument and to iterate
     BarEvents.
     """
-    def __init__(self, csv_dir, init_tickers=None):
+    FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+    def __init__(
+        self, csv_dir, init_tickers=None, tickers_data=None, store=None,
+        group_by_time=False, reuse_events=False
+    ):
         """
         Takes the CSV directory and a possible
         list of initial ticker symbols then
+
+        tickers_data (optional) is a dict ticker=>DataFrame of
+        already loaded data (see load_yahoo_daily_csv) used
+        instead of reading CSV files, so several backtests
+        can share the same data
+
+        store (optional) is a ColumnarStore or a descriptor of a
+        store in shared memory (see shared_store.share_frames)
+        holding data of all tickers (csv_dir and init_tickers
+        are then not used)
+
+        group_by_time=True yields one BarEvent with bars of
+        all tickers sharing the same timestamp (instead of one
+        BarEvent per ticker)
+
+        reuse_events=True yields events of a small EventPool
+        updated in place (an event must be frozen to be kept
+        after dispatch, see EventPool)
         """
         self.csv_dir = csv_dir
         self.tickers = OrderedDict()
         self.tickers_data = OrderedDict()
         self.init_tickers = init_tickers
+        if tickers_data is None:
+            tickers_data = {}
+        self._preloaded_data = tickers_data
+        self._shared_store = store
+        self.group_by_time = group_by_time
+        if reuse_events and group_by_time:
+            raise ValueError("reuse_events can't be used with group_by_time")
+        self._pool = EventPool(PooledBarEvent) if reuse_events else None
 
     def on_init(self):
         """
         creates an (optional) list of ticker subscriptions and
         associated prices.
         """
+        if self._shared_store is not None:
+            # shared_memory requires Python 3.8+
+            from .shared_store import attach_store
+            self._store = attach_store(self._shared_store)
+            for ticker in self._store.tickers:
+                self._subscribe_ticker_from_store(ticker)
+            self._stream = ColumnarCursor(self._store, self.FIELDS)
+            return
         if self.init_tickers is not None:
             for ticker in self.init_tickers:
                 self.subscribe_ticker(ticker)
@@ -44,16 +111,10 @@ class YahooDailyCSVBarIterator(AbstractBarDataIterator):
         the specified CSV data directory, converting them into
         them into a pandas DataFrame, stored in a dictionary.
         """
-        ticker_path = os.path.join(self.csv_dir, "%s.csv" % ticker)
-        print(ticker_path)
-        self.tickers_data[ticker] = pd.io.parsers.read_csv(
-            ticker_path, header=0, parse_dates=True,
-            index_col=0, names=(
-                "Date", "Open", "High", "Low",
-                "Close", "Volume", "Adj Close"
-            )
-        )
-        self.tickers_data[ticker]["Ticker"] = ticker
+        if ticker in self._preloaded_data:
+            self.tickers_data[ticker] = self._preloaded_data[ticker]
+        else:
+            self.tickers_data[ticker] = read_yahoo_daily_csv(self.csv_dir, ticker)
 
     def _merge_sort_ticker_data(self):
         """
@@ -63,10 +124,12 @@ class YahooDailyCSVBarIterator(AbstractBarDataIterator):
 
         Note that this is an idealised situation, utilised solely for
         backtesting. In live trading ticks may arrive "out of order".
+
+        Data are merged into a ColumnarStore which is walked by
+        integer index (no DataFrame row boxing).
         """
-        return pd.concat(
-            self.tickers_data.values()
-        ).sort_index().iterrows()
+        self._store = ColumnarStore.from_frames(self.tickers_data, self.FIELDS)
+        return ColumnarCursor(self._store, self.FIELDS)
 
     def subscribe_ticker(self, ticker):
         """
@@ -94,6 +157,14 @@ class YahooDailyCSVBarIterator(AbstractBarDataIterator):
                 "as is already subscribed." % ticker
             )
 
+    def _subscribe_ticker_from_store(self, ticker):
+        i = self._store.first_index(ticker)
+        self.tickers[ticker] = {
+            "close": decimal.Decimal(str(self._store.columns["Close"][i])).quantize(PLACES[5]),
+            "adj_close": decimal.Decimal(str(self._store.columns["Adj Close"][i])).quantize(PLACES[5]),
+            "timestamp": pd.Timestamp(self._store.timestamps[i])
+        }
+
     def get_last_close(self, ticker):
         """
         Returns the most recent actual (unadjusted) closing price.
@@ -112,17 +183,42 @@ class YahooDailyCSVBarIterator(AbstractBarDataIterator):
         """
         Returns next BarEvent.
         """
-        dt, row = next(self._stream)
+        period = 86400  # Seconds in a day
+        if self._pool is not None:
+            dt, ticker, prices = self._next_prices()
+            return self._pool.acquire().set(dt, period, ticker, *prices)
+        dt, ticker, tickerdata = self._next_ticker_data()
+        if not self.group_by_time:
+            return BarEvent.from_ticker(dt, period, ticker, tickerdata)
+        data = Data([(ticker, tickerdata)])
+        while self._stream.next_has_same_time():
+            _, ticker, tickerdata = self._next_ticker_data()
+            data[ticker] = tickerdata
+        return BarEvent(dt, period, data)
 
-        # Obtain all elements of the bar from the dataframe
+    def _next_ticker_data(self):
+        """
+        Returns (timestamp, ticker, bar data) of next row
+        """
+        dt, ticker, prices = self._next_prices()
+        return dt, ticker, BarData(*prices)
+
+    def _next_prices(self):
+        """
+        Returns (timestamp, ticker, (open, high, low, close,
+        volume, adj_close)) of next row
+        """
+        dt, ticker, row = next(self._stream)
+        open_price, high_price, low_price, close_price, adj_close_price, volume = row
+
+        # Obtain all elements of the bar from the store
         decimal.getcontext().rounding = decimal.ROUND_HALF_DOWN
-        ticker = row["Ticker"]
-        open_price = decimal.Decimal(str(row["Open"])).quantize(PLACES[5])
-        high_price = decimal.Decimal(str(row["High"])).quantize(PLACES[5])
-        low_price = decimal.Decimal(str(row["Low"])).quantize(PLACES[5])
-        close_price = decimal.Decimal(str(row["Close"])).quantize(PLACES[5])
-        adj_close_price = decimal.Decimal(str(row["Adj Close"])).quantize(PLACES[5])
-        volume = int(row["Volume"])
+        open_price = decimal.Decimal(str(open_price)).quantize(PLACES[5])
+        high_price = decimal.Decimal(str(high_price)).quantize(PLACES[5])
+        low_price = decimal.Decimal(str(low_price)).quantize(PLACES[5])
+        close_price = decimal.Decimal(str(close_price)).quantize(PLACES[5])
+        adj_close_price = decimal.Decimal(str(adj_close_price)).quantize(PLACES[5])
+        volume = int(volume)
 
         # Create decimalised prices for
         # closing price and adjusted closing price
@@ -130,12 +226,5 @@ class YahooDailyCSVBarIterator(AbstractBarDataIterator):
         self.tickers[ticker]["adj_close"] = adj_close_price
         self.tickers[ticker]["timestamp"] = dt
 
-        # Create the tick event for the queue
-        period = 86400  # Seconds in a day
-        tickerdata = TickerData([("open", open_price),
-                                 ("high", high_price),
-                                 ("low", low_price),
-                                 ("close", close_price),
-                                 ("volume", volume),
-                                 ("adj_close", adj_close_price)])
-        return BarEvent.from_ticker(dt, period, ticker, tickerdata)
+        return dt, ticker, (open_price, high_price, low_price,
+                            close_price, volume, adj_close_price)
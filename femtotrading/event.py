@@ -1,22 +1,74 @@
 #!/usr/bin/env/python
 
+from collections import deque
+
 from .compat import queue
-from .data import Data, TickerData
+from .data import Data, TickerData, TickData, BarData, SingleTickerData
 
 
 class EventsQueue(object):
-    def __init__(self, block=False):
+    """
+    Queue of events (Signal, Order, Fill...)
+
+    threadsafe=True uses queue.Queue (lock + condition
+    variable) which is required when events are enqueued
+    from several threads (live / paper trading).
+
+    threadsafe=False uses collections.deque which is
+    enough (and much cheaper) for single-threaded backtests.
+    Backtest switches queue to this mode automatically.
+    """
+    def __init__(self, block=False, threadsafe=True):
         self._block = block
-        self._q = queue.Queue()
+        self._q = None
+        self.set_threadsafe(threadsafe)
+
+    def set_threadsafe(self, threadsafe):
+        """
+        Switches queue backend (pending events are kept)
+        """
+        pending = [] if self._q is None else list(self.drain())
+        self.threadsafe = threadsafe
+        if threadsafe:
+            self._q = queue.Queue()
+        else:
+            self._q = deque()
+        for event in pending:
+            self.enqueue(event)
 
     def enqueue(self, event):
-        return self._q.put(event, block=self._block)
+        if self.threadsafe:
+            return self._q.put(event, block=self._block)
+        self._q.append(event)
 
     def dequeue(self):
-        return self._q.get(block=self._block)
+        if self.threadsafe:
+            return self._q.get(block=self._block)
+        try:
+            return self._q.popleft()
+        except IndexError:
+            raise queue.Empty
+
+    def drain(self):
+        """
+        Yields events until queue is empty (events enqueued
+        while draining are also yielded)
+        """
+        if self.threadsafe:
+            while True:
+                try:
+                    yield self._q.get(block=False)
+                except queue.Empty:
+                    return
+        else:
+            q = self._q
+            while q:
+                yield q.popleft()
 
     def __len__(self):
-        return self._q.qsize()
+        if self.threadsafe:
+            return self._q.qsize()
+        return len(self._q)
 
 
 class AbstractEvent(object):
@@ -24,17 +76,35 @@ class AbstractEvent(object):
     AbstractEvent is base class providing an interface for all subsequent
     (inherited) events, that will trigger further events in the
     trading infrastructure.
+
+    Events are created for every tick / bar so they use
+    __slots__ (no per-instance __dict__).
     """
+    __slots__ = ()
+
     @property
     def typename(self):
         return self.__class__.__name__
 
+    def freeze(self):
+        """
+        Returns an event which can be kept after dispatch
+        (events reused by data iterators are copied, see
+        EventPool)
+        """
+        return self
+
 
 class AbstractTimedEvent(AbstractEvent):
     """
     AbstractTimedEvent is base class providing an interface for all subsequent
     (inherited) timed events
+
+    data_event is a mapping ticker=>ticker data (Data or
+    SingleTickerData for events of one ticker)
     """
+    __slots__ = ("time", "data_event")
+
     def __init__(self, time, data_event):
         """
         Initialises the TimedEvent.
@@ -49,7 +119,14 @@ class AbstractTimedEvent(AbstractEvent):
         return str(self)
 
     def have(self, ticker):
-        return ticker in self.data_event.keys()
+        return ticker in self.data_event
+
+    @property
+    def tickers(self):
+        """
+        Tickers with data in this event
+        """
+        return self.data_event.keys()
 
     def __getitem__(self, ticker):
         return self.data_event[ticker]
@@ -61,12 +138,14 @@ class TickEvent(AbstractTimedEvent):
     which is defined as a ticker symbol and associated best
     bid and ask from the top of the order book.
     """
+    __slots__ = ()
+
     def __str__(self):
         return "Time: %s, %s %s" % (self.time, self.typename, self.data_event)
 
     @classmethod
     def from_ticker(cls, dt, ticker, bid, ask):
-        return TickEvent(dt, Data({ticker: TickerData({"bid": bid, "ask": ask})}))
+        return cls(dt, SingleTickerData(ticker, TickData(bid, ask)))
 
 
 class BarEvent(AbstractTimedEvent):
@@ -75,6 +154,8 @@ class BarEvent(AbstractTimedEvent):
     open-high-low-close-volume bar, as would be generated
     via common data providers such as Yahoo Finance.
     """
+    __slots__ = ("period", )
+
     def __init__(self, time, period, data_event):
         """
         Initialises the BarEvent.
@@ -85,7 +166,7 @@ class BarEvent(AbstractTimedEvent):
 
     @classmethod
     def from_ticker(cls, dt, period, ticker, ticker_data):
-        return BarEvent(dt, period, Data({ticker: ticker_data}))
+        return cls(dt, period, SingleTickerData(ticker, ticker_data))
 
     def __str__(self):
         return "Time: %s, %s %s, %s" % (self.time, self.typename, self.period, self.data_event)
@@ -109,6 +190,8 @@ class SignalEvent(AbstractEvent):
     Handles the event of sending a Signal from a Strategy object.
     This is received by a Portfolio object and acted upon.
     """
+    __slots__ = ("ticker", "action")
+
     def __init__(self, ticker, action):
         """
         Initialises the SignalEvent.
@@ -136,6 +219,8 @@ class OrderEvent(AbstractEvent):
     The order contains a ticker (e.g. GOOG), action (BOT or SLD)
     and quantity.
     """
+    __slots__ = ("ticker", "action", "quantity")
+
     def __init__(self, ticker, action, quantity):
         """
         Initialises the OrderEvent.
@@ -171,6 +256,8 @@ class FillEvent(AbstractEvent):
     different prices. This will be simulated by averaging
     the cost.
     """
+    __slots__ = ("timestamp", "ticker", "action", "quantity", "exchange", "price", "commission")
+
     def __init__(
         self, timestamp, ticker,
         action, quantity,
@@ -207,3 +294,89 @@ class FillEvent(AbstractEvent):
 
     def __repr__(self):
         return str(self)
+
+
+class PooledTickEvent(TickEvent):
+    """
+    TickEvent of ONE ticker updated in place by a data iterator
+    (see EventPool). freeze() returns a TickEvent copy.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        super(PooledTickEvent, self).__init__(None, SingleTickerData(None, TickData(None, None)))
+
+    def set(self, dt, ticker, bid, ask):
+        self.time = dt
+        data_event = self.data_event
+        data_event.ticker = ticker
+        ticker_data = data_event.ticker_data
+        ticker_data.bid = bid
+        ticker_data.ask = ask
+        return self
+
+    def freeze(self):
+        ticker_data = self.data_event.ticker_data
+        return TickEvent.from_ticker(self.time, self.data_event.ticker, ticker_data.bid, ticker_data.ask)
+
+
+class PooledBarEvent(BarEvent):
+    """
+    BarEvent of ONE ticker updated in place by a data iterator
+    (see EventPool). freeze() returns a BarEvent copy.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        super(PooledBarEvent, self).__init__(
+            None, None, SingleTickerData(None, BarData(None, None, None, None, None, None)))
+
+    def set(self, dt, period, ticker, open, high, low, close, volume, adj_close):
+        self.time = dt
+        self.period = period
+        data_event = self.data_event
+        data_event.ticker = ticker
+        ticker_data = data_event.ticker_data
+        ticker_data.open = open
+        ticker_data.high = high
+        ticker_data.low = low
+        ticker_data.close = close
+        ticker_data.volume = volume
+        ticker_data.adj_close = adj_close
+        return self
+
+    def freeze(self):
+        return BarEvent.from_ticker(
+            self.time, self.period, self.data_event.ticker,
+            BarData(*self.data_event.ticker_data.values()))
+
+
+class EventPool(object):
+    """
+    Ring of size preallocated events reused by a data iterator
+    (reuse_events=True) instead of creating an event (and its
+    ticker data) for each tick / bar.
+
+    An event is only valid until size more events are yielded:
+    components which need to keep an event (or its ticker data)
+    after dispatch must keep event.freeze()
+
+    > pool = EventPool(PooledTickEvent)
+    > event = pool.acquire().set(dt, ticker, bid, ask)
+    """
+    def __init__(self, event_class, size=2):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._events = [event_class() for _ in range(size)]
+        self._i = 0
+
+    def acquire(self):
+        """
+        Returns next event of the ring (to be set)
+        """
+        event = self._events[self._i]
+        self._i = (self._i + 1) % len(self._events)
+        return event
+
+    def __len__(self):
+        return len(self._events)
@@ -0,0 +1,222 @@
+#!/usr/bin/env/python
+
+"""
+Structured, leveled log of trading events
+
+A record is a level, a kind (e.g. "SignalEvent", "open")
+and fields (a dict). Records are only built when the level
+is enabled (callers check enabled(level) before formatting
+anything) and are formatted by sinks:
+
+- StreamSink writes one line per record (stdout by default)
+- FileSink buffers records and writes them as JSON lines
+- AsyncFileSink formats and writes buffers from a thread
+
+> event_log = EventLog(INFO, FileSink("out/events.jsonl"))
+> if event_log.enabled(INFO):
+>     event_log.log(INFO, "cross", ticker=ticker, action="BOT")
+> event_log.log_event(INFO, fill_event)  # every field of event
+> event_log.close()
+
+DISABLED (level OFF) is the log used by default (Backtest
+then doesn't call any logging handler).
+"""
+
+from __future__ import print_function
+
+import json
+import sys
+import threading
+
+from .compat import queue
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", OFF: "OFF"}
+
+
+def event_fields(event):
+    """
+    Returns fields of an event (__slots__ of its classes)
+    """
+    fields = []
+    for cls in reversed(type(event).__mro__):
+        fields.extend(getattr(cls, "__slots__", ()))
+    return [(field, getattr(event, field)) for field in fields]
+
+
+def format_line(record):
+    level, kind, fields = record
+    return "%-7s %s %s" % (
+        LEVEL_NAMES.get(level, level), kind,
+        " ".join("%s=%s" % (key, value) for key, value in fields)
+    )
+
+
+def format_json(record):
+    level, kind, fields = record
+    d = {"level": LEVEL_NAMES.get(level, level), "kind": kind}
+    d.update(fields)
+    return json.dumps(d, default=str)
+
+
+class StreamSink(object):
+    """
+    Writes each record as a line to a stream
+    """
+    def __init__(self, stream=None, formatter=format_line):
+        self.stream = stream
+        self.formatter = formatter
+
+    def write(self, record):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(self.formatter(record) + "\n")
+
+    def flush(self):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.flush()
+
+    def close(self):
+        self.flush()
+
+
+class FileSink(object):
+    """
+    Keeps records in a buffer which is formatted and written
+    to a file (JSON lines) when full, on flush or on close
+    """
+    def __init__(self, filename, buffer_size=4096, formatter=format_json, mode="w"):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.formatter = formatter
+        self._fd = open(filename, mode)
+        self._buffer = []
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def _write_records(self, records):
+        formatter = self.formatter
+        self._fd.write("".join(formatter(record) + "\n" for record in records))
+
+    def flush(self):
+        if self._buffer:
+            records, self._buffer = self._buffer, []
+            self._write_records(records)
+        self._fd.flush()
+
+    def close(self):
+        if self._fd is not None:
+            self.flush()
+            self._fd.close()
+            self._fd = None
+
+
+class AsyncFileSink(FileSink):
+    """
+    FileSink which formats and writes full buffers from a
+    writer thread (the trading loop only appends records)
+    """
+    def __init__(self, filename, buffer_size=4096, formatter=format_json, mode="w"):
+        super(AsyncFileSink, self).__init__(filename, buffer_size, formatter, mode)
+        self._q = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="AsyncFileSink")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            records = self._q.get()
+            if records is None:
+                self._q.task_done()
+                return
+            self._write_records(records)
+            self._q.task_done()
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            records, self._buffer = self._buffer, []
+            self._q.put(records)
+
+    def flush(self):
+        if self._buffer:
+            records, self._buffer = self._buffer, []
+            self._q.put(records)
+        self._q.join()
+        self._fd.flush()
+
+    def close(self):
+        if self._fd is not None:
+            self.flush()
+            self._q.put(None)
+            self._thread.join()
+            self._fd.close()
+            self._fd = None
+
+
+class EventLog(object):
+    """
+    Leveled log writing records to a sink
+    """
+    def __init__(self, level=INFO, sink=None):
+        self.level = level
+        if sink is None:
+            sink = StreamSink()
+        self.sink = sink
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, kind, **fields):
+        """
+        Writes a record (if level is enabled)
+        """
+        if level >= self.level:
+            self.sink.write((level, kind, sorted(fields.items())))
+
+    def log_event(self, level, event):
+        """
+        Writes a record with every field of an event
+        (if level is enabled)
+        """
+        if level >= self.level:
+            self.sink.write((level, event.typename, event_fields(event)))
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        self.sink.close()
+
+
+class DisabledEventLog(EventLog):
+    """
+    Log with every level disabled (nothing is built nor written)
+    """
+    def __init__(self):
+        super(DisabledEventLog, self).__init__(OFF, sink=None)
+
+    def enabled(self, level):
+        return False
+
+    def log(self, level, kind, **fields):
+        pass
+
+    def log_event(self, level, event):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+DISABLED = DisabledEventLog()
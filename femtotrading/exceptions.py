@@ -3,3 +3,7 @@
 
 class EmptyQuantityError(Exception):
     pass
+
+
+class CrossCheckError(Exception):
+    pass
@@ -0,0 +1,10 @@
+#!/usr/bin/env/python
+# flake8: noqa
+
+from .base import AbstractIndicator
+from .moving_average import SMA, EMA
+from .rolling import RollingStd, RollingMin, RollingMax
+from .oscillators import RSI
+from .volatility import ATR
+from .volume import VWAP
+from .registry import Indicators
@@ -0,0 +1,42 @@
+#!/usr/bin/env/python
+
+from abc import ABCMeta, abstractmethod
+
+
+class AbstractIndicator(object):
+    """
+    AbstractIndicator is an abstract base class providing an
+    interface for all streaming indicators.
+
+    An indicator is updated with one new value at a time
+    (update is O(1)) and its current value is available with
+    the value property (None until enough values were given).
+
+    Indicators are generic over number types: Decimal prices
+    give Decimal values when the computation allows it (SMA,
+    EMA, min/max, VWAP).
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self):
+        self.reset()
+
+    @abstractmethod
+    def reset(self):
+        raise NotImplementedError("Should implement reset()")
+
+    @abstractmethod
+    def update(self, *args):
+        """
+        Updates indicator with a new value and returns
+        current value of indicator
+        """
+        raise NotImplementedError("Should implement update()")
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.value)
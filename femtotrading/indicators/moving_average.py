@@ -0,0 +1,71 @@
+#!/usr/bin/env/python
+
+from collections import deque
+from decimal import Decimal
+
+from .base import AbstractIndicator
+
+
+class SMA(AbstractIndicator):
+    """
+    Simple moving average over window values
+    (running sum)
+
+    For float values sum is recomputed from the window
+    every window updates so that rounding errors don't
+    accumulate (Decimal sums are exact).
+    """
+    def __init__(self, window):
+        self.window = window
+        super(SMA, self).__init__()
+
+    def reset(self):
+        self._values = deque(maxlen=self.window)
+        self._sum = 0
+        self._count = 0
+        self.value = None
+
+    def update(self, value):
+        values = self._values
+        if len(values) == self.window:
+            self._sum += value - values[0]
+        else:
+            self._sum += value
+        values.append(value)
+        self._count += 1
+        if self._count == self.window and not isinstance(value, Decimal):
+            self._count = 0
+            self._sum = sum(values)
+        if len(values) == self.window:
+            self.value = self._sum / self.window
+        return self.value
+
+
+class EMA(AbstractIndicator):
+    """
+    Exponential moving average
+    (alpha = 2 / (window + 1), seeded with SMA of
+    window first values)
+    """
+    def __init__(self, window):
+        self.window = window
+        super(EMA, self).__init__()
+
+    def reset(self):
+        self._alpha = None
+        self._seed = SMA(self.window)
+        self.value = None
+
+    def update(self, value):
+        if self.value is None:
+            self.value = self._seed.update(value)
+            if self.value is not None:
+                self._seed = None
+        else:
+            if self._alpha is None:
+                if isinstance(value, Decimal):
+                    self._alpha = Decimal(2) / Decimal(self.window + 1)
+                else:
+                    self._alpha = 2.0 / (self.window + 1)
+            self.value += self._alpha * (value - self.value)
+        return self.value
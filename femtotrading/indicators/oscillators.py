@@ -0,0 +1,46 @@
+#!/usr/bin/env/python
+
+from .base import AbstractIndicator
+
+
+class RSI(AbstractIndicator):
+    """
+    Relative Strength Index (Wilder smoothing)
+    over window price changes (float, 0-100)
+    """
+    def __init__(self, window=14):
+        self.window = window
+        super(RSI, self).__init__()
+
+    def reset(self):
+        self._previous = None
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self.value = None
+
+    def update(self, value):
+        value = float(value)
+        previous, self._previous = self._previous, value
+        if previous is None:
+            return self.value
+        change = value - previous
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        n = self.window
+        if self._count < n:
+            # average of first window changes
+            self._count += 1
+            self._avg_gain += gain / n
+            self._avg_loss += loss / n
+            if self._count < n:
+                return self.value
+        else:
+            self._avg_gain = (self._avg_gain * (n - 1) + gain) / n
+            self._avg_loss = (self._avg_loss * (n - 1) + loss) / n
+        if self._avg_loss == 0:
+            self.value = 100.0
+        else:
+            rs = self._avg_gain / self._avg_loss
+            self.value = 100.0 - 100.0 / (1.0 + rs)
+        return self.value
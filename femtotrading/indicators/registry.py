@@ -0,0 +1,77 @@
+#!/usr/bin/env/python
+
+from collections import OrderedDict
+
+from ..data import TickerData
+
+
+class Indicators(object):
+    """
+    Per-ticker registry of streaming indicators
+
+    Indicators are declared once (name, factory, inputs) and
+    instantiated for each ticker. update(event) feeds every
+    indicator of each ticker of a TickEvent / BarEvent so
+    that strategies only read values in on_bar / on_tick.
+
+    inputs is a field name of ticker data (or a tuple of
+    field names for indicators with several inputs, or a
+    function of ticker data)
+
+    > self.indicators = Indicators(self.tickers)
+    > self.indicators.register("short_sma", lambda: SMA(100), "adj_close")
+    > self.indicators.register("atr", lambda: ATR(14), ("high", "low", "close"))
+    > # in on_bar
+    > self.indicators.update(event)
+    > self.indicators[ticker].short_sma.value
+    """
+    def __init__(self, tickers):
+        self.tickers = list(tickers)
+        self._definitions = OrderedDict()  # name=>(factory, inputs)
+        self._indicators = OrderedDict((ticker, TickerData()) for ticker in self.tickers)
+
+    def register(self, name, factory, inputs="close"):
+        """
+        Declares an indicator (factory is called once per
+        ticker) and returns indicators dict ticker=>indicator
+        """
+        if name in self._definitions:
+            raise KeyError("Indicator '%s' is already registered" % name)
+        if not callable(inputs) and not isinstance(inputs, tuple):
+            inputs = (inputs, )
+        self._definitions[name] = (factory, inputs)
+        for ticker in self.tickers:
+            self._indicators[ticker][name] = factory()
+        return OrderedDict(
+            (ticker, self._indicators[ticker][name]) for ticker in self.tickers
+        )
+
+    def update(self, event):
+        """
+        Updates indicators of every ticker of event
+        """
+        for ticker in event.tickers:
+            try:
+                indicators = self._indicators[ticker]
+            except KeyError:
+                continue
+            data = event[ticker]
+            for name, (factory, inputs) in self._definitions.items():
+                if callable(inputs):
+                    indicators[name].update(inputs(data))
+                else:
+                    indicators[name].update(*[data[field] for field in inputs])
+
+    def reset(self):
+        for indicators in self._indicators.values():
+            for indicator in indicators.values():
+                indicator.reset()
+
+    def __getitem__(self, ticker):
+        return self._indicators[ticker]
+
+    def __contains__(self, ticker):
+        return ticker in self._indicators
+
+    def __repr__(self):
+        return "<Indicators %s %s>" % (self.tickers, list(self._definitions.keys()))
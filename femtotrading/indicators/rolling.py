@@ -0,0 +1,94 @@
+#!/usr/bin/env/python
+
+import math
+from collections import deque
+
+from .base import AbstractIndicator
+
+
+class RollingStd(AbstractIndicator):
+    """
+    Rolling standard deviation over window values
+    (float, ddof=1 as pandas by default)
+
+    Running sums of values shifted by the first value
+    (numerically stable for prices), recomputed from the
+    window every window updates.
+    """
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        super(RollingStd, self).__init__()
+
+    def reset(self):
+        self._values = deque(maxlen=self.window)
+        self._shift = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._count = 0
+        self.value = None
+
+    def update(self, value):
+        value = float(value)
+        if self._shift is None:
+            self._shift = value
+        x = value - self._shift
+        values = self._values
+        if len(values) == self.window:
+            old = values[0]
+            self._sum += x - old
+            self._sum_sq += x * x - old * old
+        else:
+            self._sum += x
+            self._sum_sq += x * x
+        values.append(x)
+        self._count += 1
+        if self._count == self.window:
+            self._count = 0
+            self._sum = sum(values)
+            self._sum_sq = sum(v * v for v in values)
+        n = len(values)
+        if n == self.window and n > self.ddof:
+            variance = (self._sum_sq - self._sum * self._sum / n) / (n - self.ddof)
+            self.value = math.sqrt(max(variance, 0.0))
+        return self.value
+
+
+class _RollingExtremum(AbstractIndicator):
+    """
+    Rolling min / max over window values with a monotonic
+    deque (amortized O(1) update)
+    """
+    def __init__(self, window):
+        self.window = window
+        super(_RollingExtremum, self).__init__()
+
+    def reset(self):
+        self._candidates = deque()  # (index, value)
+        self._i = 0
+        self.value = None
+
+    def _dominates(self, value, other):
+        raise NotImplementedError("Should implement _dominates()")
+
+    def update(self, value):
+        candidates = self._candidates
+        while candidates and self._dominates(value, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((self._i, value))
+        if candidates[0][0] <= self._i - self.window:
+            candidates.popleft()
+        self._i += 1
+        if self._i >= self.window:
+            self.value = candidates[0][1]
+        return self.value
+
+
+class RollingMin(_RollingExtremum):
+    def _dominates(self, value, other):
+        return value <= other
+
+
+class RollingMax(_RollingExtremum):
+    def _dominates(self, value, other):
+        return value >= other
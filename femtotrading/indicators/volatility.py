@@ -0,0 +1,36 @@
+#!/usr/bin/env/python
+
+from .base import AbstractIndicator
+
+
+class ATR(AbstractIndicator):
+    """
+    Average True Range (Wilder smoothing) over window bars
+
+    > atr.update(high, low, close)
+    """
+    def __init__(self, window=14):
+        self.window = window
+        super(ATR, self).__init__()
+
+    def reset(self):
+        self._previous_close = None
+        self._count = 0
+        self._sum = 0
+        self.value = None
+
+    def update(self, high, low, close):
+        previous_close, self._previous_close = self._previous_close, close
+        if previous_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        n = self.window
+        if self._count < n:
+            self._count += 1
+            self._sum += true_range
+            if self._count == n:
+                self.value = self._sum / n
+        else:
+            self.value = (self.value * (n - 1) + true_range) / n
+        return self.value
@@ -0,0 +1,42 @@
+#!/usr/bin/env/python
+
+from collections import deque
+
+from .base import AbstractIndicator
+
+
+class VWAP(AbstractIndicator):
+    """
+    Volume Weighted Average Price
+
+    window=None gives cumulative VWAP (since last reset,
+    e.g. session start), otherwise VWAP of last window values
+
+    > vwap.update(price, volume)
+    """
+    def __init__(self, window=None):
+        self.window = window
+        super(VWAP, self).__init__()
+
+    def reset(self):
+        if self.window is None:
+            self._values = None
+        else:
+            self._values = deque()
+        self._sum_pv = 0
+        self._sum_v = 0
+        self.value = None
+
+    def update(self, price, volume):
+        pv = price * volume
+        self._sum_pv += pv
+        self._sum_v += volume
+        if self._values is not None:
+            self._values.append((pv, volume))
+            if len(self._values) > self.window:
+                old_pv, old_volume = self._values.popleft()
+                self._sum_pv -= old_pv
+                self._sum_v -= old_volume
+        if self._sum_v != 0:
+            self.value = self._sum_pv / self._sum_v
+        return self.value
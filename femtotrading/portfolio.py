@@ -1,21 +1,24 @@
 #!/usr/bin/env python
 
-from decimal import Decimal
-
-from .position import Position
+from .accounting import get_accounting
 
 
 class Portfolio(object):
-    def __init__(self, price_handler, cash):
+    def __init__(self, price_handler, cash, accounting=None):
         """
         On creation, the Portfolio object contains no
         positions and all values are "reset" to the initial
         cash, with no PnL - realised or unrealised.
+
+        accounting is "decimal" (default) or "float"
+        (see accounting.py)
         """
         self.price_handler = price_handler
-        self.init_cash = cash
-        self.cur_cash = cash
+        self.accounting = get_accounting(accounting)
+        self.init_cash = self.accounting.amount(cash)
+        self.cur_cash = self.init_cash
         self.positions = {}
+        self._valuations = {}  # ticker=>contributions of a position to portfolio values
         self._reset_values()
 
     def _reset_values(self):
@@ -30,8 +33,31 @@ class Portfolio(object):
         """
         self.cur_cash = self.init_cash
         self.equity = self.cur_cash
-        self.unrealised_pnl = Decimal('0.00')
-        self.realised_pnl = Decimal('0.00')
+        self.unrealised_pnl = self.accounting.zero
+        self.realised_pnl = self.accounting.zero
+
+    def _get_bid_ask(self, ticker):
+        """
+        Returns last bid/ask (or close for bars) of a ticker
+        """
+        if self.price_handler.is_tick():
+            return self.price_handler.get_best_bid_ask(ticker)
+        else:
+            close_price = self.price_handler.get_last_close(ticker)
+            return close_price, close_price
+
+    def _valuation(self, pt):
+        """
+        Returns contributions of a Position to unrealised PnL,
+        realised PnL, cash and equity of the Portfolio
+        """
+        pnl_diff = pt.realised_pnl - pt.unrealised_pnl
+        return (
+            pt.unrealised_pnl,
+            pt.realised_pnl,
+            pnl_diff - pt.cost_basis,
+            pt.market_value - pt.cost_basis + pnl_diff
+        )
 
     def _update_portfolio(self):
         """
@@ -43,21 +69,40 @@ class Portfolio(object):
         """
         for ticker in self.positions:
             pt = self.positions[ticker]
-            if self.price_handler.is_tick():
-                bid, ask = self.price_handler.get_best_bid_ask(ticker)
-            else:
-                close_price = self.price_handler.get_last_close(ticker)
-                bid = close_price
-                ask = close_price
+            bid, ask = self._get_bid_ask(ticker)
             pt.update_market_value(bid, ask)
-            self.unrealised_pnl += pt.unrealised_pnl
-            self.realised_pnl += pt.realised_pnl
-            self.cur_cash -= pt.cost_basis
-            pnl_diff = pt.realised_pnl - pt.unrealised_pnl
-            self.cur_cash += pnl_diff
-            self.equity += (
-                pt.market_value - pt.cost_basis + pnl_diff
-            )
+            valuation = self._valuation(pt)
+            self._valuations[ticker] = valuation
+            unrealised_pnl, realised_pnl, cash, equity = valuation
+            self.unrealised_pnl += unrealised_pnl
+            self.realised_pnl += realised_pnl
+            self.cur_cash += cash
+            self.equity += equity
+
+    def update_market_value(self, tickers):
+        """
+        Revalues only positions of the given tickers (i.e.
+        tickers of a market event) and updates Portfolio
+        total values with the differences of their
+        contributions.
+
+        Cost is O(len(tickers)) instead of O(positions)
+        for _reset_values + _update_portfolio.
+        """
+        for ticker in tickers:
+            pt = self.positions.get(ticker)
+            if pt is None:
+                continue
+            bid, ask = self._get_bid_ask(ticker)
+            pt.update_market_value(bid, ask)
+            old_unrealised_pnl, old_realised_pnl, old_cash, old_equity = self._valuations[ticker]
+            valuation = self._valuation(pt)
+            self._valuations[ticker] = valuation
+            unrealised_pnl, realised_pnl, cash, equity = valuation
+            self.unrealised_pnl += unrealised_pnl - old_unrealised_pnl
+            self.realised_pnl += realised_pnl - old_realised_pnl
+            self.cur_cash += cash - old_cash
+            self.equity += equity - old_equity
 
     def _add_position(
         self, action, ticker,
@@ -74,13 +119,8 @@ class Portfolio(object):
         """
         self._reset_values()
         if ticker not in self.positions:
-            if self.price_handler.is_tick():
-                bid, ask = self.price_handler.get_best_bid_ask(ticker)
-            else:
-                close_price = self.price_handler.get_last_close(ticker)
-                bid = close_price
-                ask = close_price
-            position = Position(
+            bid, ask = self._get_bid_ask(ticker)
+            position = self.accounting.position_class(
                 action, ticker, quantity,
                 price, commission, bid, ask
             )
@@ -110,12 +150,7 @@ class Portfolio(object):
             self.positions[ticker].transact_shares(
                 action, quantity, price, commission
             )
-            if self.price_handler.is_tick():
-                bid, ask = self.price_handler.get_best_bid_ask(ticker)
-            else:
-                close_price = self.price_handler.get_last_close(ticker)
-                bid = close_price
-                ask = close_price
+            bid, ask = self._get_bid_ask(ticker)
             self.positions[ticker].update_market_value(bid, ask)
             self._update_portfolio()
         else:
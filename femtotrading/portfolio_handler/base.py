@@ -5,7 +5,8 @@ from ..portfolio import Portfolio
 class PortfolioHandler(object):
     def __init__(
         self, events_queue, initial_cash,
-        price_handler, position_sizer, risk_manager
+        price_handler, position_sizer, risk_manager,
+        accounting="decimal", portfolio=None
     ):
         """
         The PortfolioHandler is designed to interact with the
@@ -24,13 +25,23 @@ class PortfolioHandler(object):
         The PortfolioHandler also takes a handle to the
         RiskManager, which is used to modify any generated
         Orders to remain in line with risk parameters.
+
+        accounting selects the arithmetic of the Portfolio:
+        "decimal" (exact, default) or "float" (float64, P&L
+        equal to the Decimal one within one cent).
+
+        portfolio (optional) replaces the default Portfolio
+        (for example a VectorizedPortfolio for a large
+        universe of tickers).
         """
         self.events_queue = events_queue
         self.initial_cash = initial_cash
         self.price_handler = price_handler
         self.position_sizer = position_sizer
         self.risk_manager = risk_manager
-        self.portfolio = Portfolio(price_handler, initial_cash)
+        if portfolio is None:
+            portfolio = Portfolio(price_handler, initial_cash, accounting)
+        self.portfolio = portfolio
 
     def _create_order_from_signal(self, signal_event):
         """
@@ -123,7 +134,13 @@ class PortfolioHandler(object):
         self.portfolio._update_portfolio()
 
     def on_tick(self, tick_event):
-        self._update_portfolio_value()
+        """
+        Only positions of tickers of the event are revalued
+        """
+        self.portfolio.update_market_value(tick_event.tickers)
 
     def on_bar(self, bar_event):
-        self._update_portfolio_value()
+        """
+        Only positions of tickers of the event are revalued
+        """
+        self.portfolio.update_market_value(bar_event.tickers)
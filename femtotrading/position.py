@@ -114,8 +114,8 @@ class Position(object):
             if self.action != "SLD":
                 self.avg_price = (
                     (
-                        self.avg_price * self.buys +
-                        price * quantity + commission
+                        self.avg_price * self.buys
+                        + price * quantity + commission
                     ) / (self.buys + quantity)
                 ).quantize(PLACES[5])
             self.buys += quantity
@@ -129,8 +129,8 @@ class Position(object):
             if self.action != "BOT":
                 self.avg_price = (
                     (
-                        self.avg_price * self.sells +
-                        price * quantity - commission
+                        self.avg_price * self.sells
+                        + price * quantity - commission
                     ) / (self.sells + quantity)
                 ).quantize(PLACES[5])
             self.sells += quantity
@@ -144,3 +144,122 @@ class Position(object):
 
         # Adjust average price and cost basis
         self.cost_basis = (self.quantity * self.avg_price).quantize(PLACES[2])
+
+
+class FloatPosition(object):
+    """
+    Same accounting as Position but with float64
+    arithmetic instead of Decimal.
+
+    Values are rounded (round) where Position quantizes
+    them when shares are transacted, so P&L matches
+    Position within FloatAccounting.tolerance
+    (see accounting.py)
+    """
+    def __init__(
+        self, action, ticker, init_quantity,
+        init_price, init_commission,
+        bid, ask
+    ):
+        self.action = action
+        self.ticker = ticker
+        self.quantity = init_quantity
+        self.init_price = float(init_price)
+        self.init_commission = float(init_commission)
+
+        self.realised_pnl = 0.0
+        self.unrealised_pnl = 0.0
+
+        self.buys = 0
+        self.sells = 0
+        self.avg_bot = 0.0
+        self.avg_sld = 0.0
+        self.total_bot = 0.0
+        self.total_sld = 0.0
+        self.total_commission = self.init_commission
+
+        self._calculate_initial_value()
+        self.update_market_value(bid, ask)
+
+    def _calculate_initial_value(self):
+        """
+        See Position._calculate_initial_value
+        """
+        if self.action == "BOT":
+            self.buys = self.quantity
+            self.avg_bot = round(self.init_price, 5)
+            self.total_bot = round(self.buys * self.avg_bot, 2)
+            self.avg_price = round(
+                (self.init_price * self.quantity + self.init_commission) / self.quantity, 5
+            )
+            self.cost_basis = round(self.quantity * self.avg_price, 2)
+        else:  # action == "SLD"
+            self.sells = self.quantity
+            self.avg_sld = round(self.init_price, 5)
+            self.total_sld = round(self.sells * self.avg_sld, 2)
+            self.avg_price = round(
+                (self.init_price * self.quantity - self.init_commission) / self.quantity, 5
+            )
+            self.cost_basis = round(-self.quantity * self.avg_price, 2)
+        self.net = self.buys - self.sells
+        self.net_total = round(self.total_sld - self.total_bot, 2)
+        self.net_incl_comm = round(self.net_total - self.init_commission, 2)
+
+    def update_market_value(self, bid, ask):
+        """
+        See Position.update_market_value
+
+        This is called on every market event so values
+        are not rounded here (error below half a cent).
+        """
+        midpoint = (float(bid) + float(ask)) / 2.0
+        self.market_value = self.quantity * midpoint
+        self.unrealised_pnl = self.market_value - self.cost_basis
+        self.realised_pnl = self.market_value + self.net_incl_comm
+
+    def transact_shares(self, action, quantity, price, commission):
+        """
+        See Position.transact_shares
+        """
+        price = float(price)
+        commission = float(commission)
+        self.total_commission += commission
+
+        # Adjust total bought and sold
+        if action == "BOT":
+            self.avg_bot = round(
+                (self.avg_bot * self.buys + price * quantity) / (self.buys + quantity), 5
+            )
+            if self.action != "SLD":
+                self.avg_price = round(
+                    (
+                        self.avg_price * self.buys
+                        + price * quantity + commission
+                    ) / (self.buys + quantity), 5
+                )
+            self.buys += quantity
+            self.total_bot = round(self.buys * self.avg_bot, 2)
+
+        # action == "SLD"
+        else:
+            self.avg_sld = round(
+                (self.avg_sld * self.sells + price * quantity) / (self.sells + quantity), 5
+            )
+            if self.action != "BOT":
+                self.avg_price = round(
+                    (
+                        self.avg_price * self.sells
+                        + price * quantity - commission
+                    ) / (self.sells + quantity), 5
+                )
+            self.sells += quantity
+            self.total_sld = round(self.sells * self.avg_sld, 2)
+
+        # Adjust net values, including commissions
+        self.net = self.buys - self.sells
+        self.quantity = self.net
+        self.net_total = round(self.total_sld - self.total_bot, 2)
+        self.net_incl_comm = round(self.net_total - self.total_commission, 2)
+
+        # Adjust average price and cost basis
+        self.cost_basis = round(self.quantity * self.avg_price, 2)
@@ -7,9 +7,12 @@ https://docs.python.org/3/library/queue.html
 https://docs.python.org/3/library/heapq.html
 """
 
-from .compat import queue
 import heapq
 
+import six
+
+from .compat import queue
+
 
 class UPriorityQueue:
     """
@@ -70,6 +73,9 @@ class UPriorityQueue:
         for priority, key in self._pq.queue:
             yield key
 
+    def __contains__(self, data):
+        return data in self.keys()
+
     @property
     def next_priority(self):
         try:
@@ -79,3 +85,81 @@ class UPriorityQueue:
 
     def __len__(self):
         return self._pq.qsize()
+
+
+class HeapPriorityQueue(object):
+    """
+    Single-threaded priority queue (no lock)
+    with O(1) peek of next priority and O(1) membership test
+
+    Same interface as UPriorityQueue which should
+    still be used when several threads share the queue
+    (live / paper trading)
+
+    > pq = HeapPriorityQueue()
+    > pq.enqueue("a", 10)
+    > pq.enqueue("b", 5)
+    > "b" in pq
+    True
+    > pq.next_priority
+    5
+    > pq.dequeues()
+    ['b']
+    """
+
+    def __init__(self, maxsize=0):
+        # maxsize is unused (kept for UPriorityQueue compatibility)
+        self._heap = []
+        self._keys = {}  # key=>count
+
+    @property
+    def q(self):
+        return self._heap
+
+    def enqueue(self, data, priority):
+        heapq.heappush(self._heap, (priority, data))
+        self._keys[data] = self._keys.get(data, 0) + 1
+
+    def _discard_key(self, data):
+        count = self._keys[data] - 1
+        if count == 0:
+            del self._keys[data]
+        else:
+            self._keys[data] = count
+
+    def dequeue(self):
+        """Remove the lowest priority key"""
+        if not self._heap:
+            raise queue.Empty
+        data = heapq.heappop(self._heap)[1]
+        self._discard_key(data)
+        return data
+
+    def dequeues(self):
+        """Remove and return a list with all the lowest priority keys"""
+        heap = self._heap
+        if not heap:
+            raise queue.Empty
+        first_priority = heap[0][0]
+        lst_dequeued = []
+        while heap and heap[0][0] == first_priority:
+            data = heapq.heappop(heap)[1]
+            self._discard_key(data)
+            lst_dequeued.append(data)
+        return lst_dequeued
+
+    def keys(self):
+        return six.viewkeys(self._keys)
+
+    def __contains__(self, data):
+        return data in self._keys
+
+    @property
+    def next_priority(self):
+        try:
+            return self._heap[0][0]
+        except IndexError:
+            raise queue.Empty
+
+    def __len__(self):
+        return len(self._heap)
@@ -1,5 +1,8 @@
 #!/usr/bin/env/python
 
+from __future__ import print_function
+
+import json
 import time
 
 
@@ -11,3 +14,230 @@ def s_speed(time_event, ticks, t0):
     sp = speed(ticks, t0)
     s_typ = time_event.typename
     return "%d %s processed @ %f %s/s" % (ticks, s_typ + "s", sp, s_typ + "s")
+
+
+clock = getattr(time, "perf_counter", time.time)
+
+HISTOGRAM_BUCKETS = 48  # bucket i: [2**(i-1), 2**i) ns
+
+
+class TimingStats(object):
+    """
+    Number of calls and cumulative wall time (seconds)
+    """
+    __slots__ = ("count", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies with power of 2 nanoseconds buckets
+    (bucket is bit_length of latency in ns, so O(1) without log)
+    """
+    __slots__ = ("counts", )
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds):
+        i = int(seconds * 1e9).bit_length()
+        if i >= HISTOGRAM_BUCKETS:
+            i = HISTOGRAM_BUCKETS - 1
+        self.counts[i] += 1
+
+    def percentile(self, q):
+        """
+        Returns upper bound (seconds) of bucket holding
+        q percentile (0 < q <= 100)
+        """
+        n = sum(self.counts)
+        if n == 0:
+            return 0.0
+        threshold = n * q / 100.0
+        cumulated = 0
+        for i, count in enumerate(self.counts):
+            cumulated += count
+            if cumulated >= threshold:
+                return (2 ** i) / 1e9
+        return (2 ** (HISTOGRAM_BUCKETS - 1)) / 1e9
+
+    def to_dict(self):
+        """
+        Returns dict upper bound of bucket (ns)=>count
+        (non-empty buckets only)
+        """
+        return dict((2 ** i, count) for i, count in enumerate(self.counts) if count)
+
+
+def handler_name(handler):
+    """
+    Returns "Class.method" of a bound method (or name of
+    a function)
+    """
+    owner = getattr(handler, "__self__", None)
+    name = getattr(handler, "__name__", repr(handler))
+    if owner is None:
+        return name
+    return "%s.%s" % (owner.__class__.__name__, name)
+
+
+class SessionProfiler(object):
+    """
+    Hot-path profiler of a TradingSession
+
+    Records number of calls and cumulative wall time of the
+    data iterator (next) and of each handler (strategies,
+    portfolio handler, execution handler, statistics...) and
+    a latency histogram (all handlers) per event type.
+
+    > session.run(profile=SessionProfiler(json_path="out/profile.json"))
+    > session.profiler.table()
+
+    Timings are 2 clock reads per call (cheap enough for
+    nightly runs).
+    """
+    DATA_ITERATOR = "data_iterator.next"
+
+    def __init__(self, json_path=None, display=True):
+        self.json_path = json_path
+        self.display = display
+        self.components = {}  # name=>TimingStats
+        self.event_types = {}  # event class name=>TimingStats
+        self.histograms = {}  # event class name=>LatencyHistogram
+        self._names = {}  # (id of component, method)=>name
+        self.duration = 0.0
+        self._t0 = None
+
+    def start(self):
+        self._t0 = clock()
+
+    def stop(self):
+        if self._t0 is not None:
+            self.duration += clock() - self._t0
+            self._t0 = None
+
+    def _component_name(self, handler):
+        """
+        Unique name of handler (several components of the same
+        class, e.g. strategies, are numbered)
+        """
+        key = (id(getattr(handler, "__self__", handler)), getattr(handler, "__name__", None))
+        try:
+            return self._names[key]
+        except KeyError:
+            name = handler_name(handler)
+            if name in self._names.values():
+                i = 2
+                while "%s#%d" % (name, i) in self._names.values():
+                    i += 1
+                name = "%s#%d" % (name, i)
+            self._names[key] = name
+            return name
+
+    def dispatcher(self, event_class, handlers):
+        """
+        Returns a function calling handlers of an event type
+        and timing each of them
+        """
+        timed = []
+        for handler in handlers:
+            name = self._component_name(handler)
+            stats = self.components.setdefault(name, TimingStats())
+            timed.append((handler, stats))
+        type_name = event_class.__name__
+        event_stats = self.event_types.setdefault(type_name, TimingStats())
+        histogram = self.histograms.setdefault(type_name, LatencyHistogram())
+
+        def dispatch(event):
+            t_start = t0 = clock()
+            for handler, stats in timed:
+                handler(event)
+                t1 = clock()
+                stats.count += 1
+                stats.total += t1 - t0
+                t0 = t1
+            latency = t0 - t_start
+            event_stats.count += 1
+            event_stats.total += latency
+            histogram.add(latency)
+        return dispatch
+
+    def iterate(self, data_iterator):
+        """
+        Yields events of a data iterator timing next()
+        """
+        stats = self.components.setdefault(self.DATA_ITERATOR, TimingStats())
+        iterator = iter(data_iterator)
+        while True:
+            t0 = clock()
+            try:
+                event = next(iterator)
+            except StopIteration:
+                stats.total += clock() - t0
+                return
+            stats.count += 1
+            stats.total += clock() - t0
+            yield event
+
+    def to_dict(self):
+        return {
+            "duration": self.duration,
+            "components": dict(
+                (name, {"count": stats.count, "total": stats.total, "mean": stats.mean})
+                for name, stats in self.components.items()
+            ),
+            "event_types": dict(
+                (name, {
+                    "count": stats.count, "total": stats.total, "mean": stats.mean,
+                    "p50": self.histograms[name].percentile(50),
+                    "p99": self.histograms[name].percentile(99),
+                    "histogram_ns": self.histograms[name].to_dict()
+                })
+                for name, stats in self.event_types.items()
+            )
+        }
+
+    def to_json(self, path):
+        with open(path, "w") as fd:
+            json.dump(self.to_dict(), fd, indent=2, sort_keys=True)
+
+    def table(self):
+        """
+        Returns breakdown table (str) of components (sorted by
+        cumulative time) and event types
+        """
+        duration = self.duration if self.duration > 0 else 1.0
+        lines = ["%-45s %10s %12s %12s %7s" % ("component", "calls", "total (s)", "mean (us)", "%")]
+        for name, stats in sorted(self.components.items(), key=lambda item: -item[1].total):
+            if stats.count == 0:
+                continue
+            lines.append("%-45s %10d %12.6f %12.3f %6.1f%%" % (
+                name, stats.count, stats.total, stats.mean * 1e6, 100.0 * stats.total / duration))
+        lines.append("")
+        lines.append("%-45s %10s %12s %12s %12s" % ("event type", "events", "mean (us)", "p50 (us)", "p99 (us)"))
+        for name, stats in sorted(self.event_types.items()):
+            if stats.count == 0:
+                continue
+            histogram = self.histograms[name]
+            lines.append("%-45s %10d %12.3f %12.3f %12.3f" % (
+                name, stats.count, stats.mean * 1e6,
+                histogram.percentile(50) * 1e6, histogram.percentile(99) * 1e6))
+        lines.append("")
+        lines.append("total %.6fs" % self.duration)
+        return "\n".join(lines)
+
+    def report(self):
+        """
+        Prints breakdown table and exports JSON (if json_path)
+        """
+        if self.display:
+            print(self.table())
+        if self.json_path is not None:
+            self.to_json(self.json_path)
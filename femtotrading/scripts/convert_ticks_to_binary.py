@@ -0,0 +1,51 @@
+from __future__ import print_function
+
+import click
+
+import os
+from .. import settings
+from ..data_iterator.binary_tick_cache import binary_filename, is_cache_valid, convert_csv_to_binary
+
+
+def run(data_dir, tickers, year, month, cache_dir, force, config):
+    """
+    Converts TICKER-YYYY-MM.csv files to binary tick cache files
+    """
+    if config is None:
+        config = settings.DEFAULT
+
+    if data_dir == '':
+        data_dir = os.path.expanduser(config.CSV_DATA_DIR)
+    else:
+        data_dir = os.path.expanduser(data_dir)
+
+    if cache_dir == '':
+        cache_dir = None
+
+    fnames = []
+    for ticker in tickers:
+        csv_fname = os.path.join(data_dir, "%s-%4d-%02d.csv" % (ticker, year, month))
+        bin_fname = binary_filename(csv_fname, cache_dir)
+        if force or not is_cache_valid(csv_fname, bin_fname):
+            print("Convert '%s' to '%s'" % (csv_fname, bin_fname))
+            convert_csv_to_binary(csv_fname, bin_fname)
+        else:
+            print("'%s' is up to date" % bin_fname)
+        fnames.append(bin_fname)
+    return fnames
+
+
+@click.command()
+@click.option('--data_dir', default='', help='Data directory (CSV_DATA_DIR)')
+@click.option('--tickers', default='GBPUSD,EURUSD', help='Tickers (use comma)')
+@click.option('--year', default=2014, help='Year')
+@click.option('--month', default=1, help='Month')
+@click.option('--cache_dir', default='', help='Binary cache directory (default: data directory)')
+@click.option('--force/--no-force', default=False, help='Convert even if cache is up to date')
+def main(data_dir, tickers, year, month, cache_dir, force, config=None):
+    tickers = tickers.split(",")
+    return run(data_dir, tickers, year, month, cache_dir, force, config=config)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,44 @@
+"""
+Generates simulated tick data (random walk of bid / ask
+prices with fixed spread) for every weekday of a month
+
+One file per ticker and per day, e.g. "GOOG_20140102.csv"
+(Ticker,Time,Bid,Ask) or "GOOG_20140102.bin" (binary tick
+format of data_iterator.binary_tick_cache).
+
+Ticks of a day are generated by blocks with NumPy:
+intervals ~ |N(mu_dt, sigma_dt)| milliseconds and price
+increments ~ N(0, 1) * dt / 1000 / 86400 are drawn for
+whole arrays and cumulated. Several tickers share the same
+tick times and have correlated increments (correlation).
+
+Days are generated in order (each day starts from prices
+of the end of the previous day) and files are written in
+parallel by a pool of processes (max_workers). Each day
+has its own random stream so files only depend on seed.
+
+$ python -m femtotrading.scripts.generate_simulated_prices --ticker GOOG,AMZN --correlation 0.5 --fmt binary
+"""
+
 from __future__ import print_function
 
 import click
 
 import calendar
-import copy
-import datetime
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import pandas as pd
+import six
+
 from .. import settings
+from ..data_iterator.binary_tick_cache import TICK_DTYPE, write_ticks
+
+
+MS_PER_DAY = 86400 * 1000
+
+BLOCK_SIZE = 65536  # number of ticks drawn at once
 
 
 def month_weekdays(year_int, month_int):
@@ -18,14 +49,116 @@ def month_weekdays(year_int, month_int):
     cal = calendar.Calendar()
     return [
         d for d in cal.itermonthdates(year_int, month_int)
-        if d.weekday() < 5 and d.year == year_int
+        if d.weekday() < 5 and d.year == year_int and d.month == month_int
     ]
 
 
-def run(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, month, nb_days, config):
-    if seed >= 0:
-        np.random.seed(seed)
+def correlation_cholesky(n, correlation):
+    """
+    Returns lower triangular matrix L (L L' is the
+    correlation matrix of increments of n tickers)
+
+    correlation is a float (same correlation for every pair
+    of tickers) or a n x n correlation matrix
+    """
+    if np.isscalar(correlation):
+        matrix = np.full((n, n), float(correlation))
+        np.fill_diagonal(matrix, 1.0)
+    else:
+        matrix = np.asarray(correlation, dtype=float)
+        if matrix.shape != (n, n):
+            raise ValueError("correlation matrix must be %d x %d" % (n, n))
+    return np.linalg.cholesky(matrix)
+
+
+def tick_intervals(random_state, mu_dt, sigma_dt, duration):
+    """
+    Returns offsets (ms, float) of ticks after start of a
+    period of duration (ms)
+    """
+    blocks = []
+    total = 0.0
+    while True:
+        dt = np.abs(random_state.normal(mu_dt, sigma_dt, size=BLOCK_SIZE))
+        offsets = total + np.cumsum(dt)
+        stop = np.searchsorted(offsets, duration)
+        blocks.append(offsets[:stop])
+        if stop < BLOCK_SIZE:
+            return np.concatenate(blocks)
+        total = offsets[-1]
+
+
+def simulate_day(random_state, day, mid, spread, mu_dt, sigma_dt, cholesky):
+    """
+    Returns (times, bids, asks, mid) of a day: times is a
+    datetime64[ms] array, bids and asks are (ticks, tickers)
+    arrays and mid is mid prices at end of day (start of
+    next day)
+    """
+    offsets = tick_intervals(random_state, mu_dt, sigma_dt, MS_PER_DAY)
+    dt = np.diff(offsets, prepend=0.0)
+    z = random_state.standard_normal((len(offsets), len(mid))).dot(cholesky.T)
+    mids = mid + np.cumsum(z * (dt / 1000.0 / 86400.0)[:, None], axis=0)
+    times = np.datetime64(day, "ms") + offsets.astype("timedelta64[ms]")
+    if len(mids) > 0:
+        mid = mids[-1]
+    return times, mids - spread / 2.0, mids + spread / 2.0, mid
+
+
+def write_csv(fname, ticker, times, bids, asks):
+    """
+    Writes ticks of a ticker (of a same day) as CSV
+    (Ticker,Time,Bid,Ask) with one write
+    """
+    if len(times) == 0:
+        prefix = ""
+    else:
+        prefix = "%s,%s " % (ticker, pd.Timestamp(times[0]).strftime("%d.%m.%Y"))
+    # "YYYY-MM-DDTHH:MM:SS.mmm" => "HH:MM:SS.mmm"
+    clock_times = np.datetime_as_string(times, unit="ms").tolist()
+    with open(fname, "w") as fd:
+        fd.write("Ticker,Time,Bid,Ask\n")
+        fd.write("".join(
+            "%s%s,%0.5f,%0.5f\n" % (prefix, t[11:], bid, ask)
+            for t, bid, ask in zip(clock_times, bids.tolist(), asks.tolist())
+        ))
+    return fname
+
+
+def write_binary(fname, ticker, times, bids, asks):
+    """
+    Writes ticks of a ticker as binary ticks (TICK_DTYPE)
+    """
+    ticks = np.empty(len(times), dtype=TICK_DTYPE)
+    ticks["time"] = times.astype("datetime64[ns]").astype(np.int64)
+    ticks["bid"] = np.round(bids, 5)
+    ticks["ask"] = np.round(asks, 5)
+    return write_ticks(fname, ticks)
+
+
+FORMATS = {
+    "csv": (".csv", write_csv),
+    "binary": (".bin", write_binary),
+}
 
+
+def write_day(fmt, fname, ticker, times, bids, asks):
+    print("Save data to '%s'" % fname)
+    _, writer = FORMATS[fmt]
+    return writer(fname, ticker, times, bids, asks)
+
+
+def run(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, month, nb_days, config,
+        correlation=0.0, fmt="csv", max_workers=1):
+    """
+    Generates files of simulated ticks and returns their
+    filenames
+
+    ticker is a ticker or a list of tickers (or tickers
+    separated by comma)
+    max_workers=1 writes files in current process
+    (None: one process per CPU)
+    """
     if config is None:
         config = settings.DEFAULT
 
@@ -34,59 +167,48 @@ def run(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, mon
     else:
         outdir = os.path.expanduser(outdir)
 
-    s0 = float(init_price)
-    spread = 0.02
-    mu_dt = 1400  # Milliseconds
-    sigma_dt = 100  # Millseconds
-    ask = copy.deepcopy(s0) + spread / 2.0
-    bid = copy.deepcopy(s0) - spread / 2.0
+    if isinstance(ticker, six.string_types):
+        tickers = ticker.split(",")
+    else:
+        tickers = list(ticker)
+    if fmt not in FORMATS:
+        raise ValueError("fmt must be one of %s" % sorted(FORMATS))
+    extension, _ = FORMATS[fmt]
+
+    cholesky = correlation_cholesky(len(tickers), correlation)
+    mid = np.full(len(tickers), float(init_price))
     days = month_weekdays(year, month)
-    current_time = datetime.datetime(
-        days[0].year, days[0].month, days[0].day, 0, 0, 0,
-    )
-
-    # Loop over every day in the month and create a CSV file
-    # for each day, e.g. "GOOG_20150101.csv"
-    for i, d in enumerate(days):
-        print("Create '%s' data for %s" % (ticker, d))
-        current_time = current_time.replace(day=d.day)
-        fname = os.path.join(
-            outdir,
-            "%s_%s.csv" % (ticker, d.strftime("%Y%m%d"))
-        )
-        outfile = open(fname, "w")
-        print("Save data to '%s'" % fname)
-        outfile.write("Ticker,Time,Bid,Ask\n")
-
-        # Create the random walk for the bid/ask prices
-        # with fixed spread between them
-        # for i in range(0, 10000):
-        while True:
-            dt = abs(np.random.normal(mu_dt, sigma_dt))
-            current_time += datetime.timedelta(0, 0, 0, dt)
-            if current_time.day != d.day:
-                outfile.close()
-                break
+    if nb_days > 0:
+        days = days[:nb_days]
+
+    def generate(submit):
+        # Loop over every day in the month and create a file
+        # for each day and ticker, e.g. "GOOG_20150101.csv"
+        futures = []
+        for i, d in enumerate(days):
+            print("Create %s data for %s" % (tickers, d))
+            if seed >= 0:
+                random_state = np.random.RandomState([seed, i])
             else:
-                W = np.random.standard_normal() * dt / 1000.0 / 86400.0
-                ask += W
-                bid -= W
-                line = "%s,%s,%s,%s\n" % (
-                    ticker,
-                    current_time.strftime(
-                        "%d.%m.%Y %H:%M:%S.%f"
-                    )[:-3],
-                    "%0.5f" % bid,
-                    "%0.5f" % ask
-                )
-                outfile.write(line)
-        if nb_days > 0 and i >= nb_days - 1:
-            break
+                random_state = np.random.RandomState()
+            times, bids, asks, end_mid = simulate_day(
+                random_state, d, mid, spread, mu_dt, sigma_dt, cholesky)
+            mid[:] = end_mid
+            for j, ticker_ in enumerate(tickers):
+                fname = os.path.join(outdir, "%s_%s%s" % (ticker_, d.strftime("%Y%m%d"), extension))
+                futures.append(submit(write_day, fmt, fname, ticker_, times, bids[:, j], asks[:, j]))
+        return futures
+
+    if max_workers == 1:
+        return generate(lambda f, *args: f(*args))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = generate(executor.submit)
+        return [future.result() for future in futures]
 
 
 @click.command()
 @click.option('--outdir', default='', help='Ouput directory (CSV_DATA_DIR)')
-@click.option('--ticker', default='GOOG', help='Equity ticker symbol (GOOG, SP500TR...)')
+@click.option('--ticker', default='GOOG', help='Equity ticker symbol (GOOG, SP500TR...), use comma for several tickers')
 @click.option('--init_price', default=700, help='Init price')
 @click.option('--seed', default=42, help='Seed (Fix the randomness by default but use a negative value for true randomness)')
 @click.option('--s0', default=1.5000, help='s0')
@@ -96,8 +218,14 @@ def run(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, mon
 @click.option('--year', default=2014, help='Year')
 @click.option('--month', default=1, help='Month')
 @click.option('--days', default=-1, help='Number days to process')
-def main(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, month, days, config=None):
-    return run(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, month, days, config=config)
+@click.option('--correlation', default=0.0, help='Correlation of price increments of tickers')
+@click.option('--fmt', default='csv', type=click.Choice(sorted(FORMATS)), help='Output format')
+@click.option('--max_workers', default=None, type=int, help='Number of worker processes (default: one per CPU)')
+def main(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, month, days,
+         correlation, fmt, max_workers, config=None):
+    return run(outdir, ticker, init_price, seed, s0, spread, mu_dt, sigma_dt, year, month, days, config=config,
+               correlation=correlation, fmt=fmt, max_workers=max_workers)
+
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,16 @@
 """
 Test scripts
 """
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from ..settings import TEST
+from ..data_iterator.binary_tick_cache import read_ticks
 from .generate_simulated_prices import run as run_generate_simulated_prices
 
 
@@ -35,3 +42,52 @@ class TestScripts(unittest.TestCase):
             3,  # nb_days (number of days of data to create)
             config=self.config
         )
+
+
+class TestGenerateSimulatedPrices(unittest.TestCase):
+    """
+    Test generate_simulated_prices with several tickers
+    """
+    def setUp(self):
+        self.outdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir)
+
+    def generate(self, outdir, fmt, max_workers, correlation=0.9):
+        return run_generate_simulated_prices(
+            outdir, 'AAA,BBB', 700, 42, 1.5, 0.02, 1400, 100, 2014, 1, 2, None,
+            correlation=correlation, fmt=fmt, max_workers=max_workers
+        )
+
+    def test_csv_and_binary(self):
+        fnames = self.generate(self.outdir, "csv", 1)
+        self.assertEqual([os.path.basename(fname) for fname in fnames], [
+            "AAA_20140101.csv", "BBB_20140101.csv", "AAA_20140102.csv", "BBB_20140102.csv"])
+        bin_fnames = self.generate(self.outdir, "binary", 2)
+        for fname, bin_fname in zip(fnames, bin_fnames):
+            df = pd.read_csv(fname)
+            self.assertEqual(list(df.columns), ["Ticker", "Time", "Bid", "Ask"])
+            ticks = read_ticks(bin_fname)
+            self.assertEqual(len(ticks), len(df))
+            times = pd.to_datetime(df["Time"], format="%d.%m.%Y %H:%M:%S.%f")
+            self.assertTrue((times.values.astype("datetime64[ns]").astype(np.int64) == ticks["time"]).all())
+            self.assertTrue(np.allclose(df["Bid"].values, ticks["bid"]))
+            self.assertTrue(np.allclose(df["Ask"].values - df["Bid"].values, 0.02))
+        # tickers share tick times, increments are correlated
+        df_a, df_b = pd.read_csv(fnames[0]), pd.read_csv(fnames[1])
+        self.assertTrue((df_a["Time"] == df_b["Time"]).all())
+        corr = np.corrcoef(np.diff(df_a["Bid"].values), np.diff(df_b["Bid"].values))[0, 1]
+        self.assertGreater(corr, 0.5)
+        # next day starts from prices of end of previous day
+        df_next = pd.read_csv(fnames[2])
+        self.assertLess(abs(df_next["Bid"].iloc[0] - df_a["Bid"].iloc[-1]), 0.001)
+
+    def test_parallel_same_as_serial(self):
+        parallel_dir = os.path.join(self.outdir, "parallel")
+        os.mkdir(parallel_dir)
+        fnames = self.generate(self.outdir, "csv", 1, correlation=0.0)
+        parallel_fnames = self.generate(parallel_dir, "csv", 2, correlation=0.0)
+        for fname, parallel_fname in zip(fnames, parallel_fnames):
+            with open(fname) as fd, open(parallel_fname) as parallel_fd:
+                self.assertEqual(fd.read(), parallel_fd.read())
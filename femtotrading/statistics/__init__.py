@@ -2,3 +2,4 @@
 # flake8: noqa
 
 from .simple import SimpleStatistics
+from .policy import EveryEvent, EveryNEvents, TimeBucket, OnFill
@@ -2,6 +2,8 @@
 
 from abc import ABCMeta, abstractmethod
 
+from .policy import EveryEvent
+
 
 class Statistics(object):
     """
@@ -18,10 +20,32 @@ class Statistics(object):
     and timeframes-traded by the user. Different trading strategies
     may require different metrics or frequencies-of-metrics to be updated,
     however the example given is suitable for longer timeframes.
+
+    When statistics are recorded is decided by a collection
+    policy (see policy.py): on every event (default), every
+    n events, per interval of market time or on fills only.
     """
 
     __metaclass__ = ABCMeta
 
+    def __init__(self, policy=None):
+        if policy is None:
+            policy = EveryEvent()
+        self.policy = policy
+
+    def current_equity(self):
+        """
+        Return current equity of portfolio (as float)
+        """
+        raise NotImplementedError("Should implement current_equity()")
+
+    @abstractmethod
+    def _update(self, timestamp, equity=None):
+        """
+        Record equity (current equity if None) at timestamp
+        """
+        raise NotImplementedError("Should implement _update()")
+
     @abstractmethod
     def get_results(self):
         """
@@ -42,7 +66,7 @@ class Statistics(object):
         and open positions. This should be called from within the
         event loop when TickEvent occurs.
         """
-        self._update(tick_event.time)
+        self.policy.on_market_event(self, tick_event.time)
 
     def on_bar(self, bar_event):
         """
@@ -50,4 +74,17 @@ class Statistics(object):
         and open positions. This should be called from within the
         event loop when BarEvent occurs.
         """
-        self._update(bar_event.time)
+        self.policy.on_market_event(self, bar_event.time)
+
+    def on_fill(self, fill_event):
+        """
+        This should be called from within the event loop
+        when FillEvent occurs (after portfolio is updated).
+        """
+        self.policy.on_fill(self, fill_event.timestamp)
+
+    def flush(self):
+        """
+        Record values pending in collection policy
+        """
+        self.policy.flush(self)
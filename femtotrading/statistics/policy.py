@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+
+"""
+Collection policies
+
+A collection policy decides when a Statistics object
+records portfolio equity:
+
+- EveryEvent: on every tick / bar (default)
+- EveryNEvents: every n market events
+- TimeBucket: once per interval of market time (last
+  equity of the bucket, min/max are also kept)
+- OnFill: only when an order is filled
+
+Policies which don't record every event can track the
+running high-water mark on every event so that max
+drawdown is the true one (not the one of the sampled
+equity curve).
+"""
+
+import datetime
+
+import pandas as pd
+
+from ..utils import EPOCH
+
+
+class DrawdownTracker(object):
+    """
+    Running high-water mark and max drawdown
+    """
+    def __init__(self):
+        self.hwm = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+
+    def update(self, equity):
+        if self.hwm is None or equity > self.hwm:
+            self.hwm = equity
+            return
+        drawdown = self.hwm - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+            self.max_drawdown_pct = drawdown / self.hwm * 100
+
+
+class CollectionPolicy(object):
+    """
+    CollectionPolicy is an abstract class providing an interface
+    for all collection policies.
+
+    statistics must provide _update(timestamp, equity=None)
+    and current_equity()
+    """
+    def __init__(self, track_drawdown=True):
+        if track_drawdown:
+            self.drawdown = DrawdownTracker()
+        else:
+            self.drawdown = None
+
+    def start(self, equity):
+        """
+        Called with initial equity
+        """
+        if self.drawdown is not None:
+            self.drawdown.update(equity)
+
+    def _observe(self, statistics):
+        """
+        Returns current equity (and updates drawdown tracker)
+        """
+        equity = statistics.current_equity()
+        if self.drawdown is not None:
+            self.drawdown.update(equity)
+        return equity
+
+    def on_market_event(self, statistics, timestamp):
+        raise NotImplementedError("Should implement on_market_event()")
+
+    def on_fill(self, statistics, timestamp):
+        pass
+
+    def flush(self, statistics):
+        """
+        Records pending values (end of session)
+        """
+        pass
+
+
+class EveryEvent(CollectionPolicy):
+    """
+    Records equity on every market event
+    (recorded equity curve already holds every value so
+    no drawdown tracker is needed)
+    """
+    def __init__(self):
+        super(EveryEvent, self).__init__(track_drawdown=False)
+
+    def on_market_event(self, statistics, timestamp):
+        statistics._update(timestamp)
+
+
+class EveryNEvents(CollectionPolicy):
+    """
+    Records equity every n market events
+    (and last event at flush)
+    """
+    def __init__(self, n, track_drawdown=True):
+        super(EveryNEvents, self).__init__(track_drawdown)
+        self.n = n
+        self._count = 0
+        self._pending = None
+
+    def on_market_event(self, statistics, timestamp):
+        equity = self._observe(statistics)
+        self._count += 1
+        if self._count == self.n:
+            self._count = 0
+            self._pending = None
+            statistics._update(timestamp, equity)
+        else:
+            self._pending = (timestamp, equity)
+
+    def flush(self, statistics):
+        if self._pending is not None:
+            timestamp, equity = self._pending
+            self._pending = None
+            self._count = 0
+            statistics._update(timestamp, equity)
+
+
+class TimeBucket(CollectionPolicy):
+    """
+    Records last equity of each interval of market time
+    (labeled with the timestamp of the last event of the
+    bucket)
+
+    Last, min and max equity of each bucket (labeled with
+    its start time) are available with buckets()
+
+    flush() records last equity of the current bucket but
+    doesn't close it: equity is recorded again only if there
+    are new events in this bucket (several flushes record
+    it once).
+
+    > policy = TimeBucket(datetime.timedelta(minutes=1))
+    > statistics = SimpleStatistics(portfolio_handler, policy)
+    """
+    def __init__(self, interval, track_drawdown=True):
+        super(TimeBucket, self).__init__(track_drawdown)
+        if not isinstance(interval, datetime.timedelta):
+            interval = datetime.timedelta(seconds=interval)
+        self.interval = interval
+        self._interval_us = self._microseconds(interval)
+        self._bucket_start = None
+        self._bucket_end = None
+        self._last_time = None
+        self._last = None
+        self._low = None
+        self._high = None
+        self._recorded = False  # last equity of current bucket is recorded
+        self._buckets = []  # [(bucket_start, last, low, high), ...]
+
+    @staticmethod
+    def _microseconds(delta):
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+    def _bucket(self, timestamp):
+        """
+        Returns start and end of the bucket of timestamp
+        """
+        us = self._microseconds(timestamp - EPOCH)
+        start = EPOCH + datetime.timedelta(microseconds=us - us % self._interval_us)
+        return start, start + self.interval
+
+    def on_market_event(self, statistics, timestamp):
+        equity = self._observe(statistics)
+        if self._bucket_end is not None and timestamp < self._bucket_end:
+            self._last_time = timestamp
+            self._last = equity
+            self._recorded = False
+            if equity < self._low:
+                self._low = equity
+            elif equity > self._high:
+                self._high = equity
+            return
+        if self._bucket_start is not None:
+            self.flush(statistics)
+            self._buckets.append((self._bucket_start, self._last, self._low, self._high))
+        self._bucket_start, self._bucket_end = self._bucket(timestamp)
+        self._last_time = timestamp
+        self._last = self._low = self._high = equity
+        self._recorded = False
+
+    def flush(self, statistics):
+        if self._bucket_start is not None and not self._recorded:
+            statistics._update(self._last_time, self._last)
+            self._recorded = True
+
+    def buckets(self):
+        """
+        Returns a DataFrame with last, min and max equity
+        of each bucket (current bucket included)
+        """
+        buckets = list(self._buckets)
+        if self._bucket_start is not None:
+            buckets.append((self._bucket_start, self._last, self._low, self._high))
+        df = pd.DataFrame(buckets, columns=["time", "last", "min", "max"])
+        return df.set_index("time")
+
+
+class OnFill(CollectionPolicy):
+    """
+    Records equity only when an order is filled
+    """
+    def on_market_event(self, statistics, timestamp):
+        if self.drawdown is not None:
+            self._observe(statistics)
+
+    def on_fill(self, statistics, timestamp):
+        statistics._update(timestamp, self._observe(statistics))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""
+Append-only recorder of equity, returns, high-water mark
+and drawdown
+
+Values are written into preallocated NumPy chunks so
+appending is O(1) (no reallocation of a growing pandas
+Series). pandas objects are only built on demand.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class EquityRecorder(object):
+    """
+    Records (timestamp, equity) and derives
+
+    - returns: percentage return between previous and
+      current equity (relative to current equity), NaN for
+      first row
+    - hwm: high-water mark (max equity seen so far)
+    - drawdown: hwm - equity
+
+    > recorder = EquityRecorder()
+    > recorder.append(timestamp, equity)
+    > recorder.series("equity")
+    """
+
+    CHUNK_SIZE = 65536
+    FIELDS = ["equity", "returns", "hwm", "drawdown"]
+
+    def __init__(self, chunk_size=None):
+        if chunk_size is None:
+            chunk_size = self.CHUNK_SIZE
+        self.chunk_size = chunk_size
+        self._timestamps = []  # list of object arrays
+        self._values = []  # list of 2D float arrays (field, row)
+        self._i = chunk_size  # position in current chunk
+        self._n = 0
+        self._last_equity = np.nan
+        self._hwm = np.nan
+
+    def __len__(self):
+        return self._n
+
+    def _new_chunk(self):
+        self._timestamps.append(np.empty(self.chunk_size, dtype=object))
+        self._values.append(np.empty((len(self.FIELDS), self.chunk_size)))
+        self._i = 0
+
+    def append(self, timestamp, equity):
+        """
+        Records equity value at timestamp
+        """
+        if self._i == self.chunk_size:
+            self._new_chunk()
+        if self._n == 0:
+            returns = np.nan
+            self._hwm = equity
+        else:
+            returns = (equity - self._last_equity) / equity * 100
+            if equity > self._hwm:
+                self._hwm = equity
+        i = self._i
+        self._timestamps[-1][i] = timestamp
+        values = self._values[-1]
+        values[0, i] = equity
+        values[1, i] = returns
+        values[2, i] = self._hwm
+        values[3, i] = self._hwm - equity
+        self._last_equity = equity
+        self._i += 1
+        self._n += 1
+
+    def extend(self, timestamps, equities):
+        """
+        Records several equity values at once (vectorized)
+        """
+        equities = np.asarray(equities, dtype=float)
+        timestamps = list(timestamps)
+        start = 0
+        while start < len(equities):
+            if self._i == self.chunk_size:
+                self._new_chunk()
+            stop = min(len(equities), start + self.chunk_size - self._i)
+            equity = equities[start:stop]
+            if self._n == 0:
+                self._last_equity = equity[0]
+                self._hwm = equity[0]
+            previous = np.concatenate([[self._last_equity], equity[:-1]])
+            returns = (equity - previous) / equity * 100
+            if self._n == 0:
+                returns[0] = np.nan
+            hwm = np.maximum.accumulate(np.concatenate([[self._hwm], equity]))[1:]
+            i, j = self._i, self._i + len(equity)
+            self._timestamps[-1][i:j] = timestamps[start:stop]
+            values = self._values[-1]
+            values[0, i:j] = equity
+            values[1, i:j] = returns
+            values[2, i:j] = hwm
+            values[3, i:j] = hwm - equity
+            self._last_equity = equity[-1]
+            self._hwm = hwm[-1]
+            self._i = j
+            self._n += len(equity)
+            start = stop
+
+    def _concatenate(self, chunks):
+        if len(chunks) == 0:
+            return chunks
+        # last chunk is only filled up to self._i
+        return chunks[:-1] + [chunks[-1][..., :self._i]]
+
+    @property
+    def timestamps(self):
+        chunks = self._concatenate(self._timestamps)
+        if len(chunks) == 0:
+            return np.empty(0, dtype=object)
+        return np.concatenate(chunks)
+
+    def column(self, field):
+        """
+        Returns values of a field as a NumPy array
+        """
+        k = self.FIELDS.index(field)
+        chunks = [values[k] for values in self._concatenate(self._values)]
+        if len(chunks) == 0:
+            return np.empty(0)
+        return np.concatenate(chunks)
+
+    def series(self, field, start=0):
+        """
+        Returns a pandas Series of a field indexed
+        by timestamps (from row start)
+        """
+        index = pd.Index(self.timestamps[start:], dtype=object)
+        return pd.Series(self.column(field)[start:], index=index)
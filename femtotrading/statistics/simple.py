@@ -5,6 +5,7 @@ import numpy as np
 import matplotlib
 from decimal import Decimal
 from collections import OrderedDict
+from munch import Munch
 
 try:
     matplotlib.use('TkAgg')
@@ -14,6 +15,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 from .base import Statistics
+from .recorder import EquityRecorder
 
 
 class SimpleStatistics(Statistics):
@@ -24,64 +26,109 @@ class SimpleStatistics(Statistics):
     Statistics included are Sharpe Ratio, Drawdown, Max Drawdown,
     Max Drawdown Duration.
 
+    Values are stored by an EquityRecorder (preallocated
+    NumPy chunks) and pandas Series are only built when
+    needed (get_results, plot_results).
+
     TODO think about Alpha/Beta, compare strategy of benchmark.
-    TODO think about speed -- will be bad doing for every tick
-    on anything that trades sub-minute.
     TODO think about slippage, fill rate, etc
     TODO brokerage costs?
 
     TODO need some kind of trading-frequency parameter in setup.
     Sharpe calculations need to know if daily, hourly, minutely, etc.
     """
-    def __init__(self, portfolio_handler):
+    def __init__(self, portfolio_handler, policy=None):
         """
-        Takes in a portfolio handler.
+        Takes in a portfolio handler and optionally
+        a collection policy.
         """
+        super(SimpleStatistics, self).__init__(policy)
         self.portfolio_handler = portfolio_handler
-        self.drawdowns = pd.Series()
-        self.equity = pd.Series()
-        self.equity_returns = pd.Series()
+        self.recorder = EquityRecorder()
+        self._series_cache = {}
         # Initialize in order for first-step calculations to be correct.
-        self.hwm = [float(self.portfolio_handler.portfolio.equity)]
-        self.equity.ix["0000-00-00 00:00:00"] = float(self.portfolio_handler.portfolio.equity)
+        equity = self.current_equity()
+        self.recorder.append("0000-00-00 00:00:00", equity)
+        self.policy.start(equity)
 
-    def _update(self, timestamp):
+    @classmethod
+    def from_equity(cls, initial_equity, timestamps, equity):
+        """
+        Builds statistics from an equity curve computed
+        outside of the event loop (see VectorizedBacktest)
+        """
+        portfolio_handler = Munch(portfolio=Munch(equity=initial_equity))
+        statistics = cls(portfolio_handler)
+        statistics.recorder.extend(timestamps, equity)
+        return statistics
+
+    def current_equity(self):
+        return float(self.portfolio_handler.portfolio.equity)
+
+    def _update(self, timestamp, equity=None):
         """
         Update all statistics that must be tracked over time.
         """
-        # Retrieve equity value of Portfolio
-        self.equity.ix[timestamp] = float(self.portfolio_handler.portfolio.equity)
-        current_index = len(self.equity) - 1
-
-        # Calculate percentage return between current and previous equity value.
-        self.equity_returns.ix[timestamp] = (
-            (Decimal(self.equity.ix[current_index]) - Decimal(self.equity.ix[current_index - 1])) /
-            Decimal(self.equity.ix[current_index])
-        ) * 100
-        self.equity_returns.ix[timestamp] = \
-            Decimal(self.equity_returns.ix[timestamp]).quantize(Decimal("0.0001"))
-
-        # Calculate Drawdown.
-        # Note that we have pre-seeded HWM to be starting equity value,
-        # so we don't seed it twice, else we'd add one-too-many values.
-        if(current_index > 0):
-            self.hwm.append(
-                max(self.hwm[current_index - 1], self.equity.ix[timestamp])
-            )
-
-        self.drawdowns.ix[timestamp] = (
-            self.hwm[current_index] - self.equity.ix[timestamp]
-        )
+        if equity is None:
+            equity = self.current_equity()
+        self.recorder.append(timestamp, equity)
+
+    def _series(self, field, start, decimals=None):
+        """
+        Builds (and caches until next update) a Series
+        from recorded values
+        """
+        n = len(self.recorder)
+        try:
+            cached_n, series = self._series_cache[field]
+            if cached_n == n:
+                return series
+        except KeyError:
+            pass
+        series = self.recorder.series(field, start)
+        if decimals is not None:
+            series = series.round(decimals)
+        self._series_cache[field] = (n, series)
+        return series
+
+    @property
+    def equity(self):
+        """
+        Equity (first value is initial equity)
+        """
+        return self._series("equity", 0)
+
+    @property
+    def equity_returns(self):
+        """
+        Percentage returns (rounded to 4 decimals)
+        """
+        return self._series("returns", 1, decimals=4)
+
+    @property
+    def drawdowns(self):
+        return self._series("drawdown", 1)
+
+    @property
+    def hwm(self):
+        return self.recorder.column("hwm").tolist()
 
     def get_results(self):
         """
         Return a dict with all important results & stats.
         """
+        self.flush()
         statistics = OrderedDict()
         statistics["sharpe"] = self.calculate_sharpe()
         statistics["drawdowns"] = self.drawdowns
-        statistics["max_drawdown"] = max(self.drawdowns)
-        statistics["max_drawdown_pct"] = self.calculate_max_drawdown_pct()
+        drawdown = self.policy.drawdown
+        if drawdown is None:
+            statistics["max_drawdown"] = self.drawdowns.max()
+            statistics["max_drawdown_pct"] = self.calculate_max_drawdown_pct()
+        else:
+            # tracked on every event (true max drawdown)
+            statistics["max_drawdown"] = drawdown.max_drawdown
+            statistics["max_drawdown_pct"] = Decimal(drawdown.max_drawdown_pct).quantize(Decimal("0.0001"))
         statistics["equity"] = self.equity
         statistics["equity_returns"] = self.equity_returns
         return statistics
@@ -115,11 +162,14 @@ class SimpleStatistics(Statistics):
         Calculate the percentage drop related to the "worst"
         drawdown seen.
         """
-        bottom_index = self.drawdowns.idxmax()
-        top_index = self.equity[:bottom_index].idxmax()
+        equity = self.recorder.column("equity")
+        drawdowns = self.recorder.column("drawdown")
+        # first row is initial equity (no drawdown recorded)
+        bottom_index = np.argmax(drawdowns[1:]) + 1
+        top_index = np.argmax(equity[:bottom_index + 1])
         pct = (
-            (self.equity.ix[top_index] - self.equity.ix[bottom_index]) /
-            self.equity.ix[top_index] * 100
+            (equity[top_index] - equity[bottom_index]) /
+            equity[top_index] * 100
         )
         return Decimal(pct).quantize(Decimal("0.0001"))
 
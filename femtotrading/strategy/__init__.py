@@ -7,3 +7,4 @@ from .buy_and_hold import BuyAndHoldStrategy
 from .example import ExampleStrategy
 from .moving_average_cross import MovingAverageCrossStrategy
 from .display import DisplayStrategy
+from .moving_average_cross_universe import MovingAverageCrossUniverseStrategy
@@ -3,6 +3,8 @@
 from abc import ABCMeta  # , abstractmethod
 from munch import Munch
 
+from ..event_log import DISABLED
+
 
 class StrategyParameters(Munch):
     pass
@@ -25,10 +27,13 @@ class AbstractStrategy(object):
 
     default_params = StrategyParameters()
 
+    event_log = DISABLED  # set by trading session
+
     def __init__(self, events_queue, tickers, **params):
         self.events_queue = events_queue
         self.tickers = tickers
-        self.params = self.default_params
+        # copy (default_params is shared by all instances)
+        self.params = StrategyParameters(self.default_params)
         # overwrite default_params using keyword arguments params
         for key in params.keys():
             self.params[key] = params[key]
@@ -75,6 +80,19 @@ class AbstractStrategy(object):
         """
         print("%s.on_deinit" % (self.__class__.__name__))
 
+    def vectorized_signals(self, bars):
+        """
+        Signals of the strategy over whole bar arrays
+        (used by VectorizedBacktest)
+
+        bars is a DataFrame of bars of first ticker
+        (columns open, high, low, close, adj_close, volume)
+
+        Returns an array with one signal per bar:
+        1 (BOT), -1 (SLD) or 0 (no signal)
+        """
+        raise NotImplementedError("Should implement vectorized_signals()")
+
 
 class Strategies(AbstractStrategy):
     """
@@ -83,6 +101,9 @@ class Strategies(AbstractStrategy):
     def __init__(self, *strategies):
         self._lst_strategies = strategies
 
+    def __iter__(self):
+        return iter(self._lst_strategies)
+
     def on_init(self):
         for strategy in self._lst_strategies:
             strategy.on_init()
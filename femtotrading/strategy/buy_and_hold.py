@@ -1,5 +1,7 @@
 #!/usr/bin/env/python
 
+import numpy as np
+
 from .base import AbstractStrategy
 from ..event import SignalEvent
 
@@ -23,3 +25,9 @@ class BuyAndHoldStrategy(AbstractStrategy):
                 self.events_queue.enqueue(signal)
                 self.invested = True
             self.ticks += 1
+
+    def vectorized_signals(self, bars):
+        signals = np.zeros(len(bars), dtype=np.int8)
+        if len(bars) > 0:
+            signals[0] = 1
+        return signals
@@ -1,11 +1,11 @@
 #!/usr/bin/env/python
 
-from collections import deque
-
 import numpy as np
 
 from .base import AbstractStrategy, StrategyParameters
 from ..event import SignalEvent
+from ..event_log import INFO
+from ..indicators import Indicators, SMA
 
 
 class MovingAverageCrossStrategy(AbstractStrategy):
@@ -22,38 +22,64 @@ class MovingAverageCrossStrategy(AbstractStrategy):
 
     def on_init(self):
         super(MovingAverageCrossStrategy, self).on_init()
-        self.short_window = self.default_params.short_window
-        self.long_window = self.default_params.long_window
+        self.short_window = self.params.short_window
+        self.long_window = self.params.long_window
         self.bars = 0
         self.invested = False
-        self.sw_bars = deque(maxlen=self.short_window)
-        self.lw_bars = deque(maxlen=self.long_window)
+        self.indicators = Indicators(self.tickers)
+        self.indicators.register("short_sma", lambda: SMA(self.short_window), "adj_close")
+        self.indicators.register("long_sma", lambda: SMA(self.long_window), "adj_close")
 
     def on_bar(self, event):
         # TODO: Only applies SMA to first ticker
         ticker = self.tickers[0]
 
-        if event.have(ticker):
-            # Add latest adjusted closing price to the
-            # short and long window bars
-            self.lw_bars.append(event[ticker].adj_close)
-            if self.bars > self.long_window - self.short_window:
-                self.sw_bars.append(event[ticker].adj_close)
+        # Update moving averages with latest adjusted closing price
+        self.indicators.update(event)
 
+        if event.have(ticker):
             # Enough bars are present for trading
             if self.bars > self.long_window:
-                # Calculate the simple moving averages
-                short_sma = np.mean(self.sw_bars)
-                long_sma = np.mean(self.lw_bars)
+                short_sma = self.indicators[ticker].short_sma.value
+                long_sma = self.indicators[ticker].long_sma.value
                 # Trading signals based on moving average cross
                 if short_sma > long_sma and not self.invested:
-                    print("LONG: %s" % event.time)
+                    if self.event_log.enabled(INFO):
+                        self.event_log.log(INFO, "LONG", time=event.time, ticker=ticker)
                     signal = SignalEvent(ticker, "BOT")
                     self.events_queue.enqueue(signal)
                     self.invested = True
                 elif short_sma < long_sma and self.invested:
-                    print("SHORT: %s" % event.time)
+                    if self.event_log.enabled(INFO):
+                        self.event_log.log(INFO, "SHORT", time=event.time, ticker=ticker)
                     signal = SignalEvent(ticker, "SLD")
                     self.events_queue.enqueue(signal)
                     self.invested = False
             self.bars += 1
+
+    def vectorized_signals(self, bars):
+        short_window = self.params.short_window
+        long_window = self.params.long_window
+        n = len(bars)
+        signals = np.zeros(n, dtype=np.int8)
+        start = long_window + 1  # first bar with trading
+        if n <= start:
+            return signals
+        # prices as integers (1e-5 units) so that moving averages
+        # are compared exactly (as with Decimal prices)
+        prices = np.rint(np.asarray(bars["adj_close"], dtype=float) * 100000).astype(np.int64)
+        cumsum = np.concatenate([[0], np.cumsum(prices)])
+        stop = np.arange(start, n) + 1
+        short_sum = cumsum[stop] - cumsum[stop - short_window]
+        long_sum = cumsum[stop] - cumsum[stop - long_window]
+        # short_sma - long_sma
+        cross = short_sum * long_window - long_sum * short_window
+
+        # invested (1) or not (0), unchanged (-1) when both averages are equal
+        state = np.zeros(n, dtype=np.int64)
+        state[start:] = np.where(cross > 0, 1, np.where(cross < 0, 0, -1))
+        # forward fill unchanged states
+        idx = np.where(state >= 0, np.arange(n), 0)
+        state = state[np.maximum.accumulate(idx)]
+        signals[:] = np.diff(np.concatenate([[0], state]))
+        return signals
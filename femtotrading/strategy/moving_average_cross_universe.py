@@ -0,0 +1,97 @@
+#!/usr/bin/env/python
+
+import numpy as np
+
+from .base import AbstractStrategy, StrategyParameters
+from ..event import SignalEvent
+from ..event_log import INFO
+
+
+PRICE_UNITS = 100000  # prices are stored as integers (1e-5 units)
+
+
+class MovingAverageCrossUniverseStrategy(AbstractStrategy):
+    """
+    Moving average cross strategy applied to every ticker of
+    a universe (same rules as MovingAverageCrossStrategy for
+    each ticker)
+
+    Window state of all tickers is kept in a 2-D ring buffer
+    (one row per ticker, long_window columns) with running
+    sums of short and long windows. Every ticker of a BarEvent
+    is updated in one vectorized step and signals are only
+    emitted for crossings.
+
+    Prices are stored as integers (1e-5 units) so that moving
+    averages are compared exactly (as with Decimal prices).
+
+    Requires:
+    short_window - Lookback period for short moving average
+    long_window - Lookback period for long moving average
+    """
+
+    default_params = StrategyParameters({
+        'short_window': 100,
+        'long_window': 400
+    })
+
+    def on_init(self):
+        super(MovingAverageCrossUniverseStrategy, self).on_init()
+        self.short_window = self.params.short_window
+        self.long_window = self.params.long_window
+        if self.short_window > self.long_window:
+            raise ValueError("short_window must be lower than long_window")
+        n = len(self.tickers)
+        self._index = dict((ticker, i) for i, ticker in enumerate(self.tickers))
+        self.prices = np.zeros((n, self.long_window), dtype=np.int64)  # ring buffer
+        self.head = np.zeros(n, dtype=np.int64)  # next column of each row
+        self.short_sum = np.zeros(n, dtype=np.int64)
+        self.long_sum = np.zeros(n, dtype=np.int64)
+        self.bars = np.zeros(n, dtype=np.int64)
+        self.invested = np.zeros(n, dtype=bool)
+
+    def _update(self, rows, prices):
+        """
+        Appends one price to rows of the ring buffer and
+        returns (short_sma - long_sma) * short_window * long_window
+        of these rows
+        """
+        head = self.head[rows]
+        leaving_long = self.prices[rows, head]
+        leaving_short = self.prices[rows, (head - self.short_window) % self.long_window]
+        self.short_sum[rows] += prices - leaving_short
+        self.long_sum[rows] += prices - leaving_long
+        self.prices[rows, head] = prices
+        self.head[rows] = (head + 1) % self.long_window
+        return self.short_sum[rows] * self.long_window - self.long_sum[rows] * self.short_window
+
+    def on_bar(self, event):
+        tickers = [ticker for ticker in event.tickers if ticker in self._index]
+        if not tickers:
+            return
+        rows = np.array([self._index[ticker] for ticker in tickers])
+        prices = np.array([
+            int(round(event[ticker].adj_close * PRICE_UNITS)) for ticker in tickers
+        ], dtype=np.int64)
+
+        cross = self._update(rows, prices)
+
+        # Enough bars are present for trading
+        ready = self.bars[rows] > self.long_window
+        self.bars[rows] += 1
+        invested = self.invested[rows]
+        buy = ready & (cross > 0) & ~invested
+        sell = ready & (cross < 0) & invested
+        log = self.event_log.enabled(INFO)
+        for k in np.flatnonzero(buy | sell):
+            ticker = tickers[k]
+            if buy[k]:
+                if log:
+                    self.event_log.log(INFO, "LONG", time=event.time, ticker=ticker)
+                self.events_queue.enqueue(SignalEvent(ticker, "BOT"))
+            else:
+                if log:
+                    self.event_log.log(INFO, "SHORT", time=event.time, ticker=ticker)
+                self.events_queue.enqueue(SignalEvent(ticker, "SLD"))
+        self.invested[rows[buy]] = True
+        self.invested[rows[sell]] = False
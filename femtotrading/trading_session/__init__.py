@@ -4,3 +4,5 @@
 from .backtest import Backtest
 from .papertrade import PaperTrade
 from .live import Live
+from .sweep import parameter_grid, run_sweep
+from .vectorized import VectorizedBacktest
@@ -4,9 +4,7 @@ import time
 
 from .base import TradingSession
 
-from ..event import (TickEvent, BarEvent, SignalEvent, OrderEvent, FillEvent)
 from ..debug import ensure_dt_increasing
-from ..compat import queue
 
 
 class Backtest(TradingSession):
@@ -22,8 +20,15 @@ class Backtest(TradingSession):
         loop will then pause for "heartbeat" seconds and
         continue until the maximum number of iterations is
         exceeded.
+
+        Events are routed with the dispatch table built by
+        _on_init (only handlers doing work are called).
         """
-        for iters, event in enumerate(self.data_handler):
+        heartbeat = self.heartbeat
+        data_handler = self.data_handler
+        if self.profiler is not None:
+            data_handler = self.profiler.iterate(data_handler)
+        for iters, event in enumerate(data_handler):
             self.iters = iters  # for loop
             if iters >= self.max_iters:
                 break
@@ -33,40 +38,20 @@ class Backtest(TradingSession):
             # asserts for debug
             assert ensure_dt_increasing(self.cur_time, self.prev_time)
 
-            if isinstance(event, TickEvent):
-                self.strategies.on_tick(event)
-                self.portfolio_handler.on_tick(event)
-                self.statistics.on_tick(event)
-                self.ticks += 1
-
-            elif isinstance(event, BarEvent):
-                self.strategies.on_bar(event)
-                self.portfolio_handler.on_bar(event)
-                self.statistics.on_bar(event)
-                self.bars += 1
-
-            while True:  # len(self.events_queue) > 0:
-                try:
-                    event = self.events_queue.dequeue()
+            handlers = self._handlers(event)
+            if handlers is not None:
+                for handler in handlers:
+                    handler(event)
 
-                    if isinstance(event, SignalEvent):
-                        print("%s" % event)
-                        self.strategies.on_signal(event)
-                        self.portfolio_handler.on_signal(event)
-                    elif isinstance(event, OrderEvent):
-                        print("%s" % event)
-                        self.strategies.on_order(event)
-                        self.execution_handler.on_order(event)
-                    elif isinstance(event, FillEvent):
-                        print("%s" % event)
-                        self.strategies.on_fill(event)
-                        self.portfolio_handler.on_fill(event)
-                    else:
-                        raise NotImplemented("Unsupported event.type '%s'" % event.type)
-                except queue.Empty:
-                    break
+            for event in self.events_queue.drain():
+                handlers = self._handlers(event)
+                if handlers is None:
+                    raise NotImplementedError("Unsupported event.type '%s'" % event.typename)
+                for handler in handlers:
+                    handler(event)
 
-            time.sleep(self.heartbeat)
+            if heartbeat:
+                time.sleep(heartbeat)
             self.prev_time = self.cur_time
             # self.iters += 1  # while loop
 
@@ -1,8 +1,74 @@
 #!/usr/bin/env/python
 
+from ..event import (EventsQueue, TickEvent, BarEvent, SignalEvent, OrderEvent, FillEvent)
+from ..event_log import DISABLED, INFO
+from ..profiling import SessionProfiler
+from ..statistics.base import Statistics
+from ..statistics.policy import CollectionPolicy
+from ..strategy.base import AbstractStrategy, Strategies
 from ..utils import EPOCH
 
 
+def _function(cls, name):
+    method = getattr(cls, name)
+    return getattr(method, "__func__", method)
+
+
+def iter_strategies(strategy):
+    """
+    Yields strategies (strategies of a Strategies collection
+    are flattened; the collection itself is also yielded)
+    """
+    if isinstance(strategy, Strategies):
+        yield strategy
+        for s in strategy:
+            for child in iter_strategies(s):
+                yield child
+    else:
+        yield strategy
+
+
+def strategy_handlers(strategy, name):
+    """
+    Returns bound methods of strategy (or of each strategy of
+    a Strategies collection) handling an event (name is
+    "on_tick", "on_bar"...). Methods which are not overridden
+    (no-op defaults of AbstractStrategy) are left out.
+
+    A Strategies collection is flattened unless its class
+    overrides the handler (its bound method is kept).
+    """
+    if isinstance(strategy, Strategies) and _function(type(strategy), name) is _function(Strategies, name):
+        handlers = []
+        for s in strategy:
+            handlers.extend(strategy_handlers(s, name))
+        return handlers
+    if isinstance(strategy, AbstractStrategy) and _function(type(strategy), name) is _function(AbstractStrategy, name):
+        return []
+    return [getattr(strategy, name)]
+
+
+# Statistics hook => no-op method of CollectionPolicy it delegates to
+# (on_tick / on_bar delegate to on_market_event which is required)
+_POLICY_METHODS = {
+    "on_fill": "on_fill",
+}
+
+
+def statistics_handlers(statistics, name):
+    """
+    Returns [bound method] of statistics handling an event
+    (name is "on_tick", "on_bar"...) or [] when it only
+    delegates to a no-op default of CollectionPolicy
+    """
+    method = _POLICY_METHODS.get(name)
+    if method is not None and isinstance(statistics, Statistics) \
+            and _function(type(statistics), name) is _function(Statistics, name) \
+            and _function(type(statistics.policy), method) is _function(CollectionPolicy, method):
+        return []
+    return [getattr(statistics, name)]
+
+
 class TradingSession(object):
     """
     Encapsulates the settings and components for
@@ -14,14 +80,22 @@ class TradingSession(object):
         execution_handler,
         position_sizer, risk_manager,
         statistics,
-        heartbeat=0.0, max_iters=10000000000
+        heartbeat=0.0, max_iters=10000000000,
+        event_log=None
     ):
         """
         Set up the backtest variables according to
         what has been passed in.
+
+        event_log (optional) is an EventLog (see event_log)
+        receiving Signal, Order and Fill events (at INFO level)
+        and records of strategies. Logging is disabled by default.
         """
 
         self.events_queue = events_queue  # data_handler.events_queue
+        if isinstance(events_queue, EventsQueue):
+            # no lock needed for a single-threaded backtest
+            events_queue.set_threadsafe(not self.isbacktest)
 
         self.tickers = tickers
         self.data_handler = data_handler
@@ -36,14 +110,30 @@ class TradingSession(object):
         self.heartbeat = heartbeat
         self.max_iters = max_iters
 
+        if event_log is None:
+            event_log = DISABLED
+        self.event_log = event_log
+
         self.cur_time = None
 
         self.equity = portfolio_handler.initial_cash
 
         self.testing = False
+        self.profiler = None
+
+    def run(self, testing=False, profile=None):
+        """
+        Runs session and returns results (of statistics)
 
-    def run(self, testing=False):
+        profile=True (or a SessionProfiler) times data iterator
+        and every handler; breakdown is printed (and exported
+        as JSON if profiler has a json_path) at the end of the
+        session and kept as session.profiler
+        """
         self.testing = testing
+        if profile is True:
+            profile = SessionProfiler()
+        self.profiler = profile or None
         results = self._run()
         return results
         # duration = timeit.timeit(self._run, number=1)
@@ -51,10 +141,15 @@ class TradingSession(object):
 
     def _run(self):
         self._on_init()
+        if self.profiler is not None:
+            self.profiler.start()
         try:
             self._loop()
         except KeyboardInterrupt:
             print("%s halt by KeyboardInterrupt" % self.typename)
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
         return self._on_deinit()
 
     def _on_init(self):
@@ -63,12 +158,83 @@ class TradingSession(object):
         self.ticks = 0
         self.bars = 0
         self.prev_time = EPOCH  # previous data event time
+        if getattr(self.data_handler, "event_log", DISABLED) is DISABLED:
+            # unless data handler has its own EventLog
+            self.data_handler.event_log = self.event_log
         self.data_handler.on_init()
+        for strategy in iter_strategies(self.strategies):
+            strategy.event_log = self.event_log
         self.strategies.on_init()
+        self._build_dispatch_table()
+
+    def _build_dispatch_table(self):
+        """
+        Maps event class to the list of (bound) handlers
+        called for this event (in this order)
+        """
+        if self.event_log.enabled(INFO):
+            log = [self._log_event]
+        else:
+            log = []
+        self._dispatch_table = {
+            TickEvent: strategy_handlers(self.strategies, "on_tick") + [
+                self.portfolio_handler.on_tick,
+            ] + statistics_handlers(self.statistics, "on_tick") + [
+                self._count_tick,
+            ],
+            BarEvent: strategy_handlers(self.strategies, "on_bar") + [
+                self.portfolio_handler.on_bar,
+            ] + statistics_handlers(self.statistics, "on_bar") + [
+                self._count_bar,
+            ],
+            SignalEvent: log + strategy_handlers(self.strategies, "on_signal") + [
+                self.portfolio_handler.on_signal,
+            ],
+            OrderEvent: log + strategy_handlers(self.strategies, "on_order") + [
+                self.execution_handler.on_order,
+            ],
+            FillEvent: log + strategy_handlers(self.strategies, "on_fill") + [
+                self.portfolio_handler.on_fill,
+            ] + statistics_handlers(self.statistics, "on_fill"),
+        }
+        if self.profiler is not None:
+            self._dispatch_table = dict(
+                (event_class, [self.profiler.dispatcher(event_class, handlers)])
+                for event_class, handlers in self._dispatch_table.items()
+            )
+
+    def _handlers(self, event):
+        """
+        Returns handlers of an event (handlers of a subclass of
+        an event class are resolved once) or None if event
+        class is not supported
+        """
+        event_class = type(event)
+        try:
+            return self._dispatch_table[event_class]
+        except KeyError:
+            for cls in event_class.__mro__[1:]:
+                if cls in self._dispatch_table:
+                    handlers = self._dispatch_table[cls]
+                    self._dispatch_table[event_class] = handlers
+                    return handlers
+            return None
+
+    def _count_tick(self, event):
+        self.ticks += 1
+
+    def _count_bar(self, event):
+        self.bars += 1
+
+    def _log_event(self, event):
+        self.event_log.log_event(INFO, event)
 
     def _on_deinit(self):
         print("End of %s..." % self.typename)
         self.strategies.on_deinit()
+        self.event_log.flush()
+        if self.profiler is not None:
+            self.profiler.report()
         results = self.statistics.get_results()
         print("Backtest complete.")
         print("Sharpe Ratio: %s" % results["sharpe"])
@@ -0,0 +1,104 @@
+#!/usr/bin/env/python
+
+"""
+Parameter sweep
+
+Runs one backtest per set of strategy parameters,
+in parallel over a pool of processes.
+
+Price data are loaded once per worker process (data_loader)
+and passed to session_factory which builds a TradingSession
+for a strategy class and its parameters.
+
+Both data_loader and session_factory are sent to worker
+processes so they must be picklable (module level functions
+or functools.partial of module level functions).
+
+> def load(): return load_yahoo_daily_csv(csv_dir, tickers)
+> def make_session(strategy_class, params, data): ... return Backtest(...)
+> grid = parameter_grid({"short_window": [50, 100], "long_window": [200, 400]})
+> df_results = run_sweep(MovingAverageCrossStrategy, grid, make_session, load)
+"""
+
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ..strategy.base import StrategyParameters
+
+
+METRICS = ["sharpe", "max_drawdown", "max_drawdown_pct"]
+
+_worker_data = None  # data loaded by each worker process
+
+
+def parameter_grid(param_values, constraint=None):
+    """
+    Returns a list of StrategyParameters with every
+    combination of values
+
+    param_values is a dict name=>list of values
+    constraint (optional) is a function params=>bool to
+    filter combinations (e.g. short_window < long_window)
+    """
+    names = list(param_values.keys())
+    grid = []
+    for values in itertools.product(*[param_values[name] for name in names]):
+        params = StrategyParameters(zip(names, values))
+        if constraint is None or constraint(params):
+            grid.append(params)
+    return grid
+
+
+def _init_worker(data_loader):
+    global _worker_data
+    if data_loader is None:
+        _worker_data = None
+    else:
+        _worker_data = data_loader()
+
+
+def _run_backtest(strategy_class, params, session_factory):
+    """
+    Runs a backtest in a worker process and returns
+    its scalar results
+    """
+    session = session_factory(strategy_class, params, _worker_data)
+    results = session.run(testing=True)
+    row = OrderedDict(params)
+    for metric in METRICS:
+        row[metric] = float(results[metric])
+    row["final_equity"] = float(results["equity"].iloc[-1])
+    return row
+
+
+def run_sweep(strategy_class, grid, session_factory, data_loader=None, max_workers=None):
+    """
+    Runs a backtest of strategy_class for each StrategyParameters
+    of grid.
+
+    session_factory(strategy_class, params, data) returns
+    a TradingSession, data is what data_loader() returns
+    (called once per worker process).
+
+    max_workers=1 runs backtests in current process.
+
+    Returns a DataFrame with one row per set of parameters
+    (parameters, sharpe, max_drawdown, max_drawdown_pct,
+    final_equity)
+    """
+    if max_workers == 1:
+        _init_worker(data_loader)
+        rows = [_run_backtest(strategy_class, params, session_factory) for params in grid]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(data_loader, )
+        ) as executor:
+            futures = [
+                executor.submit(_run_backtest, strategy_class, params, session_factory)
+                for params in grid
+            ]
+            rows = [future.result() for future in futures]
+    return pd.DataFrame(rows)
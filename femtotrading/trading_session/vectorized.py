@@ -0,0 +1,206 @@
+#!/usr/bin/env/python
+
+"""
+Vectorized backtest of bar strategies
+
+Instead of dispatching every bar to every component, a
+strategy computes its signals over whole bar arrays
+(AbstractStrategy.vectorized_signals) and fills, cash,
+positions and equity are computed with NumPy.
+
+Rules are the same as the event-driven Backtest with
+FixedQuantityPositionSizer and IBSimulatedExecutionHandler:
+
+- each signal trades a fixed quantity of shares
+- orders are filled at close of the signal bar with
+  IB commission
+- equity of a bar is recorded before fills of this bar
+  (fills are seen by equity of next bar)
+
+Fills (a few compared to the number of bars) are replayed
+through a Decimal Position so that cash is the one of the
+Portfolio; market value of every bar is computed with
+float64 arrays. Results are the SimpleStatistics results
+dict.
+
+> backtest = VectorizedBacktest(tickers, tickers_data, MovingAverageCrossStrategy,
+                                params={"short_window": 50})
+> results = backtest.run()
+"""
+
+import decimal
+
+import numpy as np
+import pandas as pd
+
+from ..data import PLACES
+from ..exceptions import CrossCheckError
+from ..execution_handler import IBSimulatedExecutionHandler
+from ..position import Position
+from ..position_sizer import FixedQuantityPositionSizer
+from ..statistics import SimpleStatistics
+
+
+# Yahoo daily CSV columns => bar fields (as in BarEvent)
+FIELDS = [
+    ("Open", "open"), ("High", "high"), ("Low", "low"),
+    ("Close", "close"), ("Adj Close", "adj_close"), ("Volume", "volume")
+]
+
+
+def quantize_prices(values, places=PLACES[5]):
+    """
+    Rounds prices as data iterators do (Decimal,
+    ROUND_HALF_DOWN) and returns them as float64
+    """
+    return np.array([
+        float(decimal.Decimal(str(value)).quantize(places, rounding=decimal.ROUND_HALF_DOWN))
+        for value in values
+    ])
+
+
+def round_half_down(values, decimals=2):
+    """
+    Rounds amounts (at most 5 decimals) as Decimal quantize
+    with ROUND_HALF_DOWN (as Portfolio does)
+    """
+    scale = 10 ** decimals
+    # remove float noise (amounts have at most 5 decimals)
+    scaled = np.round(np.abs(values) * scale, 5 - decimals)
+    return np.sign(values) * np.ceil(scaled - 0.5) / scale
+
+
+def prepare_bars(df):
+    """
+    Returns a DataFrame of bars (columns open, high, low,
+    close, adj_close, volume) with prices rounded as by
+    YahooDailyCSVBarIterator
+    """
+    bars = pd.DataFrame(index=df.index)
+    for column, field in FIELDS:
+        if field == "volume":
+            bars[field] = df[column].values.astype(np.int64)
+        else:
+            bars[field] = quantize_prices(df[column].tolist())
+    return bars
+
+
+class VectorizedBacktest(object):
+    """
+    Vectorized backtest of a bar strategy on its first ticker
+
+    tickers_data is a dict ticker=>DataFrame of Yahoo daily
+    data (see load_yahoo_daily_csv)
+    """
+    def __init__(
+        self, tickers, tickers_data, strategy_class, params=None,
+        initial_cash=decimal.Decimal("500000.00"),
+        position_sizer=None, execution_handler=None
+    ):
+        if len(tickers) != 1:
+            raise NotImplementedError("VectorizedBacktest only supports one ticker")
+        self.tickers = tickers
+        self.ticker = tickers[0]
+        if params is None:
+            params = {}
+        self.strategy = strategy_class(None, tickers, **params)
+        self.initial_cash = initial_cash
+        if position_sizer is None:
+            position_sizer = FixedQuantityPositionSizer(100)
+        if not isinstance(position_sizer, FixedQuantityPositionSizer):
+            raise NotImplementedError("Only FixedQuantityPositionSizer is supported")
+        self.position_sizer = position_sizer
+        if execution_handler is None:
+            execution_handler = IBSimulatedExecutionHandler(None, None)
+        if not isinstance(execution_handler, IBSimulatedExecutionHandler):
+            raise NotImplementedError("Only IBSimulatedExecutionHandler is supported")
+        self.execution_handler = execution_handler
+        self.bars = prepare_bars(tickers_data[self.ticker])
+        self.equity = None
+        self.statistics = None
+
+    def _net_incl_comm(self, signals):
+        """
+        Replays fills of signals through a Position and returns
+        net total (including commission) after each bar
+        """
+        close = self.bars["close"].values
+        quantity = self.position_sizer.default_quantity
+        commission = self.execution_handler.calculate_ib_commission()
+        net_incl_comm = np.zeros(len(close))
+        position = None
+        with decimal.localcontext() as context:
+            # rounding of data iterators and Portfolio
+            context.rounding = decimal.ROUND_HALF_DOWN
+            for i in np.flatnonzero(signals):
+                action = "BOT" if signals[i] > 0 else "SLD"
+                price = decimal.Decimal(str(close[i]))
+                if position is None:
+                    position = Position(
+                        action, self.ticker, quantity,
+                        price, commission, price, price
+                    )
+                else:
+                    position.transact_shares(action, quantity, price, commission)
+                net_incl_comm[i:] = float(position.net_incl_comm)
+        return net_incl_comm
+
+    def _equity(self, signals):
+        """
+        Returns equity (as recorded by statistics at each bar)
+        and position after fills of each bar
+        """
+        close = self.bars["close"].values
+        position = np.cumsum(signals.astype(np.int64) * self.position_sizer.default_quantity)
+        net_incl_comm = self._net_incl_comm(signals)
+        equity = np.empty(len(close))
+        if len(close) > 0:
+            equity[0] = float(self.initial_cash)
+            market_value = round_half_down(position[:-1] * close[1:])
+            equity[1:] = float(self.initial_cash) + net_incl_comm[:-1] + market_value
+        return equity, position
+
+    def run(self, testing=True):
+        """
+        Returns results dict (as SimpleStatistics.get_results)
+        """
+        signals = np.asarray(self.strategy.vectorized_signals(self.bars))
+        self.signals = pd.Series(signals, index=self.bars.index)
+        equity, position = self._equity(signals)
+        self.positions = pd.Series(position, index=self.bars.index)
+        self.equity = pd.Series(equity, index=self.bars.index)
+        self.statistics = SimpleStatistics.from_equity(
+            self.initial_cash, self.bars.index.tolist(), equity)
+        results = self.statistics.get_results()
+        if not testing:
+            self.statistics.plot_results()
+        return results
+
+    def cross_check(self, backtest, tolerance=0.01):
+        """
+        Runs event-driven backtest (same strategy, data and
+        parameters) and this vectorized backtest and compares
+        equity curves.
+
+        Returns a DataFrame (event_driven, vectorized, diff)
+        Raises CrossCheckError if equity differs by more than
+        tolerance.
+        """
+        results = backtest.run(testing=True)
+        if self.equity is None:
+            self.run()
+        expected = results["equity"].iloc[1:].astype(float)  # without initial equity
+        if len(expected) != len(self.equity):
+            raise CrossCheckError(
+                "Equity curves have different lengths (%d, %d)" % (len(expected), len(self.equity)))
+        df = pd.DataFrame({
+            "event_driven": expected.values,
+            "vectorized": self.equity.values
+        }, index=self.equity.index)
+        df["diff"] = df["vectorized"] - df["event_driven"]
+        max_diff = df["diff"].abs().max()
+        if max_diff > tolerance:
+            first = df.index[(df["diff"].abs() > tolerance).values][0]
+            raise CrossCheckError(
+                "Equity curves differ by %s (> %s) first at %s" % (max_diff, tolerance, first))
+        return df
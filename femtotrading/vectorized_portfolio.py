@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+
+"""
+Array-backed portfolio
+
+Positions are stored in NumPy arrays indexed by ticker id
+instead of a dict of Position objects, so the whole book
+is revalued with one array expression per market event.
+
+Arithmetic is the same as FloatPosition (float64, rounded
+when shares are transacted).
+"""
+
+import numpy as np
+
+
+BOT = 1
+SLD = -1
+
+
+class VectorizedPortfolio(object):
+    """
+    Same interface as Portfolio (transact_position,
+    update_market_value, create_portfolio_state_dict, cash,
+    equity and PnL attributes) for thousands of simultaneous
+    positions.
+
+    > portfolio = VectorizedPortfolio(price_handler, cash, tickers)
+    > portfolio_handler = PortfolioHandler(..., portfolio=portfolio)
+    """
+
+    FIELDS = [
+        "action", "quantity", "buys", "sells",
+        "avg_bot", "avg_sld", "total_bot", "total_sld",
+        "total_commission", "avg_price", "cost_basis",
+        "net_incl_comm", "mid", "market_value",
+        "unrealised_pnl", "realised_pnl"
+    ]
+
+    def __init__(self, price_handler, cash, tickers=None, capacity=64):
+        """
+        tickers (optional) are given an id in advance,
+        others get one on their first transaction
+        """
+        self.price_handler = price_handler
+        self.init_cash = float(cash)
+        self.ticker_ids = {}  # ticker=>id
+        self.tickers = []
+        if tickers is not None:
+            capacity = max(capacity, len(tickers))
+        self.arrays = {}
+        for field in self.FIELDS:
+            self.arrays[field] = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        if tickers is not None:
+            for ticker in tickers:
+                self._ticker_id(ticker)
+        self._reset_values()
+
+    def _reset_values(self):
+        self.cur_cash = self.init_cash
+        self.equity = self.cur_cash
+        self.unrealised_pnl = 0.0
+        self.realised_pnl = 0.0
+
+    def _ticker_id(self, ticker):
+        """
+        Returns id of a ticker (allocating one if needed)
+        """
+        try:
+            return self.ticker_ids[ticker]
+        except KeyError:
+            i = len(self.tickers)
+            capacity = len(self.active)
+            if i >= capacity:
+                for field in self.FIELDS:
+                    self.arrays[field] = np.concatenate([self.arrays[field], np.zeros(capacity)])
+                self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+            self.ticker_ids[ticker] = i
+            self.tickers.append(ticker)
+            return i
+
+    def _update_mid(self, ticker, i):
+        if self.price_handler.is_tick():
+            bid, ask = self.price_handler.get_best_bid_ask(ticker)
+            self.arrays["mid"][i] = (float(bid) + float(ask)) / 2.0
+        else:
+            self.arrays["mid"][i] = float(self.price_handler.get_last_close(ticker))
+
+    def _update_portfolio(self):
+        """
+        Revalues all positions (array expressions) and
+        updates Portfolio total values
+        """
+        a = self.arrays
+        np.multiply(a["quantity"], a["mid"], out=a["market_value"])
+        np.subtract(a["market_value"], a["cost_basis"], out=a["unrealised_pnl"])
+        np.add(a["market_value"], a["net_incl_comm"], out=a["realised_pnl"])
+        unrealised_pnl = a["unrealised_pnl"].sum()
+        realised_pnl = a["realised_pnl"].sum()
+        cost_basis = a["cost_basis"].sum()
+        market_value = a["market_value"].sum()
+        pnl_diff = realised_pnl - unrealised_pnl
+        self.unrealised_pnl = float(unrealised_pnl)
+        self.realised_pnl = float(realised_pnl)
+        self.cur_cash = float(self.init_cash - cost_basis + pnl_diff)
+        self.equity = float(self.init_cash + market_value - cost_basis + pnl_diff)
+
+    def update_market_value(self, tickers):
+        """
+        Updates prices of tickers of a market event then
+        revalues the whole book
+        """
+        ticker_ids = self.ticker_ids
+        for ticker in tickers:
+            i = ticker_ids.get(ticker)
+            if i is not None and self.active[i]:
+                self._update_mid(ticker, i)
+        self._update_portfolio()
+
+    def _open_position(self, i, action, quantity, price, commission):
+        """
+        See FloatPosition._calculate_initial_value
+        """
+        a = self.arrays
+        a["action"][i] = BOT if action == "BOT" else SLD
+        a["quantity"][i] = quantity
+        a["total_commission"][i] = commission
+        if action == "BOT":
+            a["buys"][i] = quantity
+            a["avg_bot"][i] = round(price, 5)
+            a["total_bot"][i] = round(quantity * a["avg_bot"][i], 2)
+            a["avg_price"][i] = round((price * quantity + commission) / quantity, 5)
+            a["cost_basis"][i] = round(quantity * a["avg_price"][i], 2)
+        else:
+            a["sells"][i] = quantity
+            a["avg_sld"][i] = round(price, 5)
+            a["total_sld"][i] = round(quantity * a["avg_sld"][i], 2)
+            a["avg_price"][i] = round((price * quantity - commission) / quantity, 5)
+            a["cost_basis"][i] = round(-quantity * a["avg_price"][i], 2)
+        net_total = round(a["total_sld"][i] - a["total_bot"][i], 2)
+        a["net_incl_comm"][i] = round(net_total - commission, 2)
+        self.active[i] = True
+
+    def _transact_shares(self, i, action, quantity, price, commission):
+        """
+        See FloatPosition.transact_shares
+        """
+        a = self.arrays
+        a["total_commission"][i] += commission
+        buys = a["buys"][i]
+        sells = a["sells"][i]
+        if action == "BOT":
+            a["avg_bot"][i] = round((a["avg_bot"][i] * buys + price * quantity) / (buys + quantity), 5)
+            if a["action"][i] != SLD:
+                a["avg_price"][i] = round(
+                    (a["avg_price"][i] * buys + price * quantity + commission) / (buys + quantity), 5
+                )
+            buys += quantity
+            a["buys"][i] = buys
+            a["total_bot"][i] = round(buys * a["avg_bot"][i], 2)
+        else:
+            a["avg_sld"][i] = round((a["avg_sld"][i] * sells + price * quantity) / (sells + quantity), 5)
+            if a["action"][i] != BOT:
+                a["avg_price"][i] = round(
+                    (a["avg_price"][i] * sells + price * quantity - commission) / (sells + quantity), 5
+                )
+            sells += quantity
+            a["sells"][i] = sells
+            a["total_sld"][i] = round(sells * a["avg_sld"][i], 2)
+        a["quantity"][i] = buys - sells
+        net_total = round(a["total_sld"][i] - a["total_bot"][i], 2)
+        a["net_incl_comm"][i] = round(net_total - a["total_commission"][i], 2)
+        a["cost_basis"][i] = round(a["quantity"][i] * a["avg_price"][i], 2)
+
+    def transact_position(
+        self, action, ticker,
+        quantity, price, commission
+    ):
+        """
+        Handles any new position or modification to
+        a current position then revalues the book.
+        """
+        i = self._ticker_id(ticker)
+        price = float(price)
+        commission = float(commission)
+        if not self.active[i]:
+            self._open_position(i, action, quantity, price, commission)
+        else:
+            self._transact_shares(i, action, quantity, price, commission)
+        self._update_mid(ticker, i)
+        self._update_portfolio()
+
+    def create_portfolio_state_dict(self):
+        """
+        Creates a dictionary containing the best estimated
+        market value of all positions within the Portfolio,
+        along with the cash and equity amount.
+        """
+        self._update_portfolio()
+        state_dict = {
+            "cash": self.cur_cash,
+            "equity": self.equity
+        }
+        market_value = self.arrays["market_value"]
+        for ticker, i in self.ticker_ids.items():
+            if self.active[i]:
+                state_dict[ticker] = float(market_value[i])
+        return state_dict
@@ -91,6 +91,7 @@ setup(
     extras_require = {
         'dev': ['check-manifest', 'nose'],
         'test': ['coverage', 'nose'],
+        'parquet': ['pyarrow'],
     },
 
     # If there are data files included in your packages that need to be
@@ -0,0 +1,181 @@
+#!/usr/bin/env/python
+
+"""
+Fixtures shared by several test modules
+"""
+
+import datetime
+import os
+from decimal import Decimal
+
+import numpy as np
+
+from femtotrading.data import BarData
+from femtotrading.event import EventsQueue, BarEvent, SignalEvent, EventPool, PooledBarEvent
+from femtotrading.strategy.base import AbstractStrategy
+from femtotrading.trading_session import Backtest
+
+
+def write_monthly_csv(data_dir, ticker, n, seed):
+    """
+    Writes a TICKER-2014-01.csv file with n ticks. Timestamps
+    are drawn on a coarse grid so that tickers share
+    timestamps and a ticker can have duplicate timestamps.
+    """
+    random_state = np.random.RandomState(seed)
+    t0 = datetime.datetime(2014, 1, 1)
+    steps = np.cumsum(random_state.randint(0, 3, size=n))
+    fname = os.path.join(data_dir, "%s-2014-01.csv" % ticker)
+    with open(fname, "w") as fd:
+        for i, step in enumerate(steps):
+            dt = t0 + datetime.timedelta(milliseconds=100 * int(step))
+            bid = 1.0 + i / 100000.0
+            fd.write("%s,%s,%0.5f,%0.5f\n" % (
+                ticker, dt.strftime("%Y%m%d %H:%M:%S.%f")[:-3], bid, bid + 0.0002))
+
+
+def events(data_iterator):
+    return [
+        (event.time, [(ticker, data.bid, data.ask) for ticker, data in event.data_event.items()])
+        for event in data_iterator
+    ]
+
+
+def tick_events(price_handler):
+    price_handler.on_init()
+    return [
+        (event.time, ticker, data.bid, data.ask)
+        for event in price_handler
+        for ticker, data in event.data_event.items()
+    ]
+
+
+class ListSink(object):
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class DataHandlerMock(object):
+    def __init__(self, events):
+        self.events = events
+
+    def on_init(self):
+        pass
+
+    def __iter__(self):
+        return iter(self.events)
+
+
+class ComponentMock(object):
+    """
+    Records calls of handlers
+    """
+    initial_cash = Decimal("500000.00")
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def __getattr__(self, method):
+        if not method.startswith("on_"):
+            raise AttributeError(method)
+
+        def handler(event):
+            self.calls.append((self.name, method))
+        return handler
+
+
+class BarStrategy(AbstractStrategy):
+    """
+    Only overrides on_bar (sends a signal)
+    """
+    def __init__(self, events_queue, tickers, calls):
+        super(BarStrategy, self).__init__(events_queue, tickers)
+        self.calls = calls
+
+    def on_init(self):
+        pass
+
+    def on_bar(self, event):
+        self.calls.append(("strategy", "on_bar"))
+        self.events_queue.enqueue(SignalEvent("SP500TR", "BOT"))
+
+
+class BacktestMocks(object):
+    """
+    Backtest of mock components (calls of handlers are
+    recorded in self.calls)
+    """
+    def setUp(self):
+        self.calls = []
+        self.events_queue = EventsQueue()
+        dt = datetime.datetime(2016, 1, 1)
+        bar = BarData(1, 1, 1, 1, 100, 1)
+        pool = EventPool(PooledBarEvent)
+        self.events = [
+            BarEvent.from_ticker(dt, 86400, "SP500TR", bar),
+            pool.acquire().set(dt + datetime.timedelta(days=1), 86400, "SP500TR", *bar.values()),
+        ]
+
+    def backtest(self, strategies):
+        return Backtest(
+            self.events_queue, ["SP500TR"], DataHandlerMock(self.events), strategies,
+            ComponentMock("portfolio_handler", self.calls),
+            ComponentMock("execution_handler", self.calls),
+            None, None,
+            ComponentMock("statistics", self.calls)
+        )
+
+
+class PriceHandlerMock(object):
+    def __init__(self):
+        pass
+
+    def is_tick(self):
+        return True
+
+    def is_bar(self):
+        return True
+
+    def get_best_bid_ask(self, ticker):
+        prices = {
+            "GOOG": (Decimal("705.46"), Decimal("705.46")),
+            "AMZN": (Decimal("564.14"), Decimal("565.14")),
+        }
+        return prices[ticker]
+
+
+class MutablePriceHandlerMock(PriceHandlerMock):
+    def __init__(self):
+        self.prices = {
+            "GOOG": (Decimal("705.46"), Decimal("705.46")),
+            "AMZN": (Decimal("564.14"), Decimal("565.14")),
+            "MSFT": (Decimal("50.28"), Decimal("50.31")),
+        }
+
+    def get_best_bid_ask(self, ticker):
+        return self.prices[ticker]
+
+
+# transactions of TestAmazonGooglePortfolio (action, ticker, quantity, price, commission)
+AMAZON_GOOGLE_ROUND_TRIP = [
+    ("BOT", "AMZN", 100, Decimal("566.56"), Decimal("1.00")),
+    ("BOT", "AMZN", 200, Decimal("566.395"), Decimal("1.00")),
+    ("BOT", "GOOG", 200, Decimal("707.50"), Decimal("1.00")),
+    ("SLD", "AMZN", 100, Decimal("565.83"), Decimal("1.00")),
+    ("BOT", "GOOG", 200, Decimal("705.545"), Decimal("1.00")),
+    ("SLD", "AMZN", 200, Decimal("565.59"), Decimal("1.00")),
+    ("SLD", "GOOG", 100, Decimal("704.92"), Decimal("1.00")),
+    ("SLD", "GOOG", 100, Decimal("704.90"), Decimal("0.00")),
+    ("SLD", "GOOG", 100, Decimal("704.92"), Decimal("0.50")),
+    ("SLD", "GOOG", 100, Decimal("704.78"), Decimal("1.00")),
+]
@@ -0,0 +1,134 @@
+#!/usr/bin/env/python
+
+import shutil
+import tempfile
+import unittest
+
+from decimal import Decimal
+
+import pandas as pd
+
+from femtotrading import settings
+from femtotrading.compliance import ExampleCompliance
+from femtotrading.data_iterator import MonthlyCSVTickIterator, TickToBarIterator
+from femtotrading.event import BarEvent, TickEvent, EventsQueue
+from femtotrading.execution_handler import IBSimulatedExecutionHandler
+from femtotrading.portfolio_handler import PortfolioHandler
+from femtotrading.position_sizer import FixedQuantityPositionSizer
+from femtotrading.risk_manager import ExampleRiskManager
+from femtotrading.statistics import SimpleStatistics
+from femtotrading.strategy import MovingAverageCrossStrategy, MovingAverageCrossUniverseStrategy
+from femtotrading.trading_session import Backtest
+
+from tests.helpers import write_monthly_csv, events
+
+
+class TestTickToBarIterator(unittest.TestCase):
+    """
+    Test bars aggregated from ticks against pandas resample
+    """
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.tickers = ["GBPUSD", "EURUSD", "USDJPY"]
+        for seed, (ticker, n) in enumerate(zip(self.tickers, [200, 150, 10])):
+            write_monthly_csv(self.data_dir, ticker, n, seed)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def tick_iterator(self):
+        return MonthlyCSVTickIterator(self.tickers, self.data_dir, 2014, 1)
+
+    def expected_bars(self, freq):
+        rows = [
+            (dt, ticker, (bid + ask) / 2, bid, ask)
+            for dt, tickers_data in events(self.tick_iterator())
+            for ticker, bid, ask in tickers_data
+        ]
+        df = pd.DataFrame(rows, columns=["time", "ticker", "mid", "bid", "ask"]).set_index("time")
+        expected = {}
+        for ticker, df_ticker in df.groupby("ticker"):
+            resampler = df_ticker.resample(freq, label="right", closed="left")
+            bars = resampler["mid"].ohlc()
+            bars["bid"] = resampler["bid"].last()
+            bars["ask"] = resampler["ask"].last()
+            bars["ticks"] = resampler["mid"].count()
+            expected[ticker] = bars[bars["ticks"] > 0]
+        return expected
+
+    def test_bars(self):
+        price_handler = TickToBarIterator(self.tick_iterator(), period=1)
+        price_handler.on_init()
+        bar_events = list(price_handler)
+        expected = self.expected_bars("1s")
+        self.assertTrue(all(isinstance(event, BarEvent) for event in bar_events))
+        self.assertEqual(
+            sum(len(event.data_event) for event in bar_events),
+            sum(len(bars) for bars in expected.values()))
+        n = 0
+        for event in bar_events:
+            self.assertEqual(event.period, 1)
+            for ticker in event.tickers:
+                bar = event[ticker]
+                row = expected[ticker].loc[event.time]
+                for field in ["open", "high", "low", "close", "bid", "ask"]:
+                    self.assertAlmostEqual(bar[field], row[field])
+                self.assertEqual(bar["ticks"], row["ticks"])
+                self.assertEqual(bar.volume, bar.ticks)
+                self.assertEqual(bar.adj_close, bar.close)
+                n += bar["ticks"]
+        self.assertEqual(n, 360)
+        ticker = self.tickers[0]
+        self.assertEqual(price_handler.get_last_close(ticker), expected[ticker]["close"].iloc[-1])
+
+    def test_forward_ticks(self):
+        price_handler = TickToBarIterator(self.tick_iterator(), period=5, forward_ticks=True)
+        price_handler.on_init()
+        self.assertTrue(price_handler.is_tick())
+        result = list(price_handler)
+        ticks = [event for event in result if isinstance(event, TickEvent)]
+        bars = [event for event in result if isinstance(event, BarEvent)]
+        self.assertEqual(len(ticks), len(events(self.tick_iterator())))
+        self.assertEqual(len(bars), len(list(TickToBarIterator(self.tick_iterator(), period=5))))
+        times = [event.time for event in result]
+        self.assertEqual(times, sorted(times))
+        # a bar only holds ticks yielded before it
+        seen = 0
+        for event in result:
+            if isinstance(event, TickEvent):
+                seen += len(event.data_event)
+            else:
+                seen -= sum(data["ticks"] for data in event.data_event.values())
+                self.assertEqual(seen, 0)
+
+    def backtest(self, strategy_class, forward_ticks):
+        events_queue = EventsQueue()
+        price_handler = TickToBarIterator(self.tick_iterator(), period=1, forward_ticks=forward_ticks)
+        strategy = strategy_class(events_queue, self.tickers[:1], short_window=2, long_window=5)
+        position_sizer = FixedQuantityPositionSizer(100)
+        risk_manager = ExampleRiskManager()
+        portfolio_handler = PortfolioHandler(
+            events_queue, Decimal("500000.00"), price_handler, position_sizer, risk_manager,
+            accounting="float")  # tick prices are floats
+        execution_handler = IBSimulatedExecutionHandler(
+            events_queue, price_handler, ExampleCompliance(settings.TEST))
+        backtest = Backtest(
+            events_queue, self.tickers[:1], price_handler, strategy, portfolio_handler,
+            execution_handler, position_sizer, risk_manager, SimpleStatistics(portfolio_handler))
+        backtest.run(testing=True)
+        return portfolio_handler.portfolio
+
+    def test_bar_strategies(self):
+        # bar strategies run end-to-end on aggregated bars
+        for forward_ticks in [False, True]:
+            portfolios = [
+                self.backtest(strategy_class, forward_ticks)
+                for strategy_class in [MovingAverageCrossStrategy, MovingAverageCrossUniverseStrategy]
+            ]
+            self.assertIn(self.tickers[0], portfolios[0].positions)
+            self.assertEqual(portfolios[0].positions[self.tickers[0]].quantity, 100)
+            self.assertEqual(portfolios[1].cur_cash, portfolios[0].cur_cash)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env/python
+
+import datetime
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.bench_backtest import Scenario, STAGES, write_data, run_scenario, compare
+from benchmarks.synthetic import random_walk_ticks, random_walk_bars
+from femtotrading.scripts.generate_simulated_prices import simulate_day, correlation_cholesky
+
+
+class TestSynthetic(unittest.TestCase):
+    def test_deterministic(self):
+        ticks = random_walk_ticks(["A", "B"], 100, seed=1)
+        self.assertTrue(ticks["B"].equals(random_walk_ticks(["A", "B"], 100, seed=1)["B"]))
+        self.assertFalse(ticks["B"].equals(random_walk_ticks(["A", "B"], 100, seed=2)["B"]))
+        self.assertTrue(ticks["A"].index.is_monotonic_increasing)
+        # same walk as generate_simulated_prices (first day)
+        times, bids, _, _ = simulate_day(
+            np.random.RandomState([1, 0]), datetime.date(2016, 1, 4), np.full(2, 700.0),
+            0.02, 1400, 100, correlation_cholesky(2, 0.0))
+        self.assertTrue((ticks["B"].index.values == times[:100].astype("datetime64[ns]")).all())
+        self.assertTrue(np.allclose(ticks["B"]["Bid"].values, np.round(bids[:100, 1], 5)))
+        bars = random_walk_bars(["X"], 50, seed=1)["X"]
+        self.assertTrue((bars["High"] >= bars[["Open", "Close"]].max(axis=1)).all())
+        self.assertTrue((bars["Low"] <= bars[["Open", "Close"]].min(axis=1)).all())
+
+
+class TestBenchBacktest(unittest.TestCase):
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def test_run_scenario(self):
+        for scenario in [Scenario("ticks", "tick", 2, 300), Scenario("bars", "bar", 3, 200)]:
+            tickers = write_data(scenario, self.csv_dir, 42)
+            results = run_scenario(scenario, self.csv_dir, tickers)
+            self.assertEqual(list(results.keys()), STAGES + ["events"])
+            self.assertEqual(results["events"], 600 if scenario.kind == "tick" else 200)
+            for stage in STAGES:
+                self.assertGreaterEqual(results[stage], 0.0)
+
+    def test_compare(self):
+        baseline = {"scenarios": {"s": {"parse": 1.0, "merge": 0.001, "iterate": 2.0}}}
+        results = {"scenarios": {
+            "s": {"parse": 1.1, "merge": 0.01, "iterate": 3.0},
+            "new": {"parse": 1.0},
+        }}
+        # merge is under MIN_DURATION and new scenario has no baseline
+        self.assertEqual(compare(results, baseline, threshold=0.2), [("s", "iterate", 2.0, 3.0, 1.5)])
+        self.assertEqual(len(compare(results, baseline, threshold=0.05)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
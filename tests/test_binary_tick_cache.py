@@ -0,0 +1,62 @@
+#!/usr/bin/env/python
+
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from femtotrading.data_iterator.binary_tick_cache import (
+    MonthlyBinaryTickerTickIterator, binary_filename, is_cache_valid)
+from femtotrading.data_iterator.monthly_csv_tick import MonthlyTickerTickIterator
+
+
+LINES = [
+    "EURUSD,20140101 00:00:01.123,1.37550,1.37570",
+    "EURUSD,20140101 00:00:02.456,1.37551,1.37569",
+    "EURUSD,20140102 13:45:59.999,1.37600,1.37640",
+]
+
+
+class TestMonthlyBinaryTickerTickIterator(unittest.TestCase):
+    """
+    Test that ticks read from the binary cache are the
+    same as ticks parsed from the CSV file and that the
+    cache is rebuilt when the CSV file changes.
+    """
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.csv_fname = os.path.join(self.data_dir, "EURUSD-2014-01.csv")
+        with open(self.csv_fname, "w") as fd:
+            fd.write("\n".join(LINES) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_same_ticks_as_csv(self):
+        expected = list(iter(MonthlyTickerTickIterator("EURUSD", self.data_dir, 2014, 1).__next__, None))
+        ticks = list(iter(MonthlyBinaryTickerTickIterator("EURUSD", self.data_dir, 2014, 1).__next__, None))
+        self.assertEqual(len(ticks), 3)
+        self.assertEqual(ticks, expected)
+        self.assertEqual(ticks[2][0], datetime.datetime(2014, 1, 2, 13, 45, 59, 999000))
+
+    def test_cache_invalidation(self):
+        bin_fname = binary_filename(self.csv_fname)
+        MonthlyBinaryTickerTickIterator("EURUSD", self.data_dir, 2014, 1)
+        self.assertTrue(is_cache_valid(self.csv_fname, bin_fname))
+
+        time.sleep(0.01)
+        with open(self.csv_fname, "a") as fd:
+            fd.write("EURUSD,20140103 00:00:00.000,1.37700,1.37720\n")
+        self.assertFalse(is_cache_valid(self.csv_fname, bin_fname))
+
+        itr = MonthlyBinaryTickerTickIterator("EURUSD", self.data_dir, 2014, 1)
+        self.assertTrue(is_cache_valid(self.csv_fname, bin_fname))
+        ticks = list(iter(itr.__next__, None))
+        self.assertEqual(len(ticks), 4)
+        self.assertEqual(ticks[-1][1].bid, 1.377)
+
+
+if __name__ == "__main__":
+    unittest.main()
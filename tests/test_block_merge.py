@@ -0,0 +1,45 @@
+#!/usr/bin/env/python
+
+import shutil
+import tempfile
+import unittest
+
+from femtotrading.data_iterator.binary_tick_cache import MonthlyBinaryTickerTickIterator
+from femtotrading.data_iterator.block_merge import BlockMergeTickIterator
+from femtotrading.data_iterator.monthly_csv_tick import MonthlyCSVTickIterator
+
+from tests.helpers import write_monthly_csv, events
+
+
+class TestBlockMergeTickIterator(unittest.TestCase):
+    """
+    Regression test: BlockMergeTickIterator must yield the
+    same events, in the same order, as MonthlyCSVTickIterator
+    """
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.tickers = ["GBPUSD", "EURUSD", "USDJPY", "AUDUSD"]
+        for seed, (ticker, n) in enumerate(zip(self.tickers, [200, 150, 10, 1])):
+            write_monthly_csv(self.data_dir, ticker, n, seed)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_same_output_order(self):
+        expected = events(MonthlyCSVTickIterator(self.tickers, self.data_dir, 2014, 1))
+        self.assertEqual(sum(len(rows) for dt, rows in expected), 361)
+        for block_size in [1, 7, 64, 4096]:
+            result = events(BlockMergeTickIterator(
+                self.tickers, self.data_dir, 2014, 1, block_size=block_size))
+            self.assertEqual(result, expected)
+
+    def test_binary_ticker_iterator(self):
+        expected = events(MonthlyCSVTickIterator(self.tickers, self.data_dir, 2014, 1))
+        result = events(BlockMergeTickIterator(
+            self.tickers, self.data_dir, 2014, 1,
+            tick_ticker_iterator=MonthlyBinaryTickerTickIterator, block_size=16))
+        self.assertEqual(result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env/python
+
+from collections import OrderedDict
+import unittest
+
+import pandas as pd
+
+from femtotrading.data_iterator.columnar import ColumnarStore, ColumnarCursor
+
+
+class TestColumnarStore(unittest.TestCase):
+    """
+    Test that a ColumnarStore merges several tickers
+    in chronological order and that a ColumnarCursor
+    walks it row by row, across block boundaries.
+    """
+    def setUp(self):
+        frames = OrderedDict()
+        frames["B"] = pd.DataFrame(
+            {"Bid": [1.0, 2.0, 3.0], "Ask": [1.5, 2.5, 3.5]},
+            index=pd.to_datetime(["2016-01-01", "2016-01-03", "2016-01-05"])
+        )
+        frames["A"] = pd.DataFrame(
+            {"Bid": [10.0, 20.0], "Ask": [10.5, 20.5]},
+            index=pd.to_datetime(["2016-01-03", "2016-01-04"])
+        )
+        self.store = ColumnarStore.from_frames(frames, ["Bid", "Ask"])
+
+    def test_merge_sort(self):
+        """
+        Rows with the same timestamp keep ticker order
+        """
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.tickers, ["B", "A"])
+        self.assertEqual(list(self.store.codes), [0, 0, 1, 1, 0])
+        self.assertEqual(list(self.store.columns["Bid"]), [1.0, 2.0, 10.0, 20.0, 3.0])
+        self.assertEqual(self.store.first_index("A"), 2)
+
+    def test_cursor(self):
+        """
+        Cursor with a block size smaller than the store
+        """
+        cursor = ColumnarCursor(self.store, ["Bid", "Ask"], block_size=2)
+        rows = list(cursor)
+        self.assertEqual(len(rows), 5)
+        dt, ticker, (bid, ask) = rows[3]
+        self.assertEqual(dt, pd.Timestamp("2016-01-04"))
+        self.assertEqual(ticker, "A")
+        self.assertEqual((bid, ask), (20.0, 20.5))
+        self.assertEqual(cursor.index, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env/python
+
+import unittest
+
+from femtotrading.event import AbstractEvent, BarEvent, SignalEvent, FillEvent
+from femtotrading.event_log import EventLog, INFO
+from femtotrading.statistics import EveryEvent, OnFill
+from femtotrading.statistics.base import Statistics
+from femtotrading.strategy.base import Strategies
+
+from tests.helpers import ListSink, BarStrategy, BacktestMocks
+
+
+class StatisticsMock(Statistics):
+    def _update(self, timestamp, equity=None):
+        pass
+
+    def get_results(self):
+        pass
+
+    def plot_results(self):
+        pass
+
+
+class RecordedStrategies(Strategies):
+    """
+    Collection overriding on_bar (calls its strategies)
+    """
+    def __init__(self, calls, *strategies):
+        super(RecordedStrategies, self).__init__(*strategies)
+        self.calls = calls
+
+    def on_bar(self, event):
+        self.calls.append(("strategies", "on_bar"))
+        super(RecordedStrategies, self).on_bar(event)
+
+
+class UnsupportedEvent(AbstractEvent):
+    __slots__ = ()
+
+
+class TestDispatchTable(BacktestMocks, unittest.TestCase):
+    def test_dispatch(self):
+        strategy = BarStrategy(self.events_queue, ["SP500TR"], self.calls)
+        backtest = self.backtest(Strategies(strategy))
+        backtest._on_init()
+        # no-op handlers of AbstractStrategy are left out
+        self.assertEqual(
+            [handler.__name__ for handler in backtest._dispatch_table[BarEvent]],
+            ["on_bar", "handler", "handler", "_count_bar"])
+        # no logging handler (event log is disabled)
+        self.assertEqual(len(backtest._dispatch_table[SignalEvent]), 1)
+        backtest._loop()
+        expected = [
+            ("strategy", "on_bar"), ("portfolio_handler", "on_bar"), ("statistics", "on_bar"),
+            ("portfolio_handler", "on_signal"),
+        ]
+        # second event is a PooledBarEvent (handlers of BarEvent)
+        self.assertEqual(self.calls, expected * 2)
+        self.assertEqual(backtest.bars, 2)
+
+    def test_overridden_collection_handler(self):
+        strategy = BarStrategy(self.events_queue, ["SP500TR"], self.calls)
+        strategies = RecordedStrategies(self.calls, strategy)
+        backtest = self.backtest(Strategies(strategies))
+        backtest._on_init()
+        self.assertEqual(backtest._dispatch_table[BarEvent][0], strategies.on_bar)
+        # handlers which are not overridden are still flattened
+        self.assertEqual(len(backtest._dispatch_table[SignalEvent]), 1)
+        backtest._loop()
+        self.assertEqual(self.calls[:3], [
+            ("strategies", "on_bar"), ("strategy", "on_bar"), ("portfolio_handler", "on_bar")])
+        self.assertEqual(self.calls.count(("strategy", "on_bar")), 2)
+
+    def test_statistics_on_fill(self):
+        # statistics.on_fill is only dispatched if policy handles fills
+        for policy, expected in [(EveryEvent(), 1), (OnFill(), 2)]:
+            backtest = self.backtest(BarStrategy(self.events_queue, ["SP500TR"], self.calls))
+            backtest.statistics = StatisticsMock(policy)
+            backtest._on_init()
+            self.assertEqual(len(backtest._dispatch_table[FillEvent]), expected)
+            self.assertEqual(backtest._dispatch_table[FillEvent][0].__name__, "handler")
+        # other statistics objects are always called
+        backtest = self.backtest(BarStrategy(self.events_queue, ["SP500TR"], self.calls))
+        backtest._on_init()
+        self.assertEqual(len(backtest._dispatch_table[FillEvent]), 2)
+
+    def test_event_log(self):
+        sink = ListSink()
+        strategy = BarStrategy(self.events_queue, ["SP500TR"], self.calls)
+        backtest = self.backtest(strategy)
+        backtest.event_log = EventLog(INFO, sink)
+        backtest._on_init()
+        self.assertIs(strategy.event_log, backtest.event_log)
+        self.assertIs(backtest.data_handler.event_log, backtest.event_log)
+        self.assertEqual(len(backtest._dispatch_table[SignalEvent]), 2)
+        backtest._loop()
+        self.assertEqual([record[1] for record in sink.records], ["SignalEvent"] * 2)
+
+    def test_unsupported_event(self):
+        backtest = self.backtest(BarStrategy(self.events_queue, ["SP500TR"], self.calls))
+        backtest._on_init()
+        self.events_queue.enqueue(UnsupportedEvent())
+        with self.assertRaises(NotImplementedError):
+            backtest._loop()
+
+
+if __name__ == "__main__":
+    unittest.main()
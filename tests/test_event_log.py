@@ -0,0 +1,105 @@
+#!/usr/bin/env/python
+
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+import six
+
+from femtotrading.data_iterator import MonthlyCSVTickIterator, BlockMergeTickIterator
+from femtotrading.data_iterator.binary_tick_cache import MonthlyBinaryTickerTickIterator
+from femtotrading.data_iterator.monthly_csv_tick import MonthlyTickerTickIterator
+from femtotrading.event import FillEvent, SignalEvent
+from femtotrading.event_log import (
+    EventLog, StreamSink, FileSink, AsyncFileSink,
+    DISABLED, DEBUG, INFO, WARNING
+)
+
+from tests.helpers import write_monthly_csv, ListSink
+
+
+class Unformattable(object):
+    def __str__(self):
+        raise AssertionError("should not be formatted")
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fill = FillEvent(
+            datetime.datetime(2016, 1, 4), "SP500TR", "BOT", 100,
+            "ARCA", Decimal("1.23456"), Decimal("1.30"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_levels(self):
+        sink = ListSink()
+        event_log = EventLog(INFO, sink)
+        self.assertFalse(event_log.enabled(DEBUG))
+        self.assertTrue(event_log.enabled(WARNING))
+        event_log.log(DEBUG, "open", value=Unformattable())
+        event_log.log(INFO, "LONG", ticker="SP500TR", time=1)
+        self.assertEqual(sink.records, [(INFO, "LONG", [("ticker", "SP500TR"), ("time", 1)])])
+        self.assertFalse(DISABLED.enabled(WARNING))
+        DISABLED.log(WARNING, "open", value=Unformattable())
+
+    def test_stream_sink(self):
+        stream = six.StringIO()
+        event_log = EventLog(INFO, StreamSink(stream))
+        event_log.log_event(INFO, SignalEvent("SP500TR", "BOT"))
+        self.assertEqual(stream.getvalue(), "INFO    SignalEvent ticker=SP500TR action=BOT\n")
+
+    def test_file_sinks(self):
+        for sink_class in [FileSink, AsyncFileSink]:
+            fname = os.path.join(self.tmp_dir, "events.jsonl")
+            event_log = EventLog(INFO, sink_class(fname, buffer_size=3))
+            for _ in range(10):
+                event_log.log_event(INFO, self.fill)
+            event_log.close()
+            with open(fname) as fd:
+                records = [json.loads(line) for line in fd]
+            self.assertEqual(len(records), 10)
+            self.assertEqual(records[0], {
+                "level": "INFO", "kind": "FillEvent", "timestamp": "2016-01-04 00:00:00",
+                "ticker": "SP500TR", "action": "BOT", "quantity": 100, "exchange": "ARCA",
+                "price": "1.23456", "commission": "1.30"
+            })
+
+    def test_data_iterators(self):
+        tickers = ["GBPUSD", "EURUSD"]
+        for seed, ticker in enumerate(tickers):
+            write_monthly_csv(self.tmp_dir, ticker, 10, seed)
+        for ticker_iterator_class in [MonthlyTickerTickIterator, MonthlyBinaryTickerTickIterator]:
+            sink = ListSink()
+            ticker_itr = ticker_iterator_class("GBPUSD", self.tmp_dir, 2014, 1, event_log=EventLog(DEBUG, sink))
+            list(iter(ticker_itr.__next__, None))
+            self.assertEqual([record[1] for record in sink.records], ["open", "close"])
+
+            # factories with (ticker, data_dir, year, month) signature
+            def tick_ticker_iterator(ticker, data_dir, year, month):
+                return ticker_iterator_class(ticker, data_dir, year, month)
+
+            for iterator_class in [MonthlyCSVTickIterator, BlockMergeTickIterator]:
+                sink = ListSink()
+                price_handler = iterator_class(
+                    tickers, self.tmp_dir, 2014, 1, event_log=EventLog(DEBUG, sink),
+                    tick_ticker_iterator=tick_ticker_iterator)
+                list(price_handler)
+                self.assertEqual(
+                    [record[1] for record in sink.records],
+                    ["create_iterator"] * 2 + ["close"] * 2)
+        # EventLog set later (e.g. by trading session) is used by ticker iterators
+        sink = ListSink()
+        price_handler = MonthlyCSVTickIterator(tickers, self.tmp_dir, 2014, 1)
+        price_handler.event_log = EventLog(DEBUG, sink)
+        list(price_handler)
+        self.assertEqual([record[1] for record in sink.records], ["close"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env/python
+
+import datetime
+import pickle
+import unittest
+from decimal import Decimal
+
+from femtotrading import settings
+from femtotrading.data import Data, TickerData, TickData, BarData
+from femtotrading.data_iterator import HistoricCSVTickIterator, YahooDailyCSVBarIterator
+from femtotrading.event import (
+    TickEvent, BarEvent, SignalEvent, FillEvent,
+    EventPool, PooledTickEvent
+)
+
+
+class TestSlottedEvents(unittest.TestCase):
+    def setUp(self):
+        self.dt = datetime.datetime(2016, 1, 1)
+
+    def test_tick_event(self):
+        event = TickEvent.from_ticker(self.dt, "GOOG", Decimal("1.1"), Decimal("1.2"))
+        self.assertTrue(event.have("GOOG"))
+        self.assertFalse(event.have("MSFT"))
+        self.assertEqual(list(event.tickers), ["GOOG"])
+        self.assertEqual(event["GOOG"].bid, Decimal("1.1"))
+        self.assertEqual(event["GOOG"]["ask"], Decimal("1.2"))
+        self.assertEqual(dict(event.data_event.items()), {"GOOG": TickData(Decimal("1.1"), Decimal("1.2"))})
+        with self.assertRaises(KeyError):
+            event["MSFT"]
+        with self.assertRaises(KeyError):
+            event["GOOG"]["volume"]
+        self.assertFalse(hasattr(event, "__dict__"))
+        with self.assertRaises(AttributeError):
+            event["GOOG"].volume = 1
+
+    def test_bar_event(self):
+        bar = BarData(1, 3, 0, 2, 100, 2)
+        event = BarEvent.from_ticker(self.dt, 86400, "SP500TR", bar)
+        self.assertEqual(event.period, 86400)
+        self.assertEqual(event["SP500TR"].adj_close, 2)
+        self.assertEqual(bar.keys(), ["open", "high", "low", "close", "volume", "adj_close"])
+        # same as TickerData with same fields
+        self.assertEqual(bar, TickerData(bar.items()))
+        self.assertNotEqual(bar, BarData(1, 3, 0, 2, 100, 3))
+        self.assertEqual(pickle.loads(pickle.dumps(event))["SP500TR"], bar)
+
+        # several tickers
+        event = BarEvent(self.dt, 86400, Data([("A", bar), ("B", BarData(1, 1, 1, 1, 1, 1))]))
+        self.assertTrue(event.have("B"))
+        self.assertEqual(list(event.tickers), ["A", "B"])
+
+    def test_other_events(self):
+        signal = SignalEvent("GOOG", "BOT")
+        fill = FillEvent(self.dt, "GOOG", "BOT", 100, "ARCA", Decimal("1.1"), Decimal("1.3"))
+        for event in [signal, fill]:
+            self.assertFalse(hasattr(event, "__dict__"))
+        self.assertEqual(fill.typename, "FillEvent")
+
+
+class TestEventPool(unittest.TestCase):
+    def test_pool(self):
+        pool = EventPool(PooledTickEvent, size=2)
+        dt = datetime.datetime(2016, 1, 1)
+        event0 = pool.acquire().set(dt, "GOOG", 1, 2)
+        frozen = event0.freeze()
+        event1 = pool.acquire().set(dt, "MSFT", 3, 4)
+        self.assertIsNot(event0, event1)
+        self.assertIs(pool.acquire().set(dt, "AMZN", 5, 6), event0)
+        self.assertTrue(event0.have("AMZN"))
+        self.assertIsInstance(event0, TickEvent)
+        # frozen event is not modified
+        self.assertIs(type(frozen), TickEvent)
+        self.assertEqual((frozen.time, list(frozen.tickers), frozen["GOOG"]), (dt, ["GOOG"], TickData(1, 2)))
+        # events which are not reused are not copied
+        self.assertIs(frozen.freeze(), frozen)
+        with self.assertRaises(ValueError):
+            EventPool(PooledTickEvent, size=0)
+
+    def assertSameEvents(self, price_handler, expected):
+        price_handler.on_init()
+        expected.on_init()
+        events = []
+        n = 0
+        for event, expected_event in zip(price_handler, expected):
+            self.assertIsInstance(event, type(expected_event))
+            frozen = event.freeze()
+            self.assertEqual(frozen.time, expected_event.time)
+            self.assertEqual(list(frozen.tickers), list(expected_event.tickers))
+            for ticker in expected_event.tickers:
+                self.assertEqual(frozen[ticker], expected_event[ticker])
+            events.append(event)
+            n += 1
+        self.assertTrue(n > 0)
+        self.assertEqual(len(set(id(event) for event in events)), 2)
+
+    def test_historic_tick_iterator(self):
+        tickers = ["GOOG", "AMZN", "MSFT"]
+        csv_dir = settings.TEST.CSV_DATA_DIR
+        self.assertSameEvents(
+            HistoricCSVTickIterator(csv_dir, tickers, reuse_events=True),
+            HistoricCSVTickIterator(csv_dir, tickers))
+
+    def test_yahoo_bar_iterator(self):
+        tickers = ["SP500TR"]
+        csv_dir = settings.TEST.CSV_DATA_DIR
+        self.assertSameEvents(
+            YahooDailyCSVBarIterator(csv_dir, tickers, reuse_events=True),
+            YahooDailyCSVBarIterator(csv_dir, tickers))
+        with self.assertRaises(ValueError):
+            YahooDailyCSVBarIterator(csv_dir, tickers, reuse_events=True, group_by_time=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
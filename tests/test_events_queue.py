@@ -0,0 +1,62 @@
+#!/usr/bin/env/python
+
+from decimal import Decimal
+import unittest
+
+from femtotrading.compat import queue
+from femtotrading.event import EventsQueue, SignalEvent
+from femtotrading.trading_session import Backtest, Live
+
+
+class PortfolioHandlerMock(object):
+    initial_cash = Decimal("500000.00")
+
+
+class TestEventsQueue(unittest.TestCase):
+    """
+    Test thread-safe (queue.Queue) and single-threaded
+    (collections.deque) backends of EventsQueue
+    """
+    def test_backends(self):
+        for threadsafe in [True, False]:
+            events_queue = EventsQueue(threadsafe=threadsafe)
+            events_queue.enqueue(SignalEvent("GOOG", "BOT"))
+            events_queue.enqueue(SignalEvent("AMZN", "BOT"))
+            self.assertEqual(len(events_queue), 2)
+            self.assertEqual(events_queue.dequeue().ticker, "GOOG")
+            self.assertEqual(events_queue.dequeue().ticker, "AMZN")
+            self.assertRaises(queue.Empty, events_queue.dequeue)
+
+    def test_drain(self):
+        """
+        Events enqueued while draining are also yielded
+        """
+        for threadsafe in [True, False]:
+            events_queue = EventsQueue(threadsafe=threadsafe)
+            events_queue.enqueue(SignalEvent("GOOG", "BOT"))
+            tickers = []
+            for event in events_queue.drain():
+                tickers.append(event.ticker)
+                if event.ticker == "GOOG":
+                    events_queue.enqueue(SignalEvent("AMZN", "SLD"))
+            self.assertEqual(tickers, ["GOOG", "AMZN"])
+            self.assertEqual(len(events_queue), 0)
+
+    def test_session_picks_backend(self):
+        """
+        Backtest uses the deque backend, Live the thread-safe one
+        (pending events are kept)
+        """
+        events_queue = EventsQueue()
+        events_queue.enqueue(SignalEvent("GOOG", "BOT"))
+        args = (None, ) * 3 + (PortfolioHandlerMock(), ) + (None, ) * 4
+        Backtest(events_queue, *args)
+        self.assertFalse(events_queue.threadsafe)
+        self.assertEqual(len(events_queue), 1)
+        Live(events_queue, *args)
+        self.assertTrue(events_queue.threadsafe)
+        self.assertEqual(events_queue.dequeue().ticker, "GOOG")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env/python
+
+import unittest
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from femtotrading.data import Data, TickerData
+from femtotrading.event import BarEvent
+from femtotrading.indicators import (
+    SMA, EMA, RollingStd, RollingMin, RollingMax,
+    RSI, ATR, VWAP, Indicators
+)
+
+
+def updates(indicator, values):
+    return [indicator.update(value) for value in values]
+
+
+def expected_values(series):
+    return [None if np.isnan(value) else value for value in series]
+
+
+class TestIndicators(unittest.TestCase):
+    """
+    Test streaming indicators against pandas rolling /
+    ewm computations
+    """
+    def setUp(self):
+        np.random.seed(1234)
+        self.values = list(100.0 + np.cumsum(np.random.randn(1000)))
+        self.s = pd.Series(self.values)
+
+    def assertValuesAlmostEqual(self, result, expected, places=7):
+        self.assertEqual(len(result), len(expected))
+        for value, expected_value in zip(result, expected):
+            if expected_value is None:
+                self.assertIsNone(value)
+            else:
+                self.assertAlmostEqual(value, expected_value, places=places)
+
+    def test_sma(self):
+        for window in [1, 5, 400]:
+            self.assertValuesAlmostEqual(
+                updates(SMA(window), self.values),
+                expected_values(self.s.rolling(window).mean()))
+
+    def test_sma_decimal(self):
+        """
+        Decimal SMA gives exactly np.mean of window values
+        """
+        values = [Decimal("%.5f" % value) for value in self.values]
+        window = 20
+        result = updates(SMA(window), values)
+        for i in range(window - 1, len(values)):
+            self.assertIsInstance(result[i], Decimal)
+            self.assertEqual(result[i], np.mean(values[i - window + 1:i + 1]))
+
+    def test_ema(self):
+        window = 10
+        # seeded with SMA of window first values
+        s = self.s.copy()
+        s.iloc[:window] = np.nan
+        s.iloc[window - 1] = self.s.iloc[:window].mean()
+        expected = s.ewm(span=window, adjust=False, ignore_na=True).mean()
+        expected.iloc[:window - 1] = np.nan
+        self.assertValuesAlmostEqual(updates(EMA(window), self.values), expected_values(expected))
+        result = updates(EMA(2), [Decimal("1"), Decimal("2"), Decimal("3.5")])
+        self.assertEqual(result, [None, Decimal("1.5"), Decimal("2.833333333333333333333333333")])
+
+    def test_rolling_std(self):
+        for window in [2, 20]:
+            self.assertValuesAlmostEqual(
+                updates(RollingStd(window), self.values),
+                expected_values(self.s.rolling(window).std()))
+
+    def test_rolling_min_max(self):
+        for window in [1, 3, 50]:
+            self.assertValuesAlmostEqual(
+                updates(RollingMin(window), self.values),
+                expected_values(self.s.rolling(window).min()))
+            self.assertValuesAlmostEqual(
+                updates(RollingMax(window), self.values),
+                expected_values(self.s.rolling(window).max()))
+
+    def test_rsi(self):
+        window = 14
+        change = self.s.diff()
+        gain = change.clip(lower=0)
+        loss = -change.clip(upper=0)
+
+        def wilder(s):
+            s = s.copy()
+            s.iloc[window] = s.iloc[1:window + 1].mean()
+            s.iloc[:window] = np.nan
+            return s.ewm(alpha=1.0 / window, adjust=False).mean()
+
+        rs = wilder(gain) / wilder(loss)
+        expected = 100.0 - 100.0 / (1.0 + rs)
+        self.assertValuesAlmostEqual(updates(RSI(window), self.values), expected_values(expected))
+
+        rsi = RSI(3)
+        updates(rsi, [1, 2, 3, 4])
+        self.assertEqual(rsi.value, 100.0)
+
+    def test_atr(self):
+        atr = ATR(3)
+        bars = [(10, 8, 9), (12, 9, 11), (11, 7, 8), (9, 8, 8.5)]
+        result = [atr.update(*bar) for bar in bars]
+        # true ranges 2, 3, 4, 1
+        self.assertValuesAlmostEqual(result, [None, None, 3.0, (3.0 * 2 + 1) / 3])
+
+    def test_vwap(self):
+        vwap = VWAP()
+        updates_ = [vwap.update(price, volume) for price, volume in [(10, 100), (12, 300)]]
+        self.assertEqual(updates_, [10, 11.5])
+        vwap = VWAP(window=2)
+        result = [vwap.update(price, volume) for price, volume in [(10, 100), (12, 300), (11, 100)]]
+        self.assertEqual(result, [10, 11.5, 11.75])
+        vwap.reset()
+        self.assertIsNone(vwap.value)
+        self.assertEqual(vwap.update(Decimal("1.5"), 10), Decimal("1.5"))
+
+
+class TestIndicatorsRegistry(unittest.TestCase):
+    def test_update(self):
+        tickers = ["GOOG", "MSFT"]
+        indicators = Indicators(tickers)
+        indicators.register("sma", lambda: SMA(2), "close")
+        indicators.register("atr", lambda: ATR(1), ("high", "low", "close"))
+        indicators.register("range", lambda: RollingMax(2), lambda data: data.high - data.low)
+        with self.assertRaises(KeyError):
+            indicators.register("sma", lambda: SMA(3))
+
+        def bar(ticker, high, low, close):
+            return TickerData([("high", high), ("low", low), ("close", close)])
+
+        indicators.update(BarEvent(None, 86400, Data([
+            ("GOOG", bar("GOOG", 11, 9, 10)), ("AMZN", bar("AMZN", 1, 1, 1))])))
+        indicators.update(BarEvent(None, 86400, Data([("GOOG", bar("GOOG", 13, 10, 12))])))
+        indicators.update(BarEvent(None, 86400, Data([("MSFT", bar("MSFT", 21, 19, 20))])))
+
+        self.assertNotIn("AMZN", indicators)
+        self.assertEqual(indicators["GOOG"].sma.value, 11)
+        self.assertEqual(indicators["GOOG"].atr.value, 3)
+        self.assertEqual(indicators["GOOG"].range.value, 3)
+        self.assertIsNone(indicators["MSFT"].sma.value)
+        self.assertEqual(indicators["MSFT"].atr.value, 2)
+        indicators.reset()
+        self.assertFalse(indicators["GOOG"].sma.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
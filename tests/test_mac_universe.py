@@ -0,0 +1,99 @@
+#!/usr/bin/env/python
+
+import unittest
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from femtotrading import settings
+from femtotrading.data import Data, TickerData
+from femtotrading.data_iterator import YahooDailyCSVBarIterator
+from femtotrading.data_iterator.yahoo_daily_csv_bar import load_yahoo_daily_csv
+from femtotrading.event import BarEvent, EventsQueue
+from femtotrading.strategy import MovingAverageCrossStrategy, MovingAverageCrossUniverseStrategy
+
+
+def random_bar_events(tickers, n, seed=1234):
+    """
+    BarEvents with random walk prices (some tickers
+    missing at some timestamps)
+    """
+    np.random.seed(seed)
+    dates = pd.date_range("2010-01-01", periods=n)
+    prices = 100.0 + np.cumsum(np.random.randn(n, len(tickers)), axis=0)
+    present = np.random.rand(n, len(tickers)) > 0.1
+    events = []
+    for i, dt in enumerate(dates):
+        data = Data()
+        for j, ticker in enumerate(tickers):
+            if present[i, j]:
+                price = Decimal("%.5f" % prices[i, j])
+                data[ticker] = TickerData([("close", price), ("adj_close", price)])
+        events.append(BarEvent(dt, 86400, data))
+    return events
+
+
+def signals(strategy, events):
+    strategy.on_init()
+    result = []
+    for event in events:
+        strategy.on_bar(event)
+        result.extend((event.time, signal.ticker, signal.action) for signal in strategy.events_queue.drain())
+    return result
+
+
+class TestMovingAverageCrossUniverse(unittest.TestCase):
+    """
+    Test that universe strategy gives the same signals as
+    one MovingAverageCrossStrategy per ticker
+    """
+    def assertSameSignals(self, tickers, events, **params):
+        universe = MovingAverageCrossUniverseStrategy(EventsQueue(threadsafe=False), tickers, **params)
+        result = signals(universe, events)
+        expected = []
+        for ticker in tickers:
+            strategy = MovingAverageCrossStrategy(EventsQueue(threadsafe=False), [ticker], **params)
+            expected.extend(signals(strategy, events))
+        expected.sort(key=lambda signal: (signal[0], tickers.index(signal[1])))
+        self.assertTrue(len(expected) > 0)
+        self.assertEqual(result, expected)
+
+    def test_random_universe(self):
+        tickers = ["T%03d" % i for i in range(20)]
+        events = random_bar_events(tickers, 500)
+        self.assertSameSignals(tickers, events, short_window=5, long_window=20)
+        self.assertSameSignals(tickers, events, short_window=10, long_window=30)
+
+    def test_sp500tr(self):
+        tickers = ["SP500TR"]
+        price_handler = YahooDailyCSVBarIterator(settings.TEST.CSV_DATA_DIR, tickers)
+        price_handler.on_init()
+        self.assertSameSignals(tickers, list(price_handler))
+
+
+class TestGroupedBarEvents(unittest.TestCase):
+    def test_group_by_time(self):
+        tickers = ["SP500TR", "AAA", "BBB"]
+        tickers_data = load_yahoo_daily_csv(settings.TEST.CSV_DATA_DIR, tickers[:1])
+        df = tickers_data["SP500TR"]
+        tickers_data["AAA"] = df.iloc[::2] * 2
+        tickers_data["BBB"] = df.iloc[100:200] * 3
+        price_handler = YahooDailyCSVBarIterator(None, tickers, tickers_data=tickers_data)
+        price_handler.on_init()
+        expected = [(event.time, ticker, event[ticker]) for event in price_handler for ticker in event.tickers]
+
+        price_handler = YahooDailyCSVBarIterator(None, tickers, tickers_data=tickers_data, group_by_time=True)
+        price_handler.on_init()
+        events = list(price_handler)
+        times = [event.time for event in events]
+        self.assertEqual(times, sorted(set(times)))
+        self.assertEqual(len(events), len(df))
+        self.assertEqual(list(events[100].tickers), tickers)
+        self.assertEqual(
+            [(event.time, ticker, event[ticker]) for event in events for ticker in event.tickers],
+            expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env/python
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+from decimal import Decimal
+
+import pandas as pd
+
+from femtotrading import settings
+from femtotrading.data_iterator import (
+    HistoricCSVTickIterator, YahooDailyCSVBarIterator,
+    ParquetTickIterator, ParquetBarIterator
+)
+from femtotrading.data_iterator.parquet import pa, write_parquet_dataset
+from femtotrading.data_iterator.yahoo_daily_csv_bar import load_yahoo_daily_csv
+
+from tests.helpers import tick_events
+
+
+def bar_events(price_handler):
+    price_handler.on_init()
+    return [
+        (event.time, ticker, data.open, data.close, data.volume, data.adj_close)
+        for event in price_handler
+        for ticker, data in event.data_event.items()
+    ]
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestParquetIterators(unittest.TestCase):
+    """
+    Test that Parquet iterators yield the same events as
+    CSV iterators
+    """
+    def setUp(self):
+        self.config = settings.TEST
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_ticks(self, tickers):
+        price_handler = HistoricCSVTickIterator(self.config.CSV_DATA_DIR, tickers)
+        price_handler.on_init()
+        write_parquet_dataset(price_handler.tickers_data, self.root)
+
+    def test_tick_iterator(self):
+        tickers = ["GOOG", "AMZN", "MSFT"]
+        self.write_ticks(tickers)
+        expected = tick_events(HistoricCSVTickIterator(self.config.CSV_DATA_DIR, tickers))
+        self.assertEqual(tick_events(ParquetTickIterator(self.root, tickers, batch_size=3)), expected)
+        # every ticker of dataset (sorted)
+        price_handler = ParquetTickIterator(self.root)
+        price_handler.on_init()
+        self.assertEqual(list(price_handler.tickers.keys()), sorted(tickers))
+
+    def test_tick_filters(self):
+        tickers = ["GOOG", "AMZN", "MSFT"]
+        self.write_ticks(tickers)
+        expected = tick_events(HistoricCSVTickIterator(self.config.CSV_DATA_DIR, ["GOOG", "MSFT"]))
+        start, end = expected[3][0], expected[-3][0]
+        # ticker filter is pushed down: AMZN files are not read
+        amzn_dir = os.path.join(self.root, "ticker=AMZN")
+        for dirpath, _, fnames in os.walk(amzn_dir):
+            for fname in fnames:
+                with open(os.path.join(dirpath, fname), "wb") as fd:
+                    fd.write(b"not a parquet file")
+        result = tick_events(ParquetTickIterator(self.root, ["GOOG", "MSFT"], start=start, end=end))
+        self.assertEqual(result, [row for row in expected if start <= row[0] <= end])
+
+    def test_bar_iterator(self):
+        tickers = ["SP500TR"]
+        write_parquet_dataset(load_yahoo_daily_csv(self.config.CSV_DATA_DIR, tickers), self.root)
+        self.assertEqual(len(os.listdir(os.path.join(self.root, "ticker=SP500TR"))), 78)  # months
+        expected = bar_events(YahooDailyCSVBarIterator(self.config.CSV_DATA_DIR, tickers))
+        price_handler = ParquetBarIterator(self.root, tickers, batch_size=100)
+        self.assertEqual(bar_events(price_handler), expected)
+        self.assertEqual(price_handler.get_last_close("SP500TR"), expected[-1][3])
+
+        # month partitions out of range are not read
+        with open(os.path.join(self.root, "ticker=SP500TR", "month=201001", "part-0.parquet"), "wb") as fd:
+            fd.write(b"not a parquet file")
+        result = bar_events(ParquetBarIterator(
+            self.root, tickers, start="2015-03-01", end="2015-06-30", fields=["close"]))
+        self.assertEqual(result, [
+            (dt, ticker, None, close, None, adj_close)
+            for dt, ticker, _, close, _, adj_close in expected
+            if pd.Timestamp("2015-03-01") <= dt <= pd.Timestamp("2015-06-30")
+        ])
+
+    def test_tz_aware(self):
+        times = pd.date_range("2016-01-31 22:00", "2016-02-01 02:00", freq="h", tz="UTC")
+        df = pd.DataFrame({"Bid": [1.0, 1.1, 1.2, 1.3, 1.4], "Ask": [1.01, 1.11, 1.21, 1.31, 1.41]}, index=times)
+        write_parquet_dataset(OrderedDict([("EURUSD", df)]), self.root)
+        result = tick_events(ParquetTickIterator(self.root, end="2016-01-31 23:00"))
+        self.assertEqual([row[0] for row in result], list(times[:2]))
+        # time zone from a file of ticker without _common_metadata
+        os.remove(os.path.join(self.root, "_common_metadata"))
+        result = tick_events(ParquetTickIterator(self.root, end="2016-01-31 23:00"))
+        self.assertEqual([row[0] for row in result], list(times[:2]))
+        write_parquet_dataset(OrderedDict([("EURUSD", df)]), self.root)
+        # month partitions out of range (in UTC) are not read
+        with open(os.path.join(self.root, "ticker=EURUSD", "month=201601", "part-0.parquet"), "wb") as fd:
+            fd.write(b"not a parquet file")
+        for start in ["2016-02-01 00:30", pd.Timestamp("2016-01-31 19:30", tz="America/New_York")]:
+            result = tick_events(ParquetTickIterator(self.root, ["EURUSD"], start=start))
+            self.assertEqual([row[0] for row in result], list(times[3:]))
+            self.assertEqual(result[0][2], Decimal("1.3"))
+
+    def test_unknown_field(self):
+        write_parquet_dataset(OrderedDict(), self.root)
+        with self.assertRaises(ValueError):
+            ParquetBarIterator(self.root, ["SP500TR"], fields=["Close"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,25 +3,10 @@
 from decimal import Decimal
 import unittest
 
+from femtotrading.accounting import FloatAccounting
 from femtotrading.portfolio import Portfolio
 
-
-class PriceHandlerMock(object):
-    def __init__(self):
-        pass
-
-    def is_tick(self):
-        return True
-
-    def is_bar(self):
-        return True
-
-    def get_best_bid_ask(self, ticker):
-        prices = {
-            "GOOG": (Decimal("705.46"), Decimal("705.46")),
-            "AMZN": (Decimal("564.14"), Decimal("565.14")),
-        }
-        return prices[ticker]
+from tests.helpers import PriceHandlerMock, MutablePriceHandlerMock, AMAZON_GOOGLE_ROUND_TRIP
 
 
 class TestAmazonGooglePortfolio(unittest.TestCase):
@@ -108,5 +93,65 @@ class TestAmazonGooglePortfolio(unittest.TestCase):
         self.assertEqual(self.portfolio.realised_pnl, Decimal("-899.50"))
 
 
+class TestFloatAccountingPortfolio(unittest.TestCase):
+    """
+    Test that float accounting gives the same values as
+    Decimal accounting within FloatAccounting tolerance
+    on the Amazon / Google round-trips.
+    """
+    ATTRIBUTES = ["cur_cash", "equity", "unrealised_pnl", "realised_pnl"]
+
+    def test_round_trip(self):
+        portfolios = [
+            Portfolio(PriceHandlerMock(), Decimal("500000.00"), accounting=accounting)
+            for accounting in ("decimal", "float")
+        ]
+        for portfolio in portfolios:
+            for transaction in AMAZON_GOOGLE_ROUND_TRIP:
+                portfolio.transact_position(*transaction)
+        decimal_portfolio, float_portfolio = portfolios
+        for attribute in self.ATTRIBUTES:
+            self.assertIsInstance(getattr(float_portfolio, attribute), float)
+            self.assertAlmostEqual(
+                getattr(float_portfolio, attribute),
+                float(getattr(decimal_portfolio, attribute)),
+                delta=FloatAccounting.tolerance, msg=attribute
+            )
+
+
+class TestIncrementalValuation(unittest.TestCase):
+    """
+    Test that revaluing only the positions of the tickers
+    of a market event gives the same portfolio values as
+    a full revaluation of all positions.
+    """
+    def test_update_market_value(self):
+        ph = MutablePriceHandlerMock()
+        portfolio = Portfolio(ph, Decimal("500000.00"))
+        portfolio.transact_position("BOT", "AMZN", 100, Decimal("566.56"), Decimal("1.00"))
+        portfolio.transact_position("SLD", "GOOG", 200, Decimal("707.50"), Decimal("1.00"))
+        portfolio.transact_position("BOT", "MSFT", 300, Decimal("50.30"), Decimal("1.00"))
+
+        for ticker, bid, ask in [
+            ("AMZN", "565.01", "565.99"),
+            ("GOOG", "710.12", "710.20"),
+            ("AMZN", "563.50", "563.52"),
+            ("MSFT", "49.98", "50.01"),
+            ("GOOG", "701.00", "701.10"),
+        ]:
+            ph.prices[ticker] = (Decimal(bid), Decimal(ask))
+            portfolio.update_market_value([ticker])
+            values = (
+                portfolio.cur_cash, portfolio.equity,
+                portfolio.unrealised_pnl, portfolio.realised_pnl
+            )
+            portfolio._reset_values()
+            portfolio._update_portfolio()
+            self.assertEqual(values, (
+                portfolio.cur_cash, portfolio.equity,
+                portfolio.unrealised_pnl, portfolio.realised_pnl
+            ))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,7 +3,8 @@
 from decimal import Decimal
 import unittest
 
-from femtotrading.position import Position
+from femtotrading.accounting import FloatAccounting
+from femtotrading.position import Position, FloatPosition
 
 
 class TestRoundTripXOMPosition(unittest.TestCase):
@@ -123,5 +124,57 @@ class TestRoundTripPGPosition(unittest.TestCase):
         self.assertEqual(self.position.realised_pnl, Decimal("-19.50"))
 
 
+class TestFloatPosition(unittest.TestCase):
+    """
+    Test that FloatPosition gives the same values as
+    (Decimal) Position within FloatAccounting tolerance
+    on the round-trips above.
+    """
+    ATTRIBUTES = [
+        "quantity", "buys", "sells", "net", "avg_bot", "avg_sld",
+        "total_bot", "total_sld", "net_total", "total_commission",
+        "net_incl_comm", "avg_price", "cost_basis", "market_value",
+        "unrealised_pnl", "realised_pnl"
+    ]
+
+    def check_round_trip(self, init, transactions, bid_ask):
+        positions = [cls(*init) for cls in (Position, FloatPosition)]
+        for position in positions:
+            for transaction in transactions:
+                position.transact_shares(*transaction)
+            position.update_market_value(*bid_ask)
+        decimal_position, float_position = positions
+        for attribute in self.ATTRIBUTES:
+            self.assertAlmostEqual(
+                float(getattr(float_position, attribute)),
+                float(getattr(decimal_position, attribute)),
+                delta=FloatAccounting.tolerance, msg=attribute
+            )
+
+    def test_xom_round_trip(self):
+        self.check_round_trip(
+            ("BOT", "XOM", 100, Decimal("74.78"), Decimal("1.00"), Decimal('74.78'), Decimal('74.80')),
+            [
+                ("BOT", 100, Decimal('74.63'), Decimal('1.00')),
+                ("BOT", 250, Decimal('74.620'), Decimal('1.25')),
+                ("SLD", 200, Decimal('74.58'), Decimal('1.00')),
+                ("SLD", 250, Decimal('75.26'), Decimal('1.25')),
+            ],
+            (Decimal("77.75"), Decimal("77.77"))
+        )
+
+    def test_pg_round_trip(self):
+        self.check_round_trip(
+            ("SLD", "PG", 100, Decimal("77.69"), Decimal("1.00"), Decimal('77.68'), Decimal('77.70')),
+            [
+                ("SLD", 100, Decimal('77.68'), Decimal('1.00')),
+                ("SLD", 50, Decimal('77.70'), Decimal('1.00')),
+                ("BOT", 100, Decimal('77.77'), Decimal('1.00')),
+                ("BOT", 150, Decimal('77.73'), Decimal('1.00')),
+            ],
+            (Decimal("77.72"), Decimal("77.72"))
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
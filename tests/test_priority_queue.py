@@ -0,0 +1,63 @@
+#!/usr/bin/env/python
+
+import datetime
+import unittest
+
+from femtotrading.compat import queue
+from femtotrading.priority_queue import UPriorityQueue, HeapPriorityQueue
+
+
+class TestHeapPriorityQueue(unittest.TestCase):
+    """
+    Test HeapPriorityQueue behaves as UPriorityQueue
+    """
+    def test_dequeues(self):
+        for pq in [UPriorityQueue(), HeapPriorityQueue()]:
+            pq.enqueue("a", 10)
+            pq.enqueue("b", 5)
+            pq.enqueue("c", 15)
+            pq.enqueue("b2", 5)
+            self.assertTrue("b2" in pq)
+            self.assertFalse("d" in pq)
+            self.assertEqual(sorted(pq.keys()), ["a", "b", "b2", "c"])
+            self.assertEqual(pq.next_priority, 5)
+            self.assertEqual(pq.dequeues(), ["b", "b2"])
+            self.assertFalse("b2" in pq)
+            self.assertEqual(pq.dequeues(), ["a"])
+            self.assertEqual(pq.dequeue(), "c")
+            self.assertEqual(len(pq), 0)
+            self.assertRaises(queue.Empty, pq.dequeues)
+            with self.assertRaises(queue.Empty):
+                pq.next_priority
+
+    def test_datetime_priority(self):
+        pq = HeapPriorityQueue()
+        pq.enqueue("a", datetime.datetime(year=2016, month=1, day=10))
+        pq.enqueue("b", datetime.datetime(year=2016, month=1, day=5))
+        pq.enqueue("b2", datetime.datetime(year=2016, month=1, day=5))
+        self.assertEqual(pq.next_priority, datetime.datetime(year=2016, month=1, day=5))
+        self.assertEqual(pq.dequeues(), ["b", "b2"])
+
+    def test_merge_order(self):
+        # k-way merge of ticker streams (as MonthlyCSVTickIterator)
+        tickers = ["T%04d" % i for i in range(100)]
+        results = []
+        for pq in [UPriorityQueue(len(tickers)), HeapPriorityQueue(len(tickers))]:
+            priority = 0
+            dequeued = []
+            for _ in range(5):
+                for ticker in tickers:
+                    if ticker not in pq:
+                        priority += 1
+                        pq.enqueue(ticker, priority % 97)
+                next_priority = pq.next_priority
+                keys = pq.dequeues()
+                self.assertTrue(all(key not in pq for key in keys))
+                self.assertTrue(len(pq) == 0 or pq.next_priority > next_priority)
+                dequeued.append((next_priority, keys))
+            results.append(dequeued)
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env/python
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from femtotrading.event import BarEvent, SignalEvent
+from femtotrading.profiling import LatencyHistogram, SessionProfiler
+from femtotrading.strategy.base import Strategies
+
+from tests.helpers import BarStrategy, BacktestMocks
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentile(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        for _ in range(99):
+            histogram.add(100e-9)  # bucket [64, 128) ns
+        histogram.add(1e-3)
+        self.assertEqual(histogram.percentile(50), 128e-9)
+        self.assertEqual(histogram.percentile(99), 128e-9)
+        self.assertEqual(histogram.percentile(100), 2 ** 20 / 1e9)
+        self.assertEqual(histogram.to_dict(), {128: 99, 2 ** 20: 1})
+        histogram.add(1e6)  # last bucket
+        self.assertEqual(sum(histogram.counts), 101)
+
+
+class TestSessionProfiler(BacktestMocks, unittest.TestCase):
+    def test_profiler(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            json_path = os.path.join(tmp_dir, "profile.json")
+            strategies = Strategies(
+                BarStrategy(self.events_queue, ["SP500TR"], self.calls),
+                BarStrategy(self.events_queue, ["SP500TR"], self.calls))
+            backtest = self.backtest(strategies)
+            backtest.profiler = profiler = SessionProfiler(json_path=json_path, display=False)
+            backtest._on_init()
+            profiler.start()
+            backtest._loop()
+            profiler.stop()
+            profiler.report()
+
+            # handlers are still called
+            self.assertEqual(self.calls.count(("strategy", "on_bar")), 4)
+            self.assertEqual(backtest.bars, 2)
+            components = profiler.components
+            self.assertEqual(components[SessionProfiler.DATA_ITERATOR].count, 2)
+            # one entry per strategy
+            self.assertEqual(components["BarStrategy.on_bar"].count, 2)
+            self.assertEqual(components["BarStrategy.on_bar#2"].count, 2)
+            self.assertEqual(profiler.event_types["BarEvent"].count, 2)
+            self.assertEqual(profiler.event_types["SignalEvent"].count, 4)
+            self.assertEqual(sum(profiler.histograms["SignalEvent"].counts), 4)
+            self.assertTrue(profiler.duration >= profiler.event_types["BarEvent"].total)
+            self.assertIn("BarStrategy.on_bar#2", profiler.table())
+
+            with open(json_path) as fd:
+                d = json.load(fd)
+            self.assertEqual(d["components"]["BarStrategy.on_bar"]["count"], 2)
+            self.assertEqual(d["event_types"]["BarEvent"]["count"], 2)
+            self.assertEqual(sum(d["event_types"]["SignalEvent"]["histogram_ns"].values()), 4)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_dispatch_table(self):
+        backtest = self.backtest(BarStrategy(self.events_queue, ["SP500TR"], self.calls))
+        backtest.profiler = SessionProfiler(display=False)
+        backtest._on_init()
+        # one timing function per event type
+        self.assertEqual(len(backtest._dispatch_table[BarEvent]), 1)
+        self.assertEqual(len(backtest._dispatch_table[SignalEvent]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
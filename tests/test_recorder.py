@@ -0,0 +1,54 @@
+#!/usr/bin/env/python
+
+import datetime
+import unittest
+
+import numpy as np
+
+from femtotrading.statistics.recorder import EquityRecorder
+
+
+class TestEquityRecorder(unittest.TestCase):
+    """
+    Test EquityRecorder across chunk boundaries and
+    that extend gives the same values as append
+    """
+    def setUp(self):
+        random_state = np.random.RandomState(1)
+        self.equities = 500000.0 + np.cumsum(random_state.randn(50) * 100).round(2)
+        t0 = datetime.datetime(2016, 1, 1)
+        self.timestamps = [t0 + datetime.timedelta(days=i) for i in range(50)]
+
+    def test_append(self):
+        recorder = EquityRecorder(chunk_size=7)
+        for timestamp, equity in zip(self.timestamps, self.equities):
+            recorder.append(timestamp, equity)
+        self.assertEqual(len(recorder), 50)
+        self.assertEqual(recorder.timestamps.tolist(), self.timestamps)
+        equity = recorder.column("equity")
+        np.testing.assert_array_equal(equity, self.equities)
+        hwm = np.maximum.accumulate(self.equities)
+        np.testing.assert_array_equal(recorder.column("hwm"), hwm)
+        np.testing.assert_array_equal(recorder.column("drawdown"), hwm - self.equities)
+        returns = recorder.column("returns")
+        self.assertTrue(np.isnan(returns[0]))
+        np.testing.assert_allclose(returns[1:], np.diff(equity) / equity[1:] * 100)
+        series = recorder.series("drawdown", 1)
+        self.assertEqual(len(series), 49)
+        self.assertEqual(series.index[0], self.timestamps[1])
+
+    def test_extend(self):
+        expected = EquityRecorder(chunk_size=7)
+        for timestamp, equity in zip(self.timestamps, self.equities):
+            expected.append(timestamp, equity)
+        recorder = EquityRecorder(chunk_size=7)
+        recorder.append(self.timestamps[0], self.equities[0])
+        recorder.extend(self.timestamps[1:20], self.equities[1:20])
+        recorder.extend(self.timestamps[20:], self.equities[20:])
+        self.assertEqual(recorder.timestamps.tolist(), self.timestamps)
+        for field in EquityRecorder.FIELDS:
+            np.testing.assert_allclose(recorder.column(field), expected.column(field))
+
+
+if __name__ == "__main__":
+    unittest.main()
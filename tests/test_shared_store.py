@@ -0,0 +1,119 @@
+#!/usr/bin/env/python
+
+import functools
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from femtotrading import settings
+from femtotrading.data_iterator import (
+    HistoricCSVTickIterator, YahooDailyCSVBarIterator,
+    MonthlyCSVTickIterator, BlockMergeTickIterator
+)
+from femtotrading.data_iterator.shared_store import (
+    share_frames, share_monthly_ticks,
+    attach_store, SharedArrays, SharedMonthlyTickerTickIterator
+)
+from femtotrading.data_iterator.yahoo_daily_csv_bar import load_yahoo_daily_csv
+
+from tests.helpers import write_monthly_csv, events, tick_events
+
+
+def tick_events_from_store(descriptor):
+    # executed in a worker process
+    return tick_events(HistoricCSVTickIterator(None, store=descriptor))
+
+
+class TestSharedStore(unittest.TestCase):
+    """
+    Test that iterators attached to shared memory yield the
+    same events as iterators reading CSV files
+    """
+    def setUp(self):
+        self.config = settings.TEST
+
+    def test_historic_tick_iterator_in_worker(self):
+        tickers = ["GOOG", "AMZN", "MSFT"]
+        price_handler = HistoricCSVTickIterator(self.config.CSV_DATA_DIR, tickers)
+        price_handler.on_init()
+        with share_frames(price_handler.tickers_data, HistoricCSVTickIterator.FIELDS) as shared:
+            expected = tick_events(HistoricCSVTickIterator(self.config.CSV_DATA_DIR, tickers))
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(tick_events_from_store, shared.descriptor).result()
+            self.assertEqual(result, expected)
+
+    def test_yahoo_bar_iterator(self):
+        tickers = ["SP500TR"]
+        frames = load_yahoo_daily_csv(self.config.CSV_DATA_DIR, tickers)
+        with share_frames(frames, YahooDailyCSVBarIterator.FIELDS) as shared:
+            price_handler = YahooDailyCSVBarIterator(None, store=shared.descriptor)
+            price_handler.on_init()
+            expected = YahooDailyCSVBarIterator(self.config.CSV_DATA_DIR, tickers)
+            expected.on_init()
+            self.assertEqual(price_handler.get_last_close("SP500TR"), expected.get_last_close("SP500TR"))
+            for event, expected_event in zip(price_handler, expected):
+                self.assertEqual(event.time, expected_event.time)
+                self.assertEqual(event["SP500TR"], expected_event["SP500TR"])
+
+    def test_read_only(self):
+        tickers = ["SP500TR"]
+        frames = load_yahoo_daily_csv(self.config.CSV_DATA_DIR, tickers)
+        with share_frames(frames, YahooDailyCSVBarIterator.FIELDS) as shared:
+            store = attach_store(shared.descriptor)
+            with self.assertRaises(ValueError):
+                store.columns["Close"][0] = 0.0
+
+    def test_unlink_while_attached(self):
+        # attachment of the owner process stays mapped
+        tickers = ["SP500TR"]
+        frames = load_yahoo_daily_csv(self.config.CSV_DATA_DIR, tickers)
+        shared = share_frames(frames, YahooDailyCSVBarIterator.FIELDS)
+        price_handler = YahooDailyCSVBarIterator(None, store=shared.descriptor)
+        price_handler.on_init()
+        shared.unlink()
+        self.assertEqual(price_handler._store.columns["Close"][-1], frames["SP500TR"]["Close"].iloc[-1])
+        self.assertEqual(len(list(price_handler)), len(frames["SP500TR"]))
+
+    def test_close_referenced(self):
+        tickers = ["SP500TR"]
+        frames = load_yahoo_daily_csv(self.config.CSV_DATA_DIR, tickers)
+        with share_frames(frames, YahooDailyCSVBarIterator.FIELDS) as shared:
+            attached = SharedArrays.attach(shared.descriptor)
+            self.assertIs(SharedArrays.attach(shared.descriptor), attached)
+            close = attached["column:Close"]
+            attached.release()
+            self.assertFalse(attached.closed)
+            with self.assertRaises(BufferError):
+                attached.release()
+            self.assertTrue(attached.closed)
+            with self.assertRaises(ValueError):
+                attached["column:Close"]
+            # memory is still mapped
+            self.assertEqual(close[-1], frames["SP500TR"]["Close"].iloc[-1])
+            del close
+
+
+class TestSharedMonthlyTicks(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.tickers = ["GBPUSD", "EURUSD", "USDJPY"]
+        for seed, (ticker, n) in enumerate(zip(self.tickers, [200, 150, 10])):
+            write_monthly_csv(self.data_dir, ticker, n, seed)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_block_merge(self):
+        expected = events(MonthlyCSVTickIterator(self.tickers, self.data_dir, 2014, 1))
+        with share_monthly_ticks(self.tickers, self.data_dir, 2014, 1) as shared:
+            tick_ticker_iterator = functools.partial(
+                SharedMonthlyTickerTickIterator, store=shared.descriptor)
+            result = events(BlockMergeTickIterator(
+                self.tickers, self.data_dir, 2014, 1,
+                tick_ticker_iterator=tick_ticker_iterator, block_size=16))
+            self.assertEqual(result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
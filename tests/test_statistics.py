@@ -1,12 +1,17 @@
 #!/usr/bin/env/python
 
+import datetime
 import unittest
 from decimal import Decimal
 
+import numpy as np
+
 from .test_portfolio import PriceHandlerMock
 
 from femtotrading.portfolio import Portfolio
-from femtotrading.statistics import SimpleStatistics
+from femtotrading.statistics import (
+    SimpleStatistics, EveryEvent, EveryNEvents, TimeBucket, OnFill
+)
 
 
 class PortfolioHandlerMock(object):
@@ -48,7 +53,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499807.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("193.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("-0.0386"))
+        self.assertAlmostEqual(statistics.equity_returns[t], -0.0386)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -60,7 +65,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499455.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("545.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("-0.0705"))
+        self.assertAlmostEqual(statistics.equity_returns[t], -0.0705)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -71,7 +76,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499046.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("954.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("-0.0820"))
+        self.assertAlmostEqual(statistics.equity_returns[t], -0.0820)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -82,7 +87,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499164.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("836.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("0.0236"))
+        self.assertAlmostEqual(statistics.equity_returns[t], 0.0236)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -93,7 +98,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499146.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("854.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("-0.0036"))
+        self.assertAlmostEqual(statistics.equity_returns[t], -0.0036)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -104,7 +109,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499335.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("665.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("0.0379"))
+        self.assertAlmostEqual(statistics.equity_returns[t], 0.0379)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -115,7 +120,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499580.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("420.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("0.0490"))
+        self.assertAlmostEqual(statistics.equity_returns[t], 0.0490)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -126,7 +131,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("499824.00"))
         self.assertEqual(statistics.drawdowns[t], Decimal("176.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("0.0488"))
+        self.assertAlmostEqual(statistics.equity_returns[t], 0.0488)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -137,7 +142,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("500069.50"))
         self.assertEqual(statistics.drawdowns[t], Decimal("00.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("0.0491"))
+        self.assertAlmostEqual(statistics.equity_returns[t], 0.0491)
 
         # Perform transaction and test statistics at this tick
         self.portfolio.transact_position(
@@ -148,7 +153,7 @@ class TestSimpleStatistics(unittest.TestCase):
         statistics._update(t)
         self.assertEqual(statistics.equity[t], Decimal("500300.50"))
         self.assertEqual(statistics.drawdowns[t], Decimal("00.00"))
-        self.assertEqual(statistics.equity_returns[t], Decimal("0.0462"))
+        self.assertAlmostEqual(statistics.equity_returns[t], 0.0462)
 
         # Test that results are calculated correctly.
         results = statistics.get_results()
@@ -156,5 +161,91 @@ class TestSimpleStatistics(unittest.TestCase):
         self.assertEqual(results["max_drawdown_pct"], Decimal("0.1908"))
         self.assertAlmostEqual(float(results["sharpe"]), 1.8353)
 
+
+class PortfolioMock(object):
+    def __init__(self, equity):
+        self.equity = equity
+
+
+class EventMock(object):
+    def __init__(self, time):
+        self.time = time
+        self.timestamp = time
+
+
+class TestCollectionPolicies(unittest.TestCase):
+    """
+    Test that collection policies record a sampled equity
+    curve but keep the true max drawdown
+    """
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        t0 = datetime.datetime(2016, 1, 4)
+        # 500 ticks, one every 1.5s
+        self.times = [t0 + datetime.timedelta(seconds=1.5 * i) for i in range(500)]
+        self.equities = (500000.0 + np.cumsum(random_state.randn(500) * 50)).round(2).tolist()
+
+    def run_statistics(self, policy, fills=(), flushes=()):
+        portfolio = PortfolioMock(500000.0)
+        statistics = SimpleStatistics(PortfolioHandlerMock(portfolio), policy)
+        for i, (t, equity) in enumerate(zip(self.times, self.equities)):
+            portfolio.equity = equity
+            statistics.on_tick(EventMock(t))
+            if i in fills:
+                statistics.on_fill(EventMock(t))
+            if i in flushes:
+                statistics.get_results()
+        return statistics, statistics.get_results()
+
+    def test_every_n_events(self):
+        expected = self.run_statistics(EveryEvent())[1]
+        statistics, results = self.run_statistics(EveryNEvents(7))
+        # seed + 71 samples + last event
+        self.assertEqual(len(results["equity"]), 1 + 500 // 7 + 1)
+        self.assertEqual(results["equity"].iloc[1], self.equities[6])
+        self.assertEqual(results["equity"].index[-1], self.times[-1])
+        self.assertAlmostEqual(results["max_drawdown"], expected["max_drawdown"])
+        self.assertEqual(results["max_drawdown_pct"], expected["max_drawdown_pct"])
+
+    def test_time_bucket(self):
+        expected = self.run_statistics(EveryEvent())[1]
+        policy = TimeBucket(datetime.timedelta(minutes=1))
+        statistics, results = self.run_statistics(policy)
+        buckets = policy.buckets()
+        # 750s of ticks
+        self.assertEqual(len(buckets), 13)
+        self.assertEqual(buckets.index[1], datetime.datetime(2016, 1, 4, 0, 1))
+        self.assertEqual(buckets["last"].iloc[0], self.equities[39])
+        self.assertEqual(buckets["min"].iloc[0], min(self.equities[:40]))
+        self.assertEqual(buckets["max"].iloc[0], max(self.equities[:40]))
+        self.assertEqual(results["equity"].tolist()[1:], buckets["last"].tolist())
+        # labeled with time of last event of each bucket
+        self.assertEqual(results["equity"].index[1], self.times[39])
+        self.assertEqual(results["equity"].index[-1], self.times[-1])
+        self.assertAlmostEqual(results["max_drawdown"], expected["max_drawdown"])
+        self.assertEqual(results["max_drawdown_pct"], expected["max_drawdown_pct"])
+        # drawdown of sampled equity curve would be lower
+        self.assertLess(results["drawdowns"].max(), expected["max_drawdown"])
+
+    def test_time_bucket_flush(self):
+        # get_results() in the middle of buckets
+        policy = TimeBucket(datetime.timedelta(minutes=1))
+        statistics, results = self.run_statistics(policy, flushes=(20, 50))
+        equity = results["equity"]
+        self.assertTrue(equity.index.is_unique)
+        self.assertEqual(equity[self.times[20]], self.equities[20])
+        self.assertEqual(equity[self.times[50]], self.equities[50])
+        self.assertEqual(equity[self.times[39]], self.equities[39])
+        self.assertEqual(len(equity), 1 + 13 + 2)
+        self.assertEqual(len(policy.buckets()), 13)
+        # flush of an open bucket is idempotent
+        statistics.flush()
+        self.assertEqual(len(statistics.get_results()["equity"]), len(equity))
+
+    def test_on_fill(self):
+        statistics, results = self.run_statistics(OnFill(), fills=(10, 200, 450))
+        self.assertEqual(results["equity"].tolist()[1:], [self.equities[i] for i in (10, 200, 450)])
+
+
 if __name__ == "__main__":
     unittest.main()
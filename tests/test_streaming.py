@@ -0,0 +1,86 @@
+#!/usr/bin/env/python
+
+import unittest
+from collections import OrderedDict
+
+import pandas as pd
+
+from femtotrading import settings
+from femtotrading.data_iterator import HistoricCSVTickIterator
+from femtotrading.data_iterator.streaming import HeapMergeCursor, frame_chunks
+
+from tests.helpers import tick_events
+
+
+def frame(times, bids):
+    return pd.DataFrame({
+        "Bid": bids, "Ask": [bid + 0.01 for bid in bids]
+    }, index=pd.DatetimeIndex(pd.to_datetime(times), name="Time"))
+
+
+class TestStreamingHistoricCSVTickIterator(unittest.TestCase):
+    """
+    Test that streaming (chunked) HistoricCSVTickIterator
+    yields the same events as loading whole CSV files
+    """
+    def setUp(self):
+        self.config = settings.TEST
+        self.tickers = ["GOOG", "AMZN", "MSFT"]
+
+    def test_same_events(self):
+        expected = tick_events(HistoricCSVTickIterator(self.config.CSV_DATA_DIR, self.tickers))
+        for chunksize in [1, 7, 100000]:
+            price_handler = HistoricCSVTickIterator(
+                self.config.CSV_DATA_DIR, self.tickers, chunksize=chunksize)
+            self.assertEqual(tick_events(price_handler), expected)
+            self.assertEqual(len(price_handler.tickers_data), 0)
+
+    def test_best_bid_ask(self):
+        price_handler = HistoricCSVTickIterator(self.config.CSV_DATA_DIR, self.tickers, chunksize=5)
+        expected = HistoricCSVTickIterator(self.config.CSV_DATA_DIR, self.tickers)
+        price_handler.on_init()
+        expected.on_init()
+        for ticker in self.tickers:
+            self.assertEqual(price_handler.get_best_bid_ask(ticker), expected.get_best_bid_ask(ticker))
+        for _ in range(10):
+            next(price_handler)
+            next(expected)
+        for ticker in self.tickers:
+            self.assertEqual(price_handler.get_best_bid_ask(ticker), expected.get_best_bid_ask(ticker))
+
+    def test_store(self):
+        with self.assertRaises(ValueError):
+            HistoricCSVTickIterator(None, store=object(), chunksize=10)
+
+
+class TestHeapMergeCursor(unittest.TestCase):
+    def test_same_timestamps(self):
+        # same order as ColumnarStore: by time, then by ticker order
+        frames = OrderedDict([
+            ("B", frame(["2016-01-01 00:00:01", "2016-01-01 00:00:02", "2016-01-01 00:00:02"], [1.0, 2.0, 3.0])),
+            ("A", frame(["2016-01-01 00:00:00", "2016-01-01 00:00:02", "2016-01-01 00:00:03"], [4.0, 5.0, 6.0])),
+        ])
+        expected = tick_events(HistoricCSVTickIterator(None, list(frames), tickers_data=frames))
+        result = tick_events(HistoricCSVTickIterator(None, list(frames), tickers_data=frames, chunksize=2))
+        self.assertEqual(result, expected)
+        self.assertEqual([(ticker, bid) for _, ticker, bid, _ in result], [
+            ("A", 4.0), ("B", 1.0), ("B", 2.0), ("B", 3.0), ("A", 5.0), ("A", 6.0)])
+
+    def test_bounded_chunks(self):
+        df = frame(pd.date_range("2016-01-01", periods=100, freq="s"), [float(i) for i in range(100)])
+        cursor = HeapMergeCursor(OrderedDict([("A", frame_chunks(df, 8))]), ["Bid"])
+        rows = []
+        for dt, ticker, (bid, ) in cursor:
+            self.assertLessEqual(len(cursor.cursors[0]._keys), 8)
+            rows.append(bid)
+        self.assertEqual(rows, list(range(100)))
+        self.assertTrue(cursor.cursors[0].exhausted)
+
+    def test_unordered(self):
+        df = frame(["2016-01-01 00:00:02", "2016-01-01 00:00:01"], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            list(HeapMergeCursor({"A": frame_chunks(df, 1)}, ["Bid"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
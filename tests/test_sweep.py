@@ -0,0 +1,33 @@
+#!/usr/bin/env/python
+
+import unittest
+
+from femtotrading.strategy import MovingAverageCrossStrategy
+from femtotrading.trading_session import parameter_grid
+
+
+class TestParameterGrid(unittest.TestCase):
+    def test_parameter_grid(self):
+        grid = parameter_grid(
+            {"short_window": [50, 100], "long_window": [100, 400]},
+            constraint=lambda params: params.short_window < params.long_window
+        )
+        self.assertEqual(
+            [(params.short_window, params.long_window) for params in grid],
+            [(50, 100), (50, 400), (100, 400)]
+        )
+
+    def test_strategy_params_not_shared(self):
+        """
+        Parameters of a strategy instance must not
+        modify default parameters of its class
+        """
+        strategy = MovingAverageCrossStrategy(None, ["SP500TR"], short_window=10)
+        self.assertEqual(strategy.params.short_window, 10)
+        self.assertEqual(MovingAverageCrossStrategy.default_params.short_window, 100)
+        strategy = MovingAverageCrossStrategy(None, ["SP500TR"])
+        self.assertEqual(strategy.params.short_window, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
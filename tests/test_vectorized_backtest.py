@@ -0,0 +1,47 @@
+#!/usr/bin/env/python
+
+import unittest
+from decimal import Decimal, ROUND_HALF_DOWN
+
+import numpy as np
+import pandas as pd
+
+from femtotrading.strategy import MovingAverageCrossStrategy
+from femtotrading.trading_session.vectorized import round_half_down
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+    def test_round_half_down(self):
+        values = np.array([113298.999, 110331.995, -110331.995, 12.005, 12.00501, 0.0])
+        expected = [
+            float(Decimal(repr(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_DOWN))
+            for value in values.tolist()
+        ]
+        self.assertEqual(round_half_down(values).tolist(), expected)
+
+    def test_mac_vectorized_signals(self):
+        """
+        Vectorized signals of MovingAverageCrossStrategy are
+        the signals of the event-driven strategy
+        """
+        random_state = np.random.RandomState(2)
+        adj_close = (100 + np.cumsum(random_state.randn(300))).round(5)
+        bars = pd.DataFrame({"adj_close": adj_close})
+        strategy = MovingAverageCrossStrategy(None, ["T"], short_window=5, long_window=20)
+        signals = strategy.vectorized_signals(bars)
+
+        expected = np.zeros(len(bars), dtype=np.int8)
+        invested = False
+        for k in range(20 + 1, len(bars)):
+            short_sma = np.mean([Decimal(repr(x)) for x in adj_close[k - 4:k + 1].tolist()])
+            long_sma = np.mean([Decimal(repr(x)) for x in adj_close[k - 19:k + 1].tolist()])
+            if short_sma > long_sma and not invested:
+                expected[k], invested = 1, True
+            elif short_sma < long_sma and invested:
+                expected[k], invested = -1, False
+        self.assertTrue((signals != 0).sum() > 2)
+        self.assertEqual(signals.tolist(), expected.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
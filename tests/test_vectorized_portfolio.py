@@ -0,0 +1,82 @@
+#!/usr/bin/env/python
+
+from decimal import Decimal
+import unittest
+
+import numpy as np
+
+from femtotrading.accounting import FloatAccounting
+from femtotrading.portfolio import Portfolio
+from femtotrading.vectorized_portfolio import VectorizedPortfolio
+
+from tests.helpers import PriceHandlerMock, MutablePriceHandlerMock, AMAZON_GOOGLE_ROUND_TRIP
+
+
+class TestAmazonGoogleVectorizedPortfolio(unittest.TestCase):
+    """
+    Same round-trips as TestAmazonGooglePortfolio with
+    VectorizedPortfolio: values must be equal to the Decimal
+    ones within FloatAccounting tolerance
+    """
+    ATTRIBUTES = ["cur_cash", "equity", "unrealised_pnl", "realised_pnl"]
+
+    def test_round_trip(self):
+        cash = Decimal("500000.00")
+        decimal_portfolio = Portfolio(PriceHandlerMock(), cash)
+        vectorized_portfolio = VectorizedPortfolio(PriceHandlerMock(), cash)
+        for portfolio in (decimal_portfolio, vectorized_portfolio):
+            for transaction in AMAZON_GOOGLE_ROUND_TRIP:
+                portfolio.transact_position(*transaction)
+        for attribute in self.ATTRIBUTES:
+            self.assertAlmostEqual(
+                float(getattr(vectorized_portfolio, attribute)),
+                float(getattr(decimal_portfolio, attribute)),
+                delta=FloatAccounting.tolerance, msg=attribute
+            )
+
+
+class TestVectorizedPortfolioAgainstPortfolio(unittest.TestCase):
+    """
+    Random fills and price updates on many tickers: cash,
+    equity, PnL and market values must match Portfolio
+    """
+    def test_random_transactions(self):
+        random_state = np.random.RandomState(123)
+        tickers = ["T%03d" % i for i in range(100)]
+        ph = MutablePriceHandlerMock()
+        for ticker in tickers:
+            ph.prices[ticker] = (Decimal("100.00"), Decimal("100.02"))
+        cash = Decimal("500000.00")
+        portfolio = Portfolio(ph, cash)
+        # capacity lower than number of tickers (arrays must grow)
+        vportfolio = VectorizedPortfolio(ph, cash, tickers=tickers[:10], capacity=4)
+
+        # totals add up per position rounding differences
+        delta = FloatAccounting.tolerance * len(tickers)
+        for _ in range(500):
+            ticker = tickers[random_state.randint(len(tickers))]
+            if random_state.rand() < 0.3:
+                action = "BOT" if random_state.rand() < 0.5 else "SLD"
+                quantity = int(random_state.randint(1, 10)) * 100
+                bid, ask = ph.prices[ticker]
+                price = ask if action == "BOT" else bid
+                for p in [portfolio, vportfolio]:
+                    p.transact_position(action, ticker, quantity, price, Decimal("1.00"))
+            else:
+                bid = Decimal("%0.2f" % (100 + random_state.randn() * 5))
+                ph.prices[ticker] = (bid, bid + Decimal("0.02"))
+                for p in [portfolio, vportfolio]:
+                    p.update_market_value([ticker])
+            for attr in ["cur_cash", "equity", "unrealised_pnl", "realised_pnl"]:
+                self.assertAlmostEqual(
+                    getattr(vportfolio, attr), float(getattr(portfolio, attr)), delta=delta)
+
+        state = portfolio.create_portfolio_state_dict()
+        vstate = vportfolio.create_portfolio_state_dict()
+        self.assertEqual(sorted(vstate.keys()), sorted(state.keys()))
+        for key, value in state.items():
+            self.assertAlmostEqual(vstate[key], float(value), delta=delta)
+
+
+if __name__ == "__main__":
+    unittest.main()